@@ -9,10 +9,13 @@ Ingush trainer (PyQt5 + SQLite).
   Linux:    ~/.config/IngushLanguage/stats.json
 - Убраны: режим "хранить рядом с программой", показ текущего пути и кнопка "Открыть папку данных".
 - Оставлены настройки: смена ФИО и "Сбросить прогресс".
-- Сохранение прогресса — после каждого шага.
+- Сохранение прогресса — после каждого шага (запись stats.json отложенная, см. ing_stats).
 """
 import sys
 import os
+import threading
+import time
+STARTED_AT = time.perf_counter()   # точка отсчёта для --profile-startup (до импорта PyQt5)
 import json
 import sqlite3
 from pathlib import Path
@@ -21,17 +24,37 @@ from typing import List, Dict, Any, Tuple
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QSpacerItem, QSizePolicy, QTextEdit, QLineEdit, QStackedWidget,
-    QDialog, QFrame, QMessageBox, QTextBrowser, QAction, QSlider
+    QDialog, QFrame, QMessageBox, QTextBrowser, QAction, QSlider, QCompleter, QShortcut
 )
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QClipboard, QIcon
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QObject, QThread, QTimer, QStringListModel, QModelIndex, QEvent
+from PyQt5.QtGui import QClipboard, QIcon, QTextDocument, QKeySequence
+
+import ing_metrics
+import ing_migrations
+import ing_packs
+import ing_prefetch
+import ing_progress
+import ing_render
+import ing_scheduler
+import ing_session
+import ing_stats
+import ing_words
 
 APP_NAME_DIR = "IngushLanguage"  # имя папки в APPDATA
 
 # ---------- Пути к ресурсам (read-only, рядом с exe или в _MEIPASS) ----------
 RESOURCE_DIR = Path(getattr(sys, "_MEIPASS", Path(__file__).resolve().parent))
-DB_FILE = RESOURCE_DIR / "ing_base.db"           # или ing_base_encrypted.db
+DB_FILE = RESOURCE_DIR / "ing_base.db"
+ENCRYPTED_DB_FILE = RESOURCE_DIR / "ing_base_encrypted.db"   # SQLCipher; используется, если открытой базы нет
+if not DB_FILE.exists() and ENCRYPTED_DB_FILE.exists(): DB_FILE = ENCRYPTED_DB_FILE
+DB_KEY_ENV = "ING_DB_KEY"   # ключ зашифрованной базы
 ICON_FILE = RESOURCE_DIR / "12.ico"
+SEARCH_DEBOUNCE_MS = 200
+STATS_FLUSH_MS = 500   # не чаще одной записи stats.json за этот интервал
+EXAMPLE_CACHE_SIZE = 64  # готовых карточек примеров (QTextDocument) в памяти
+PREFETCH_DEPTH = int(os.environ.get("ING_PREFETCH_DEPTH", ing_prefetch.DEPTH))  # карточек вперёд читает фоновый поток; 0 — выключено
+METRICS_FILE_NAME = "metrics.json"   # выгрузка ing_metrics при закрытии (флаг --metrics или ING_METRICS=1)
+METRICS_REFRESH_MS = 1000
 
 # ---------- Пользовательская папка (writeable) для stats.json ----------
 def get_user_data_dir() -> Path:
@@ -46,44 +69,54 @@ def get_user_data_dir() -> Path:
 DATA_DIR = get_user_data_dir()
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 STATS_FILE = DATA_DIR / "stats.json"
+PROGRESS_FILE = DATA_DIR / "progress.db"   # журнал ответов (ing_progress)
+ANALYTICS_CACHE_FILE = DATA_DIR / "progress_reviews.npy"   # столбцы reviews для «Достижений» (ing_analytics)
+PACK_DIRS = [RESOURCE_DIR / "packs", DATA_DIR / "packs"]   # тематические словари *.db (ing_packs)
 
 # ----- Инструкция (увеличенный размер текста) -----
 HELP_TEXT = """<div style="font-size:18px; line-height:1.6;">
 <b>Как пользоваться программой</b><br><br>
 1) Нажмите «Начать», чтобы перейти к тренировке слов.<br>
 2) Если знаете слово — жмите «Знаю», если нет — «Не знаю».<br>
-3) При «Не знаю» появятся примеры: перепишите их и запомните перевод.<br>
-4) Слева сверху отображается ваше имя. Вверху есть поиск по словам (временно отключён).<br><br>
+3) При «Не знаю» появятся примеры: перепишите их и запомните перевод. Такое слово вернётся на повторение.<br>
+4) Слева сверху отображается ваше имя. Вверху есть поиск по словам, переводам и примерам.<br><br>
 <i>Совет:</i> делайте короткие сессии по 10–15 слов — так прогресс быстрее.
 </div>"""
 
 # ======= База данных =======
-def get_connection(sqlcipher: bool = False, password: str = None):
-    """Если sqlcipher=True и установлен pysqlcipher3 — используется оно; иначе — sqlite3."""
-    if sqlcipher:
-        try:
-            from pysqlcipher3 import dbapi2 as sqlcipher3
-            conn = sqlcipher3.connect(str(DB_FILE))
-            if password:
-                conn.execute("PRAGMA key = ?;", (password,))
-            return conn
-        except Exception:
-            print("SQLCipher requested but pysqlcipher3 not available. Using plain sqlite3.")
-    return sqlite3.connect(str(DB_FILE))
+_REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()   # реестр нужен и GUI, и WordsLoader/SearchWorker
+
+def get_registry() -> ing_packs.Registry:
+    """Основной словарь и пакеты из PACK_DIRS; соединения к ним — из пулов реестра."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = ing_packs.Registry(DB_FILE, PACK_DIRS, DATA_DIR,
+                                           connect=lambda path: get_connection(check_same_thread=False, path=path))
+        return _REGISTRY
+
+def get_db_path() -> Path:
+    """Путь к базе актуальной схемы: сам DB_FILE или его мигрированная копия в DATA_DIR."""
+    registry = get_registry()
+    return registry.db_path(ing_packs.BASE_PACK) if ing_packs.BASE_PACK in registry.names else DB_FILE
+
+def get_connection(password: str = None, check_same_thread: bool = True, path: Path = None):
+    """Read-only соединение. Зашифрованная база (SQLCipher, ключ — password или $ING_DB_KEY)
+    расшифровывается один раз в копию в памяти (ing_crypto); все соединения читают её."""
+    path = path or get_db_path()
+    if ing_migrations.is_encrypted(path):
+        import ing_crypto  # SQLCipher грузится, только если база зашифрована
+        return ing_crypto.open_snapshot(path, password or os.environ.get(DB_KEY_ENV)).connect(check_same_thread)
+    return ing_migrations.connect_readonly(path, check_same_thread=check_same_thread)
 
 def load_all_words() -> List[Dict[str, Any]]:
-    if not DB_FILE.exists():
-        return []
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT id, ingush, russian, transcription FROM words ORDER BY id")
-    words = []
-    for wid, ing, rus, tr in cur.fetchall():
-        cur.execute("SELECT ing, rus FROM examples WHERE word_id = ? ORDER BY id", (wid,))
-        exs = [{"ing": r[0], "rus": r[1]} for r in cur.fetchall()]
-        words.append({"id": wid, "ingush": ing, "russian": rus, "transcription": tr or "", "examples": exs})
-    conn.close()
-    return words
+    import ing_db  # нужен только для полной выгрузки словаря — не при запуске
+    return ing_db.load_all_words(DB_FILE, connect=get_connection)
+
+def open_words(packs: List[str]):
+    """Ленивый источник слов выбранных словарей (ing_packs): окна из SQLite вместо всего словаря в памяти."""
+    return get_registry().open_words(packs)
 
 # ======= Статистика =======
 def load_stats(filepath: Path) -> Dict[str, Any]:
@@ -92,21 +125,23 @@ def load_stats(filepath: Path) -> Dict[str, Any]:
             with open(filepath, "r", encoding="utf-8") as f:
                 return json.load(f)
     except Exception as e:
-        print("Error loading stats:", e)
+        ing_metrics.count("errors.stats_load"); print("Error loading stats:", e)
     return {"current_index": 0, "known_count": 0, "unknown_count": 0, "user_name": "", "example_font_size": 16}
 
-def save_stats(filepath: Path, stats: Dict[str, Any]) -> None:
+def save_stats(filepath: Path, stats: Dict[str, Any]) -> bool:
     try:
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        tmp = str(filepath) + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
-        os.replace(tmp, str(filepath))
+        with ing_metrics.timer("stats.save"):
+            ing_stats.write_json_atomic(filepath, ing_stats.dump_stats(stats))
+        return True
     except Exception as e:
+        ing_metrics.count("errors.stats_save")
         QMessageBox.critical(None, "Ошибка записи", f"Не удалось сохранить статистику:\n{e}")
+        return False
 
 # ========================= UI =========================
 class TopBar(QWidget):
+    search_changed = pyqtSignal(str)   # текст запроса после паузы SEARCH_DEBOUNCE_MS
+    word_chosen = pyqtSignal(int)      # id слова, выбранного в результатах поиска
     def __init__(self, left_text=""):
         super().__init__()
         lay = QHBoxLayout(self)
@@ -115,10 +150,19 @@ class TopBar(QWidget):
         self.left = QLabel(left_text or "")
         self.left.setObjectName("TopLeft")
         self.search = QLineEdit()
-        self.search.setPlaceholderText("Поиск временно отключён")
+        self.search.setPlaceholderText("Поиск: слово, перевод, пример")
         self.search.setFixedWidth(280)
         self.search.setObjectName("Search")
-        self.search.setReadOnly(True)
+        self.search.setClearButtonEnabled(True)
+        self._debounce = QTimer(self); self._debounce.setSingleShot(True); self._debounce.setInterval(SEARCH_DEBOUNCE_MS)
+        self._debounce.timeout.connect(lambda: self.search_changed.emit(self.search.text().strip()))
+        self.search.textEdited.connect(lambda _: self._debounce.start())
+        self._result_ids: List[int] = []
+        self._results_model = QStringListModel(self)
+        self._completer = QCompleter(self._results_model, self)
+        self._completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self._completer.setWidget(self.search)
+        self._completer.activated[QModelIndex].connect(self._on_result_activated)
         self.ach = QPushButton("Достижения ⚙️")
         self.ach.setObjectName("Ghost")
         lay.addWidget(self.left)
@@ -130,6 +174,84 @@ class TopBar(QWidget):
     def set_user_name(self, name: str):
         self.left.setText(f"Пользователь: {name}")
 
+    def show_results(self, results: List[Dict[str, Any]]):
+        self._result_ids = [r["id"] for r in results]
+        self._results_model.setStringList([f"{r['ingush']} — {r['russian']}" for r in results])
+        if results and self.search.hasFocus():
+            self._completer.complete()
+        else:
+            self._completer.popup().hide()
+
+    def _on_result_activated(self, index: QModelIndex):
+        if 0 <= index.row() < len(self._result_ids):
+            self.word_chosen.emit(self._result_ids[index.row()])
+
+class SearchWorker(QObject):
+    """Выполняет запросы ing_search в отдельном QThread, чтобы ввод не блокировал GUI."""
+    done = pyqtSignal(int, list)  # (номер запроса, результаты)
+    def __init__(self, packs: List[str]):
+        super().__init__()
+        self.latest = 0
+        self.packs = packs   # выбранные словари; GUI меняет список целиком
+        self._index = None; self._index_packs = None
+    @pyqtSlot(int, str)
+    def run(self, seq: int, text: str):
+        if seq != self.latest:
+            return  # пока ждали очереди, пользователь напечатал ещё
+        try:
+            packs = self.packs
+            if self._index is None or self._index_packs != packs:
+                self.close()
+                self._index = get_registry().search(packs); self._index_packs = packs  # соединения — из пулов реестра
+            results = self._index.search(text)
+        except Exception as e:
+            ing_metrics.count("errors.search"); print("Search error:", e)
+            results = []
+        self.done.emit(seq, results)
+    def close(self):
+        if self._index is not None: self._index.close(); self._index = None
+
+class WordsLoader(QObject):
+    """Открывает словарь в отдельном QThread, пока пользователь на стартовых экранах.
+
+    Миграция копии базы (первый запуск) и первое окно слов читаются здесь;
+    готовый источник слов передаётся GUI-потоку сигналом ready и дальше
+    используется только им.
+    """
+    progress = pyqtSignal(str)
+    ready = pyqtSignal(object)
+    def __init__(self, packs: List[str], start_index: int = 0):
+        super().__init__()
+        self.packs, self.start_index = packs, start_index
+        self.words = None   # результат: его же можно забрать, если ready пришёл до подключения
+    @pyqtSlot()
+    def run(self):
+        try:
+            self.progress.emit("Подготовка базы…")
+            for name in get_registry().select(self.packs): get_registry().db_path(name)
+            self.progress.emit("Чтение словаря…")
+            words = open_words(self.packs)
+            if len(words): words[max(0, min(self.start_index, len(words) - 1))]  # первое окно — до показа тренажёра
+        except Exception as e:
+            ing_metrics.count("errors.words_load"); print("Error loading words:", e)
+            words = ing_words.ListWordSource([])
+        self.words = words
+        self.ready.emit(words)
+
+class StartupProfiler(QObject):
+    """--profile-startup: печатает время от запуска до первой отрисовки окна и до готовности тренажёра."""
+    def __init__(self, enabled: bool):
+        super().__init__()
+        self.enabled = enabled
+    def mark(self, what: str):
+        if self.enabled: print(f"[startup] {what}: {(time.perf_counter() - STARTED_AT) * 1000:.1f} ms")
+    def watch_first_paint(self, widget: QWidget):
+        if self.enabled: widget.installEventFilter(self)
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self); self.mark("first paint")
+        return False
+
 class InstructionDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -264,17 +386,47 @@ class HowPage(QWidget):
     def set_user_name(self, name: str):
         self.user_name = name; self.tb.set_user_name(name)
 
+class LoadingPage(QWidget):
+    """Заглушка вместо тренажёра, пока WordsLoader не открыл словарь."""
+    def __init__(self):
+        super().__init__()
+        root = QVBoxLayout(self); root.setContentsMargins(24,24,24,24)
+        self.label = QLabel("Загрузка словаря…"); self.label.setObjectName("Subtle"); self.label.setAlignment(Qt.AlignCenter)
+        root.addStretch(1); root.addWidget(self.label); root.addStretch(1)
+    def set_message(self, text: str):
+        self.label.setText(text)
+
+class AchievementsPage(QWidget):
+    """«Достижения»: удержание, трудные слова, серии и ответы по дням (ing_analytics)."""
+    back_clicked = pyqtSignal()
+    def __init__(self, user_name: str):
+        super().__init__()
+        self.user_name = user_name
+        self._ui()
+    def _ui(self):
+        root = QVBoxLayout(self); root.setContentsMargins(24,24,24,24); root.setSpacing(16)
+        self.tb = TopBar(left_text=f"Пользователь: {self.user_name}"); self.tb.left.setObjectName("TopLeft"); self.tb.ach.setEnabled(False)
+        root.addWidget(self.tb)
+        self.view = QTextBrowser(); self.view.setObjectName("Card"); self.view.setOpenLinks(False)
+        root.addWidget(self.view, 1)
+        btn = QPushButton("Назад"); btn.setObjectName("OutlinePill"); btn.setFixedWidth(168); btn.clicked.connect(self.back_clicked.emit)
+        row = QHBoxLayout(); row.addStretch(1); row.addWidget(btn); row.addStretch(1); root.addLayout(row)
+    def set_html(self, html: str):
+        self.view.setHtml(html)
+    def set_user_name(self, name: str):
+        self.user_name = name; self.tb.set_user_name(name)
+
 class TrainerPage(QWidget):
-    def __init__(self, words: List[Dict[str, Any]], stats: Dict[str, Any], user_name: str, save_cb):
+    def __init__(self, words, stats: Dict[str, Any], user_name: str, save_cb, progress, scheduler, open_source=None):
         super().__init__()
         self.words, self.stats, self.user_name = words, stats, user_name
-        self.total = len(words)
-        self.idx = max(0, min(stats.get("current_index", 0), self.total-1 if self.total else 0))
-        self.known = stats.get("known_count", 0)
-        self.unknown = stats.get("unknown_count", 0)
+        self.session = ing_session.Session(words, progress, scheduler, start_index=stats.get("current_index", 0))  # вся логика карточек — там
+        # open_source() — свой источник слов для потока упреждающего чтения (ing_prefetch)
+        self.prefetch = ing_prefetch.Prefetcher(open_source, PREFETCH_DEPTH if open_source is not None else 0)
         self.example_font_size = stats.get("example_font_size", 16)
-        self._locked = False
         self._save_cb = save_cb
+        self._ex_cache = ing_render.RenderCache(self._render_examples, EXAMPLE_CACHE_SIZE, evict=lambda doc: doc.deleteLater())
+        self._due_timer = QTimer(self); self._due_timer.setSingleShot(True); self._due_timer.timeout.connect(self._load)  # новые слова кончились — ждём повторений «Не знаю»
         self._ui(); self._load()
     def _ui(self):
         root = QVBoxLayout(self); root.setContentsMargins(24, 24, 24, 24); root.setSpacing(12)
@@ -297,6 +449,7 @@ class TrainerPage(QWidget):
         root.addSpacing(8); root.addWidget(self.hint)
         ex_wrap = QHBoxLayout(); ex_wrap.addStretch(1)
         self.examples = QTextEdit(); self.examples.setReadOnly(True); self.examples.setObjectName("Card"); self.examples.setFixedWidth(760); self.examples.setStyleSheet(f"font-size: {self.example_font_size}px;")
+        self._blank = QTextDocument(self); self.examples.setDocument(self._blank)
         ex_wrap.addWidget(self.examples, 0, Qt.AlignCenter); ex_wrap.addStretch(1); root.addLayout(ex_wrap)
         self.lbl_stats = QLabel(""); self.lbl_stats.setObjectName("Stats"); self.lbl_stats.setAlignment(Qt.AlignCenter); self.lbl_stats.setStyleSheet("font-size: 13px;")
         root.addWidget(self.lbl_stats)
@@ -304,48 +457,69 @@ class TrainerPage(QWidget):
         self.font_slider = QSlider(Qt.Horizontal); self.font_slider.setRange(10, 30); self.font_slider.setValue(self.example_font_size); self.font_slider.setFixedWidth(200); self.font_slider.valueChanged.connect(self.update_example_font_size)
         slider_wrap.addWidget(self.font_slider); slider_wrap.addStretch(1); root.addLayout(slider_wrap)
         self.btn_prev.clicked.connect(self._prev); self.btn_next.clicked.connect(self._next); self.btn_yes.clicked.connect(self._know); self.btn_no.clicked.connect(self._dont)
+    @ing_metrics.timed("trainer.load")
     def _load(self):
         if not self.words:
-            self.h_word.setText("Нет данных"); self.h_rus.setText(""); self.h_tr.setText(""); self.examples.clear(); return
-        if self.idx >= self.total: self._finish(); return
-        self._locked = False; self.btn_yes.setEnabled(True); self.btn_no.setEnabled(True); self.examples.clear()
-        d = self.words[self.idx]
+            self.h_word.setText("Нет данных"); self.h_rus.setText(""); self.h_tr.setText(""); self._clear_examples(); return
+        self._due_timer.stop()
+        if self.session.finished: self._finish(); return
+        if not self.session.poll(): self._wait(); return
+        self.btn_yes.setEnabled(True); self.btn_no.setEnabled(True); self._clear_examples()
+        d = self.prefetch.get(self.session.idx, self.words).word
+        self.prefetch.plan(*self.session.upcoming(self.prefetch.depth))
         self.h_word.setText(str(d.get("ingush", ""))); self.h_rus.setText(str(d.get("russian", ""))); tr = d.get("transcription", "")
         self.h_tr.setText(f"[ {tr} ]" if tr else ""); self._update_stats()
     def _know(self):
-        if not self._locked:
-            self.known += 1; self._locked = True; self.idx += 1; self._save_cb(); self._load()
+        if self.session.know(): self._save_cb(); self._load()
+    @ing_metrics.timed("trainer.dont")
     def _dont(self):
-        if not self._locked:
-            self.unknown += 1; self._locked = True; self.btn_yes.setEnabled(False)
-            d = self.words[self.idx]; ex = d.get("examples", [])
-            if not ex:
-                self.examples.setHtml("<div class='excard' style='text-align:center;'><p>Нет примеров</p></div>")
-            else:
-                parts = []
-                for i, e in enumerate(ex):
-                    margin_top, margin_bottom = (12, 18)
-                    if i == 2: margin_top = 50
-                    parts.append(f"""
-                    <div class='item' style='margin-top:{margin_top}px; margin-bottom:{margin_bottom}px;'>
-                        <div class='ing' style='font-weight:700; margin-bottom:14px;'>{e.get('ing','')}</div>
-                        <div class='rus' style='color:#6B7280; line-height:1.55;'>{e.get('rus','')}</div>
-                    </div>""")
-                self.examples.setHtml("<div class='excard' style='text-align:center;'>{}</div>".format("".join(parts)))
+        if self.session.dont():
+            self.btn_yes.setEnabled(False)
+            self._show_examples(self._ex_cache.get(self.session.idx))
             self._save_cb(); self._update_stats()
+    # ---- карточка примеров: строится при первом «Не знаю» (слова заранее читает ing_prefetch), дальше — из кэша ----
+    def _render_examples(self, idx: int) -> QTextDocument:
+        doc = QTextDocument(self); doc.setDefaultFont(self.examples.font())
+        with ing_metrics.timer("examples.set_html"): doc.setHtml(self.prefetch.examples_html(idx, self.words))
+        return doc
+    def _show_examples(self, doc: QTextDocument):
+        font = self.examples.font()
+        if doc.defaultFont() != font: doc.setDefaultFont(font)  # размер шрифта мог смениться слайдером
+        self.examples.setDocument(doc)
+    def _clear_examples(self):
+        self.examples.setDocument(self._blank)  # clear() стёр бы закэшированный документ
+    def render_stats(self) -> Dict[str, Any]:
+        return self._ex_cache.counters()
+    def shutdown(self):
+        self._due_timer.stop(); self.prefetch.close()  # поток отдаёт своё соединение в пул
+    def reset_progress(self):
+        self.session.reset()
+        for b in (self.btn_next, self.btn_prev): b.setEnabled(True)
+        self._save_cb(); self._load()
     def _next(self):
-        self.idx += 1; self._save_cb(); self._load()
+        self.session.advance(); self._save_cb(); self._load()
     def _prev(self):
-        self.idx = max(0, self.idx - 1); self._save_cb(); self._load()
+        if self.session.back(): self._save_cb(); self._load()
+    def go_to(self, idx: int):
+        self.session.go_to(idx)
+        for b in (self.btn_next, self.btn_prev): b.setEnabled(True)
+        self._save_cb(); self._load()
     def _update_stats(self):
-        total_done = self.known + self.unknown; remaining = max(0, self.total - total_done)
-        self.lbl_stats.setText(f"Всего: {self.total} | Осталось: {remaining} | Пройдено: {total_done} | Знаю: {self.known} | Не знаю: {self.unknown}")
+        s = self.session.summary()
+        self.lbl_stats.setText(f"Всего: {s['total']} | Осталось: {s['remaining']} | Пройдено: {s['done']} | Знаю: {s['known']} | Не знаю: {s['unknown']} | На повторе: {s['relearn']}")
+    def _wait(self):
+        due = self.session.relearn_due() or 0
+        wait_ms = max(0, due - ing_progress.now_ms())
+        self.h_word.setText("Повторение"); self.h_rus.setText(f"Слова «Не знаю» вернутся через {max(1, -(-wait_ms // 60000))} мин"); self.h_tr.setText("")
+        for b in (self.btn_yes, self.btn_no): b.setEnabled(False)  # » и « работают: » заодно проверяет, не пора ли
+        self._clear_examples(); self._update_stats()
+        self._due_timer.start(min(wait_ms + 100, 60_000))  # не реже раза в минуту: обновить «через N мин»
     def _finish(self):
-        self.h_word.setText("Конец"); self.h_rus.setText(f"Знаю: {self.known} | Не знаю: {self.unknown}")
+        self.h_word.setText("Конец"); self.h_rus.setText(f"Знаю: {self.session.known} | Не знаю: {self.session.unknown}")
         for b in (self.btn_yes, self.btn_no, self.btn_next, self.btn_prev): b.setEnabled(False)
-        self.examples.clear()
+        self._clear_examples()
     def export_stats(self) -> Dict[str, Any]:
-        return {"current_index": self.idx, "known_count": self.known, "unknown_count": self.unknown, "example_font_size": self.example_font_size}
+        return {**self.session.export_stats(), "example_font_size": self.example_font_size}
     def update_example_font_size(self, value):
         self.example_font_size = value; self.examples.setStyleSheet(f"font-size: {self.example_font_size}px;"); self._save_cb()
     def set_user_name(self, name: str):
@@ -372,19 +546,133 @@ class NameDialog(QDialog):
             self.input.setProperty("error", True); self.input.style().unpolish(self.input); self.input.style().polish(self.input); self.input.setFocus(); return
         self.user_name = text; super().accept()
 
+class MetricsOverlay(QLabel):
+    """Полупрозрачная сводка ing_metrics поверх окна (F12), обновляется раз в METRICS_REFRESH_MS."""
+    def __init__(self, parent: QWidget):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents); self.setTextFormat(Qt.PlainText)
+        self.setStyleSheet("background: rgba(17,24,39,200); color:#E5E7EB; font-family:monospace; font-size:11px; padding:8px; border-radius:8px;")
+        self._timer = QTimer(self); self._timer.setInterval(METRICS_REFRESH_MS); self._timer.timeout.connect(self.refresh)
+        self.hide()
+    def toggle(self):
+        if self.isVisible():
+            self._timer.stop(); self.hide(); return
+        self.refresh(); self.show(); self.raise_(); self._timer.start()
+    def refresh(self):
+        self.setText(ing_metrics.format_summary() or "Пока нет замеров"); self.adjustSize(); self.move(12, self.parent().height() - self.height() - 12)
+
 class MainWindow(QMainWindow):
-    def __init__(self, words, stats, user_name):
+    search_requested = pyqtSignal(int, str)
+    def __init__(self, loader: WordsLoader, stats, user_name, progress, scheduler, profiler: StartupProfiler):
         super().__init__()
-        self.words, self.stats, self.user_name = words, stats, user_name
+        self.words, self.stats, self.user_name = None, stats, user_name   # words — после WordsLoader.ready
+        self.progress, self.scheduler, self.profiler = progress, scheduler, profiler
+        self.packs = loader.packs
+        self.stats_store = ing_stats.StatsStore(STATS_FILE, stats, save=save_stats, stamped=ing_stats.SETTINGS_KEYS)
+        self._flush_timer = QTimer(self); self._flush_timer.setSingleShot(True); self._flush_timer.setInterval(STATS_FLUSH_MS)
+        self._flush_timer.timeout.connect(self._flush_pending)
         self.setWindowTitle("Изучаем ингушский язык"); self.setGeometry(100,100,960,640)
         self._build_menu()
         self.stack = QStackedWidget(); self.setCentralWidget(self.stack)
-        self.p_start = StartPage(user_name); self.p_how = HowPage(user_name)
-        self.p_train = TrainerPage(words, stats, user_name, save_cb=self._save_progress)
-        self.p_start.start_clicked.connect(lambda: self.stack.setCurrentWidget(self.p_how))
-        self.p_how.next_clicked.connect(lambda: self.stack.setCurrentWidget(self.p_train))
-        for w in (self.p_start, self.p_how, self.p_train): self.stack.addWidget(w)
-        self.stack.setCurrentWidget(self.p_start)
+        # Страницы строятся при первом переходе на них: до первого кадра — только StartPage.
+        self.p_start = StartPage(user_name); self.p_how = self.p_loading = self.p_train = self.p_ach = None
+        self._before_ach = None   # куда вернуться из «Достижений»
+        self.p_start.start_clicked.connect(self._show_how)
+        self.stack.addWidget(self.p_start); self.stack.setCurrentWidget(self.p_start)
+        self._init_search()
+        if ing_metrics.ENABLED:
+            self._overlay = MetricsOverlay(self); QShortcut(QKeySequence("F12"), self, activated=self._overlay.toggle)
+        self._loader = loader
+        loader.ready.connect(self._on_words_ready)
+        if loader.words is not None: self._on_words_ready(loader.words)  # загрузился, пока шёл NameDialog
+    def _add_page(self, page):
+        self.stack.addWidget(page)
+        if hasattr(page, "tb"): self._connect_topbar(page)
+        return page
+    def _show_how(self):
+        if self.p_how is None:
+            self.p_how = self._add_page(HowPage(self.user_name)); self.p_how.next_clicked.connect(self._show_trainer)
+        self.stack.setCurrentWidget(self.p_how)
+    def _ensure_trainer(self) -> bool:
+        if self.p_train is None and self.words is not None:
+            self.p_train = self._add_page(TrainerPage(self.words, self.stats, self.user_name, save_cb=self._save_progress,
+                                                      progress=self.progress, scheduler=self.scheduler,
+                                                      open_source=lambda packs=list(self.packs): open_words(packs)))
+            self.profiler.mark("trainer ready")
+        return self.p_train is not None
+    def _on_words_ready(self, words):
+        if self.words is not None: return
+        self.words = words
+        for act in self._pack_actions.values(): act.setEnabled(True)
+        self.profiler.mark("words ready")
+        if self.p_loading is not None and self.stack.currentWidget() is self.p_loading: self._show_trainer()
+        if self._pending_search is not None: self._search(*self._pending_search)
+    def _show_trainer(self):
+        if self._ensure_trainer():
+            self.stack.setCurrentWidget(self.p_train); return
+        if self.p_loading is None:
+            self.p_loading = self._add_page(LoadingPage()); self._loader.progress.connect(self.p_loading.set_message)
+        self.stack.setCurrentWidget(self.p_loading)
+    def _init_search(self):
+        # Поток поиска запускается при первом запросе, а не до первого кадра.
+        self._search_seq = 0; self._search_bar = None; self._pending_search = None
+        self._search_thread = self._search_worker = None
+        self._connect_topbar(self.p_start)
+    def _start_search_thread(self):
+        self._search_thread = QThread(self); self._search_worker = SearchWorker(self.packs)
+        self._search_worker.moveToThread(self._search_thread)
+        self.search_requested.connect(self._search_worker.run)
+        self._search_worker.done.connect(self._on_search_done)
+        self._search_thread.start()
+    def _connect_topbar(self, page):
+        page.tb.search_changed.connect(lambda text, tb=page.tb: self._search(tb, text))
+        page.tb.word_chosen.connect(self._open_word)
+        page.tb.ach.clicked.connect(self._show_achievements)
+    def _search(self, tb: TopBar, text: str):
+        self._search_seq += 1; self._search_bar = tb
+        if not text:
+            self._pending_search = None; tb.show_results([]); return
+        if self.words is None:
+            self._pending_search = (tb, text); return   # база ещё готовится в WordsLoader — выполним по ready
+        self._pending_search = None
+        if self._search_thread is None: self._start_search_thread()
+        self._search_worker.latest = self._search_seq
+        self.search_requested.emit(self._search_seq, text)
+    def _on_search_done(self, seq: int, results: list):
+        if seq == self._search_seq and self._search_bar is not None:
+            self._search_bar.show_results(results)
+    def _open_word(self, word_id: int):
+        if not self._ensure_trainer(): return
+        idx = self.words.index_of(word_id)
+        if idx is not None:
+            self.p_train.go_to(idx); self.stack.setCurrentWidget(self.p_train)
+    def _show_achievements(self):
+        if self.p_ach is None:
+            self.p_ach = self._add_page(AchievementsPage(self.user_name)); self.p_ach.back_clicked.connect(self._leave_achievements)
+        if self.stack.currentWidget() is not self.p_ach: self._before_ach = self.stack.currentWidget()
+        self.progress.flush()   # аналитика читает progress.db — последние ответы должны быть там
+        self.p_ach.set_html(self._achievements_html())
+        self.stack.setCurrentWidget(self.p_ach)
+    def _leave_achievements(self):
+        back = self._before_ach
+        self.stack.setCurrentWidget(back if back is not None and self.stack.indexOf(back) >= 0 else self.p_start)  # тренажёр мог пересоздаться
+    def _achievements_html(self) -> str:
+        import ing_analytics  # numpy грузится при первом открытии страницы, не при запуске
+        known, unknown = self.progress.counts()
+        if not ing_analytics.AVAILABLE:
+            return (f"<h2>Достижения</h2><p>Знаю: <b>{known}</b> · Не знаю: <b>{unknown}</b></p>"
+                    "<p style='color:#9CA3AF'>Подробная статистика (удержание, трудные слова, серии) доступна, если установлен numpy.</p>")
+        try:
+            data = ing_analytics.dashboard(PROGRESS_FILE, ANALYTICS_CACHE_FILE)
+        except (sqlite3.Error, OSError) as ex:
+            ing_metrics.count("errors.analytics"); print("Error computing analytics:", ex)
+            return f"<h2>Достижения</h2><p>Знаю: <b>{known}</b> · Не знаю: <b>{unknown}</b></p>"
+        return ing_analytics.dashboard_html(data, self._word_label)
+    def _word_label(self, word_id: int):
+        idx = self.words.index_of(word_id) if self.words is not None else None
+        if idx is None: return None
+        d = self.words[idx]
+        return f"{d.get('ingush', '')} — {d.get('russian', '')}"
     def _build_menu(self):
         m = self.menuBar().addMenu("Программа")
         act_support = QAction("Поддержать проект", self); act_support.triggered.connect(self.show_support); m.addAction(act_support)
@@ -392,9 +680,47 @@ class MainWindow(QMainWindow):
         act_settings = QAction("Настройки…", self); act_settings.triggered.connect(self.show_settings); m.addAction(act_settings)
         m.addSeparator()
         act_about = QAction("О программе", self); act_about.triggered.connect(self.show_about); m.addAction(act_about)
+        self._pack_actions = {}
+        names = get_registry().names
+        if len(names) > 1:
+            dm = self.menuBar().addMenu("Словари")
+            for name in names:
+                act = QAction("Основной" if name == ing_packs.BASE_PACK else name, self); act.setCheckable(True)
+                act.setChecked(name in self.packs); act.setEnabled(False)  # включаются, когда словарь загружен
+                act.toggled.connect(self._on_pack_toggled); dm.addAction(act); self._pack_actions[name] = act
+    def _on_pack_toggled(self, _checked: bool):
+        names = [name for name, act in self._pack_actions.items() if act.isChecked()]
+        if not names:
+            sender = self.sender(); sender.blockSignals(True); sender.setChecked(True); sender.blockSignals(False); return  # хотя бы один словарь
+        self._switch_packs(names)
+    def _switch_packs(self, names: List[str]):
+        """Другой набор словарей без перезапуска: открываются только окна слов, прогресс общий (глобальные id)."""
+        card = self.p_train.session.current() if self.p_train is not None else None
+        current = card["id"] if card is not None else None
+        self._flush_progress()
+        showing = self.p_train is not None and self.stack.currentWidget() is self.p_train
+        if self.p_train is not None:
+            self.p_train.shutdown(); self.stack.removeWidget(self.p_train); self.p_train.deleteLater(); self.p_train = None
+        self.words.close()
+        self.packs = names; self.stats["packs"] = names
+        self.words = open_words(names)
+        idx = self.words.index_of(current) if current is not None else None
+        self.stats["current_index"] = idx or 0
+        if self._search_worker is not None: self._search_worker.packs = names
+        self.stats_store.mark_dirty(); self._flush_pending()
+        if showing: self._show_trainer()
     def _save_progress(self):
-        self.stats.update(self.p_train.export_stats())
-        save_stats(STATS_FILE, self.stats)
+        if self.p_train is not None: self.stats.update(self.p_train.export_stats())
+        self.stats_store.mark_dirty()
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()  # не перезапускаем: при перетаскивании слайдера пишем раз в STATS_FLUSH_MS
+    def _flush_pending(self):
+        self.stats_store.flush(); self.progress.flush(); self.scheduler.flush()
+    def _flush_progress(self):
+        self._flush_timer.stop()
+        if self.p_train is not None: self.stats.update(self.p_train.export_stats())
+        self.stats_store.mark_dirty()
+        self._flush_pending()
     def show_about(self):
         html = ("<div style='line-height:1.6;'>"
                 "<b>Изучаем ингушский язык</b><br>"
@@ -414,18 +740,30 @@ class MainWindow(QMainWindow):
             if new_name and new_name != self.user_name:
                 self.user_name = new_name
                 self.stats["user_name"] = new_name
-                self.p_start.set_user_name(new_name); self.p_how.set_user_name(new_name); self.p_train.set_user_name(new_name)
+                for page in (self.p_start, self.p_how, self.p_train, self.p_ach):
+                    if page is not None: page.set_user_name(new_name)
             # сброс
             if reset:
-                self.p_train.idx = 0; self.p_train.known = 0; self.p_train.unknown = 0
-                self.p_train._save_cb(); self.p_train._load()
-            else:
-                save_stats(STATS_FILE, self.stats)
+                if self.p_train is not None:
+                    self.p_train.reset_progress()
+                else:
+                    self.progress.reset_counters(); self.scheduler.reset(); self.stats["current_index"] = 0
+            self._flush_progress()
     def closeEvent(self, e):
         try:
-            self._save_progress()
+            self._flush_progress()
         except Exception as ex:
-            print("Error saving stats on close:", ex)
+            ing_metrics.count("errors.stats_save"); print("Error saving stats on close:", ex)
+        if self._search_thread is not None: self._search_thread.quit(); self._search_thread.wait(); self._search_worker.close()
+        if ing_metrics.ENABLED:
+            extra = {"examples_cache": self.p_train.render_stats(), "prefetch": self.p_train.prefetch.counters()} if self.p_train is not None else None
+            path = ing_metrics.export_json(DATA_DIR / METRICS_FILE_NAME, extra)
+            print(ing_metrics.format_summary()); print("Metrics saved to", path)
+        if self.p_train is not None: self.p_train.shutdown()
+        self.progress.close(); self.scheduler.close()
+        if self.words is not None: self.words.close()
+        get_registry().close()
+        if "ing_crypto" in sys.modules: sys.modules["ing_crypto"].close_all()  # расшифрованные копии, если были
         super().closeEvent(e)
 
 # ----------------- QSS -----------------
@@ -468,22 +806,35 @@ def main():
     if ICON_FILE.exists():
         app.setWindowIcon(QIcon(str(ICON_FILE)))
     app.setStyleSheet(QSS)
+    profiler = StartupProfiler("--profile-startup" in sys.argv)
+    ing_metrics.enable("--metrics" in sys.argv or bool(os.environ.get("ING_METRICS")))
 
     stats = load_stats(STATS_FILE)
-    words = load_all_words()
+    # Словарь открывается в фоне — стартовые экраны и NameDialog его не ждут.
+    loader = WordsLoader(stats.get("packs") or [ing_packs.BASE_PACK], stats.get("current_index", 0)); loader_thread = QThread()
+    loader.moveToThread(loader_thread); loader_thread.started.connect(loader.run)
+    loader.ready.connect(loader_thread.quit)
+    loader_thread.start()
+    progress = ing_progress.ProgressLog(PROGRESS_FILE)
+    progress.import_stats(stats)  # только при первом запуске с progress.db
+    scheduler = ing_scheduler.Scheduler(PROGRESS_FILE)
 
     current = (stats.get("user_name") or "").strip()
     if not current:
         dlg = NameDialog()
         user_name = dlg.user_name if dlg.exec_() == QDialog.Accepted else "Гость"
         stats["user_name"] = user_name
+        if user_name != "Гость": ing_stats.stamp_settings(stats, ["user_name"])  # «Гость» по умолчанию — не правка
         save_stats(STATS_FILE, stats)
     else:
         user_name = current
 
-    w = MainWindow(words, stats, user_name)
+    w = MainWindow(loader, stats, user_name, progress, scheduler, profiler)
+    profiler.watch_first_paint(w)
     w.show()
-    sys.exit(app.exec_())
+    code = app.exec_()
+    loader_thread.wait()
+    sys.exit(code)
 
 if __name__ == "__main__":
     main()
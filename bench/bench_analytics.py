@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_analytics  # noqa: E402
+import ing_progress  # noqa: E402
+
+
+def _prefill(db_path: Path, rows: int, words: int, days: int, seed: int) -> None:
+    """rows ответов за последние days дней по возрастанию ts, как их пишет ProgressLog;
+    у части слов ошибки чаще — чтобы было что показать в «трудных»."""
+    rng = random.Random(seed)
+    conn = ing_progress.connect(db_path)
+    now = ing_progress.now_ms()
+    span = days * ing_analytics.DAY_S * 1000
+    chunk = 100_000
+    with conn:
+        for start in range(0, rows, chunk):
+            batch = []
+            for i in range(start, min(start + chunk, rows)):
+                wid = rng.randrange(1, words + 1)
+                batch.append((wid, now - span + span * i // rows, rng.random() < (0.4 if wid % 17 == 0 else 0.75),
+                              rng.randint(300, 8000) if rng.random() < 0.95 else None))
+            conn.executemany("INSERT INTO reviews(word_id, ts, outcome, latency_ms) VALUES (?, ?, ?, ?)", batch)
+    conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="ing_analytics.dashboard() time vs review history size")
+    parser.add_argument("--history", type=int, nargs="+", default=[100_000, 1_000_000, 3_000_000])
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--append", type=int, default=500, help="answers added between the two opens")
+    parser.add_argument("--show", action="store_true", help="print the last dashboard as JSON")
+    args = parser.parse_args()
+
+    if not ing_analytics.AVAILABLE:
+        print("numpy is not installed; nothing to measure")
+        return 1
+    data = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.history:
+            db_path = Path(tmp) / f"progress_{rows}.db"
+            _prefill(db_path, rows, args.words, args.days, seed=rows)
+            cache = Path(tmp) / f"progress_{rows}.npy"
+            start = time.perf_counter()
+            data = ing_analytics.dashboard(db_path, cache)
+            cold_ms = (time.perf_counter() - start) * 1000
+            log = ing_progress.ProgressLog(db_path)
+            for i in range(args.append):
+                log.record(i % args.words + 1, ing_progress.OUTCOME_KNOW, 1500)
+            log.close()
+            start = time.perf_counter()
+            data = ing_analytics.dashboard(db_path, cache)
+            warm_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            ing_analytics.dashboard_html(data, lambda wid: f"слово {wid}")
+            html_ms = (time.perf_counter() - start) * 1000
+            print(f"{rows:>9} reviews: first open {cold_ms:7.1f} ms  "
+                  f"cached + {args.append} new {warm_ms:7.1f} ms  html {html_ms:5.1f} ms")
+    if args.show and data is not None:
+        print(json.dumps(data, ensure_ascii=False, indent=1))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import argparse
+import gzip
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+import export_ing_db_to_json as exporter  # noqa: E402
+from ing_bundle import Bundle  # noqa: E402
+from synth import make_db  # noqa: E402
+
+DEFAULT_SIZES = [1500, 50_000, 200_000]
+LOOKUPS = 1000
+
+
+def _best(fn, repeat: int = 3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _load_json(out: Path) -> list[dict]:
+    # What the app needs from the JSON assets: every word with its examples.
+    words = json.loads((out / "words.json").read_text(encoding="utf-8"))["items"]
+    examples = json.loads((out / "examples.json").read_text(encoding="utf-8"))["items"]
+    by_word: dict[int, list] = {}
+    for ex in examples:
+        by_word.setdefault(ex["word_id"], []).append({"ing": ex["ing"], "rus": ex["rus"]})
+    for word in words:
+        word["examples"] = by_word.get(word["id"], [])
+    return words
+
+
+def _sample_bundle(path: Path, picks: list[int]) -> int:
+    with Bundle.open(path) as bundle:
+        return sum(len(bundle[i]["ingush"]) + len(bundle.examples(i)) for i in picks)
+
+
+def _validate(path: Path) -> None:
+    with Bundle.open(path) as bundle:
+        bundle.validate()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Binary bundle vs JSON assets: size and load time")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            db_path = make_db(Path(tmp) / f"synth_{size}.db", size)
+            out = Path(tmp) / f"out_{size}"
+            exporter.export_db(out, db_path, bundle=True)
+            json_raw = b"".join((out / name).read_bytes() for name in exporter.TABLE_EXPORTS)
+            bin_raw = (out / exporter.BUNDLE_NAME).read_bytes()
+            picks = random.Random(0).choices(range(size), k=LOOKUPS)
+
+            json_s, _ = _best(lambda: _load_json(out))
+            open_s, _ = _best(lambda: _sample_bundle(out / exporter.BUNDLE_NAME, picks))
+            valid_s, _ = _best(lambda: _validate(out / exporter.BUNDLE_NAME), repeat=1)
+            print(
+                f"{size:>8} words  json {len(json_raw) / 2**20:6.1f} MiB (gz {len(gzip.compress(json_raw)) / 2**20:5.1f})"
+                f"  bundle {len(bin_raw) / 2**20:6.1f} MiB (gz {len(gzip.compress(bin_raw)) / 2**20:5.1f})"
+                f"  json parse {json_s * 1000:7.1f} ms"
+                f"  bundle open+{LOOKUPS} words {open_s * 1000:6.1f} ms"
+                f"  validate {valid_s * 1000:7.1f} ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
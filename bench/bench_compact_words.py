@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import argparse
+import gc
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_db  # noqa: E402
+import ing_migrations  # noqa: E402
+import ing_words  # noqa: E402
+from synth import make_db  # noqa: E402
+
+DEFAULT_SIZES = [100_000, 300_000]
+
+
+def _measure(fn) -> tuple[float, int, int, object]:
+    """Seconds, peak and retained (still allocated after the call) bytes."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, retained, result
+
+
+def _access_us(words, n: int, rng: random.Random) -> float:
+    picks = [rng.randrange(len(words)) for _ in range(n)]
+    start = time.perf_counter()
+    for i in picks:
+        words[i]
+        words.examples(i)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Resident memory: list of dicts vs CompactWordSource")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--access", type=int, default=20_000, help="random word+examples reads to time")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            db_path = make_db(Path(tmp) / f"synth_{size}.db", size)
+            ing_migrations.migrate_file(db_path)
+            dict_s, dict_peak, dict_kept, words = _measure(lambda: ing_db.load_all_words(db_path))
+            compact_s, compact_peak, compact_kept, compact = _measure(lambda: ing_db.load_compact(db_path))
+            for i in (0, size // 2, size - 1):
+                expected = dict(words[i])
+                assert compact.examples(i) == expected.pop("examples"), "examples diverged"
+                assert compact[i] == expected, "word diverged"
+            dict_us = _access_us(ing_words.ListWordSource(words), args.access, rng)   # what TrainerPage would see
+            del words
+            compact_us = _access_us(compact, args.access, rng)
+            print(f"{size:>8} words  dicts {dict_kept / 2**20:7.1f} MiB kept ({dict_peak / 2**20:7.1f} peak, "
+                  f"{dict_s:5.2f} s, {dict_us:4.1f} us/read)  compact {compact_kept / 2**20:6.1f} MiB kept "
+                  f"({compact_peak / 2**20:6.1f} peak, {compact_s:5.2f} s, {compact_us:4.1f} us/read)  "
+                  f"x{dict_kept / compact_kept:.1f} smaller")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_crypto  # noqa: E402
+import ing_db  # noqa: E402
+import ing_migrations  # noqa: E402
+import ing_words  # noqa: E402
+from synth import make_db  # noqa: E402
+
+KEY = "bench-key"
+
+
+def _open_ms(connect, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        connect().close()
+    return (time.perf_counter() - start) * 1000 / n
+
+
+def _lookups_us(connect, size: int, reads: int, seed: int) -> float:
+    # The queries behind WordSource.examples() and a trainer jump to a word by id.
+    conn = connect()
+    rng = random.Random(seed)
+    picks = [rng.randrange(1, size + 1) for _ in range(reads)]
+    start = time.perf_counter()
+    for wid in picks:
+        conn.execute(f"SELECT {ing_words.WORD_COLUMNS} FROM words WHERE id = ?", (wid,)).fetchone()
+        conn.execute("SELECT ing, rus FROM examples WHERE word_id = ? ORDER BY id", (wid,)).fetchall()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed / reads * 1e6
+
+
+def _load_s(connect, db_path: Path) -> tuple[float, list]:
+    start = time.perf_counter()
+    words = ing_db.load_all_words(db_path, connect=connect)
+    return time.perf_counter() - start, words
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reads from a plain, an encrypted and a decrypted in-memory dictionary")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20_000, 100_000])
+    parser.add_argument("--reads", type=int, default=5_000, help="random word+examples lookups per path")
+    parser.add_argument("--opens", type=int, default=5, help="connections opened to time the key derivation")
+    args = parser.parse_args()
+
+    if not ing_crypto.AVAILABLE:
+        print("pysqlcipher3/sqlcipher3 is not installed; nothing to measure")
+        return 1
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            plain = make_db(Path(tmp) / f"plain_{size}.db", size)
+            ing_migrations.migrate_file(plain)
+            encrypted = ing_crypto.encrypt_copy(plain, Path(tmp) / f"encrypted_{size}.db", KEY)
+            assert ing_crypto.is_encrypted(encrypted) and not ing_crypto.is_encrypted(plain)
+
+            start = time.perf_counter()
+            snap = ing_crypto.open_snapshot(encrypted, KEY)
+            snapshot_s = time.perf_counter() - start
+            paths = {
+                "plain": lambda: ing_migrations.connect_readonly(plain),
+                "encrypted": lambda: ing_crypto.connect_encrypted(encrypted, KEY),
+                "snapshot": snap.connect,
+            }
+            loaded = {}
+            print(f"{size:>8} words  (decrypting into memory once: {snapshot_s:.2f} s)")
+            for name, connect in paths.items():
+                open_ms = _open_ms(connect, args.opens)
+                reads_us = _lookups_us(connect, size, args.reads, seed=size)
+                load_s, loaded[name] = _load_s(connect, plain)
+                print(f"  {name:<9} open {open_ms:8.2f} ms  word+examples by id {reads_us:6.1f} us  "
+                      f"load_all_words {load_s:5.2f} s")
+            assert loaded["snapshot"] == loaded["plain"] == loaded["encrypted"], "decrypted copy diverged"
+            ing_crypto.close_all()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+import export_ing_db_to_json as exporter  # noqa: E402
+from synth import make_db  # noqa: E402
+
+DEFAULT_SIZES = [1500, 50_000, 200_000]
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Streaming exporter: time and peak memory")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--jobs", type=int, default=1, help="passed to export_db (process pool when > 1)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            db_path = make_db(Path(tmp) / f"synth_{size}.db", size)
+            out = Path(tmp) / f"out_{size}"
+            first_s, first_peak, _ = _measure(lambda: exporter.export_db(out, db_path, jobs=args.jobs))
+            again_s, _, report = _measure(lambda: exporter.export_db(out, db_path, jobs=args.jobs))
+            db_path.touch()
+            rehash_s, _, _ = _measure(lambda: exporter.export_db(out, db_path, jobs=args.jobs))
+            size_mb = sum(p.stat().st_size for p in out.glob("*.json")) / 2**20
+            print(
+                f"{size:>8} words  {size_mb:7.1f} MiB json  export {first_s:6.2f} s peak {first_peak / 2**20:6.2f} MiB"
+                f"  rerun {again_s * 1000:6.1f} ms ({'/'.join(sorted(set(report.values())))})"
+                f"  touched-source {rehash_s:5.2f} s"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
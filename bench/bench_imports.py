@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# "10" is the desktop app (10.py); the rest are its Qt-free modules.
+DEFAULT_MODULES = ["10", "ing_migrations", "ing_words", "ing_progress", "ing_scheduler", "ing_stats", "ing_render"]
+DEFAULT_BUDGET_MS = 400.0
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def _importtime(module: str) -> tuple[float, dict[str, int]]:
+    code = f"import sys; sys.path.insert(0, {str(ROOT)!r}); import importlib; importlib.import_module({module!r})"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=ROOT, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    top: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match and len(match.group(3)) == 1:   # top-level imports only; nested ones are in their cumulative time
+            top[match.group(4)] = int(match.group(2))
+    return sum(top.values()) / 1000, top
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time budget (python -X importtime) for the app modules")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per module; the median is reported")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="limit for the app module (10)")
+    parser.add_argument("--top", type=int, default=8, help="slowest top-level imports to list")
+    args = parser.parse_args()
+
+    over = False
+    for module in args.modules:
+        try:
+            runs = [_importtime(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{module:>16}  failed: {e}")
+            continue
+        totals = [total for total, _ in runs]
+        median = statistics.median(totals)
+        budget = f"  budget {args.budget_ms:.0f} ms" if module == "10" else ""
+        if module == "10" and median > args.budget_ms:
+            over = True
+            budget += " EXCEEDED"
+        print(f"{module:>16}  {median:8.1f} ms (min {min(totals):.1f}){budget}")
+        slowest = sorted(runs[totals.index(median)][1].items(), key=lambda item: -item[1])[: args.top]
+        for name, us in slowest:
+            print(f"{'':>18}{us / 1000:8.1f} ms  {name}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_db  # noqa: E402
+from synth import make_db  # noqa: E402
+
+DEFAULT_SIZES = [1500, 50_000, 500_000]
+
+
+def _load_n_plus_one(db_path: Path) -> list[dict]:
+    # The pre-bulk loader: one examples query per word.
+    conn = sqlite3.connect(str(db_path))
+    cur = conn.cursor()
+    cur.execute("SELECT id, ingush, russian, transcription FROM words ORDER BY id")
+    words = []
+    for wid, ing, rus, tr in cur.fetchall():
+        cur.execute("SELECT ing, rus FROM examples WHERE word_id = ? ORDER BY id", (wid,))
+        exs = [{"ing": r[0], "rus": r[1]} for r in cur.fetchall()]
+        words.append({"id": wid, "ingush": ing, "russian": rus, "transcription": tr or "", "examples": exs})
+    conn.close()
+    return words
+
+
+def _best_of(fn, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Startup-time benchmark for load_all_words")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=1500,
+        help="largest size to also time the N+1 loader on (it is quadratic without indexes)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            db_path = make_db(Path(tmp) / f"synth_{size}.db", size)
+            bulk_s, bulk = _best_of(lambda: ing_db.load_all_words(db_path), args.repeat)
+            line = f"{size:>8} words  bulk {bulk_s * 1000:9.1f} ms"
+            if size <= args.legacy_max:
+                legacy_s, legacy = _best_of(lambda: _load_n_plus_one(db_path), args.repeat)
+                assert legacy == bulk, "bulk loader diverged from the N+1 loader"
+                line += f"  n+1 {legacy_s * 1000:9.1f} ms  x{legacy_s / bulk_s:.1f}"
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
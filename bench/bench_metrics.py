@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_metrics  # noqa: E402
+
+
+@ing_metrics.timed("bench.decorated")
+def _decorated():
+    pass
+
+
+def _plain():
+    pass
+
+
+def _per_call_ns(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) * 1e9 / n
+
+
+def _with_timer():
+    with ing_metrics.timer("bench.timer"):
+        pass
+
+
+def _with_count():
+    ing_metrics.count("bench.count")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-call cost of ing_metrics, disabled and enabled")
+    parser.add_argument("-n", type=int, default=500_000)
+    args = parser.parse_args()
+
+    base = _per_call_ns(_plain, args.n)
+    print(f"{'plain call':>22}: {base:7.1f} ns")
+    for enabled in (False, True):
+        ing_metrics.enable(enabled)
+        ing_metrics.reset()
+        state = "on" if enabled else "off"
+        for label, fn in (("timed()", _decorated), ("with timer()", _with_timer), ("count()", _with_count)):
+            cost = _per_call_ns(fn, args.n) - base
+            print(f"{label + ' ' + state:>22}: {cost:+7.1f} ns over a plain call")
+    print(ing_metrics.format_summary())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
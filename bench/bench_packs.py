@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_migrations  # noqa: E402
+import ing_packs  # noqa: E402
+from synth import make_db  # noqa: E402
+
+QUERY = "SELECT id, ingush, russian, transcription FROM words WHERE id = ?"
+
+
+def _run(threads: int, per_thread: int, lookup) -> float:
+    def work(seed: int):
+        for k in range(per_thread):
+            lookup(1 + (seed * 7919 + k * 104729) % 1000)
+
+    workers = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pooled vs per-call read-only connections across packs")
+    parser.add_argument("--packs", type=int, default=3)
+    parser.add_argument("--words", type=int, default=20_000, help="words per pack")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--lookups", type=int, default=2000, help="lookups per thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "packs").mkdir()
+        base = make_db(tmp / "ing_base.db", args.words, seed=0)
+        for n in range(1, args.packs):
+            make_db(tmp / "packs" / f"pack{n}.db", args.words, seed=n)
+        registry = ing_packs.Registry(
+            base, [tmp / "packs"], tmp / "data",
+            connect=lambda path: ing_migrations.connect_readonly(path, check_same_thread=False),
+        )
+        names = registry.names
+        paths = {name: registry.db_path(name) for name in names}   # migrate once, outside the timings
+
+        def fresh(word_id: int):
+            conn = ing_migrations.connect_readonly(paths[names[word_id % len(names)]])
+            try:
+                conn.execute(QUERY, (word_id,)).fetchone()
+            finally:
+                conn.close()
+
+        def pooled(word_id: int):
+            with registry.pool(names[word_id % len(names)]).connection() as conn:
+                conn.execute(QUERY, (word_id,)).fetchone()
+
+        total = args.threads * args.lookups
+        for label, lookup in (("connect per call", fresh), ("pool", pooled)):
+            elapsed = _run(args.threads, args.lookups, lookup)
+            print(f"{label:>17}: {total / elapsed:9.0f} lookups/s  ({elapsed * 1e6 / total:6.1f} us each)")
+        opened = {name: registry.pool(name).opened for name in names}
+        print(f"{'':>17}  pooled connections opened per pack: {opened}")
+
+        words = registry.open_words(names)
+        start = time.perf_counter()
+        for i in range(0, len(words), max(1, len(words) // 1000)):
+            words[i]
+        print(f"{'mixed source':>17}: {len(words)} words over {len(names)} packs, "
+              f"1000 jumps in {(time.perf_counter() - start) * 1000:.1f} ms")
+        words.close()
+        registry.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
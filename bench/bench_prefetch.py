@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_migrations  # noqa: E402
+import ing_prefetch  # noqa: E402
+import ing_progress  # noqa: E402
+import ing_scheduler  # noqa: E402
+import ing_session  # noqa: E402
+import ing_words  # noqa: E402
+from synth import make_db  # noqa: E402
+
+
+class SlowSource:
+    """WordSource with a fixed cost per uncached read, standing in for SQLCipher page decryption."""
+
+    def __init__(self, source: ing_words.WordSource, delay_ms: float):
+        self._source, self._delay = source, delay_ms / 1000
+
+    def __len__(self):
+        return len(self._source)
+
+    def __getitem__(self, i):
+        before = self._source.queries
+        word = self._source[i]
+        if self._source.queries != before:
+            time.sleep(self._delay)
+        return word
+
+    def examples(self, i):
+        before = self._source.queries
+        examples = self._source.examples(i)
+        if self._source.queries != before:
+            time.sleep(self._delay)
+        return examples
+
+    def index_of(self, word_id):
+        return self._source.index_of(word_id)
+
+    def contains(self, word_id):
+        return self._source.contains(word_id)
+
+    def close(self):
+        self._source.close()
+
+
+def _run(db_path: Path, work: Path, depth: int, steps: int, think_ms: float, delay_ms: float) -> dict:
+    def open_source():
+        return SlowSource(ing_words.WordSource(lambda: ing_migrations.connect_readonly(db_path)), delay_ms)
+
+    words = open_source()
+    progress = ing_progress.ProgressLog(work / f"progress_{depth}.db")
+    scheduler = ing_scheduler.Scheduler(work / f"progress_{depth}.db")
+    clock = [ing_progress.now_ms()]
+    session = ing_session.Session(words, progress, scheduler, clock=lambda: clock[0])
+    prefetch = ing_prefetch.Prefetcher(open_source, depth)
+    rng = random.Random(0)
+    gui_s = 0.0
+    worst = 0.0
+    try:
+        for _ in range(steps):
+            start = time.perf_counter()
+            card = prefetch.get(session.idx, words)   # what TrainerPage._load needs
+            prefetch.plan(*session.upcoming(prefetch.depth))
+            step = time.perf_counter() - start
+            gui_s += step
+            worst = max(worst, step)
+            time.sleep(think_ms / 1000)   # the learner reads the card; the worker runs meanwhile
+            clock[0] += rng.randint(1_500, 8_000)
+            if rng.random() < 0.8:
+                session.know()
+            else:
+                start = time.perf_counter()
+                session.dont()
+                prefetch.examples_html(session.idx, words)   # TrainerPage._dont reads examples only now
+                gui_s += time.perf_counter() - start
+                session.advance()
+            if card is None:
+                break
+    finally:
+        prefetch.close()
+        progress.close()
+        scheduler.close()
+        words.close()
+    return {"gui_ms": gui_s * 1000 / steps, "worst_ms": worst * 1000, **prefetch.counters()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="GUI-thread time per trainer step with and without read-ahead")
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 2, ing_prefetch.DEPTH])
+    parser.add_argument("--think-ms", type=float, default=30.0, help="time a learner looks at a card")
+    parser.add_argument("--read-delay-ms", type=float, default=5.0, help="extra cost of every uncached read")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        db_path = make_db(work / "synth.db", args.words)
+        ing_migrations.migrate_file(db_path)
+        for depth in args.depths:
+            r = _run(db_path, work, depth, args.steps, args.think_ms, args.read_delay_ms)
+            print(f"depth {depth:>2}: {r['gui_ms']:6.2f} ms/step on the GUI thread (worst {r['worst_ms']:6.2f})  "
+                  f"hits {r['hits']:>4} misses {r['misses']:>4} hit rate {r['hit_rate']:.2f}  "
+                  f"worker {r['fetched']} reads, {r['avg_fetch_ms']:.2f} ms avg")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
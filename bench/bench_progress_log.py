@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_progress  # noqa: E402
+
+
+def _prefill(db_path: Path, rows: int, words: int, seed: int) -> None:
+    rng = random.Random(seed)
+    conn = ing_progress.connect(db_path)
+    ts = ing_progress.now_ms() - rows * 1000
+    chunk = 100_000
+    with conn:
+        for start in range(0, rows, chunk):
+            conn.executemany(
+                "INSERT INTO reviews(word_id, ts, outcome, latency_ms) VALUES (?, ?, ?, ?)",
+                [(rng.randrange(1, words + 1), ts + (start + i) * 1000, rng.random() < 0.7,
+                  rng.randint(300, 8000)) for i in range(min(chunk, rows - start))])
+    conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="progress.db: open and per-answer cost vs history size")
+    parser.add_argument("--history", type=int, nargs="+", default=[0, 100_000, 1_000_000])
+    parser.add_argument("--answers", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.history:
+            db_path = Path(tmp) / f"progress_{rows}.db"
+            _prefill(db_path, rows, args.words, seed=rows)
+
+            start = time.perf_counter()
+            log = ing_progress.ProgressLog(db_path)
+            open_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            for i in range(args.answers):
+                log.record(i % args.words + 1, i % 3 != 0, 1200)
+            log.flush()
+            per_answer_us = (time.perf_counter() - start) / args.answers * 1e6
+            log.close()
+            print(f"{rows:>9} rows  open {open_ms:7.1f} ms  record+flush {per_answer_us:6.2f} us/answer")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
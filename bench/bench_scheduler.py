@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_scheduler  # noqa: E402
+from ing_scheduler import DAY_MS, GRADE_DONT, GRADE_KNOW  # noqa: E402
+
+
+def _summary(label: str, samples: list[float]) -> str:
+    ordered = sorted(samples)
+    if not ordered:
+        return f"{label}: none"
+    mean = sum(ordered) / len(ordered)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"{label}: {len(ordered):>9} calls  mean {mean * 1e6:6.2f} us  p99 {p99 * 1e6:6.2f} us  max {ordered[-1] * 1e6:8.2f} us"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay a year of SM-2 reviews through ing_scheduler")
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--recall", type=float, default=0.85, help="probability of answering 'Знаю'")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    new_per_day = -(-args.words // args.days)
+    picks: list[float] = []
+    updates: list[float] = []
+    next_new = 1
+    perf = time.perf_counter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scheduler = ing_scheduler.Scheduler(Path(tmp) / "progress.db")
+        start_wall = perf()
+        for day in range(args.days):
+            now = day * DAY_MS + 9 * 60 * 60 * 1000
+            introduced = 0
+            while True:
+                t0 = perf()
+                wid = scheduler.next_due(now)
+                picks.append(perf() - t0)
+                if wid is None:
+                    if introduced >= new_per_day or next_new > args.words:
+                        break
+                    wid, next_new, introduced = next_new, next_new + 1, introduced + 1
+                grade = GRADE_KNOW if rng.random() < args.recall else GRADE_DONT
+                t0 = perf()
+                scheduler.grade(wid, grade, now)
+                updates.append(perf() - t0)
+                now += 8_000  # ~8 s per card
+            scheduler.flush()
+        wall = perf() - start_wall
+        cards = len(scheduler)
+        scheduler.close()
+
+    print(f"{args.days} days, {cards} cards, {len(updates)} reviews, {wall:.1f} s wall")
+    print(_summary("pick  ", picks))
+    print(_summary("update", updates))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_migrations  # noqa: E402
+import ing_search  # noqa: E402
+from synth import make_db  # noqa: E402
+
+PALOCHKA_SPELLINGS = ["I", "1", "Ӏ", "l"]
+TARGET_P95_MS = 10.0
+
+
+def _queries(db_path: Path, count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    try:
+        words = [row[0] for row in conn.execute(
+            "SELECT ingush FROM words ORDER BY random() LIMIT ?", (count,))]
+        russian = [row[0] for row in conn.execute(
+            "SELECT russian FROM words ORDER BY random() LIMIT ?", (count,))]
+    finally:
+        conn.close()
+    queries = []
+    for i in range(count):
+        source = words[i % len(words)] if i % 3 else russian[i % len(russian)]
+        prefix = source[: rng.randint(1, max(1, len(source)))]
+        for variant in ("Ӏ", "I", "ӏ"):
+            prefix = prefix.replace(variant, rng.choice(PALOCHKA_SPELLINGS))
+        queries.append(prefix)
+    return queries
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="FTS5 search latency benchmark")
+    parser.add_argument("--words", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", type=Path, help="reuse an existing database instead of generating one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or make_db(Path(tmp) / f"synth_{args.words}.db", args.words, seed=args.seed)
+        start = time.perf_counter()
+        db_path = ing_migrations.ensure_migrated(db_path, Path(tmp) / "migrated")   # --db itself stays untouched
+        print(f"migrated to v{ing_migrations.SCHEMA_VERSION} in {time.perf_counter() - start:.1f} s")
+
+        index = ing_search.SearchIndex(lambda: ing_migrations.connect_readonly(db_path))
+        queries = _queries(db_path, args.queries, args.seed)
+        for query in queries[:50]:
+            index.search(query)
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query)
+            timings.append((time.perf_counter() - start) * 1000)
+        index.close()
+
+    p50, p95, p99 = (_percentile(timings, p) for p in (50, 95, 99))
+    print(f"{len(timings)} queries  p50 {p50:.2f} ms  p95 {p95:.2f} ms  p99 {p99:.2f} ms  max {max(timings):.2f} ms")
+    if p95 > TARGET_P95_MS:
+        print(f"p95 above the {TARGET_P95_MS:.0f} ms target")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
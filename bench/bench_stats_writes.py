@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_stats  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="stats.json: write per event vs coalesced StatsStore flushes"
+    )
+    parser.add_argument("--events", type=int, default=600, help="slider ticks / trainer steps")
+    parser.add_argument("--event-hz", type=float, default=60.0, help="simulated event rate")
+    parser.add_argument("--flush-ms", type=float, default=500.0, help="flush timer interval")
+    args = parser.parse_args()
+
+    stats = {"current_index": 0, "known_count": 0, "unknown_count": 0,
+             "user_name": "Тест", "example_font_size": 16}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "stats.json"
+
+        start = time.perf_counter()
+        for i in range(args.events):
+            stats["example_font_size"] = 10 + i % 20
+            ing_stats.write_json_atomic(path, ing_stats.dump_stats(stats))
+        eager_s = time.perf_counter() - start
+
+        store = ing_stats.StatsStore(path, stats)
+        # Simulated clock: the window's QTimer fires once per flush interval.
+        events_per_flush = max(1, int(args.event_hz * args.flush_ms / 1000))
+        start = time.perf_counter()
+        for i in range(args.events):
+            stats["example_font_size"] = 10 + i % 20
+            store.mark_dirty()
+            if (i + 1) % events_per_flush == 0:
+                store.flush()
+        store.flush()
+        coalesced_s = time.perf_counter() - start
+
+    print(f"per-event : {args.events} writes  {eager_s * 1000:8.1f} ms")
+    print(f"coalesced : {store.writes} writes  {coalesced_s * 1000:8.1f} ms  {store.counters()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_progress  # noqa: E402
+import ing_scheduler  # noqa: E402
+import ing_stats  # noqa: E402
+import ing_sync  # noqa: E402
+
+
+class Device:
+    """A data dir driven like the app: answers through ProgressLog + Scheduler, settings in stats.json."""
+
+    def __init__(self, folder: Path, start_ms: int):
+        self.folder = folder
+        self.db, self.stats = folder / "progress.db", folder / "stats.json"
+        self.clock = start_ms
+        ing_stats.write_json_atomic(self.stats, ing_stats.dump_stats({"user_name": folder.name, "example_font_size": 16}))
+        conn = ing_sync.connect(self.db)
+        self.replica = ing_sync.replica_id(conn)
+        conn.close()
+
+    def study(self, rng: random.Random, answers: int, words: int) -> None:
+        progress = ing_progress.ProgressLog(self.db)
+        scheduler = ing_scheduler.Scheduler(self.db)
+        for _ in range(answers):
+            self.clock += rng.randint(1_500, 8_000)
+            wid = rng.randrange(1, words + 1)
+            know = rng.random() < 0.7
+            progress.record(wid, ing_progress.OUTCOME_KNOW if know else ing_progress.OUTCOME_DONT, 1500, ts=self.clock)
+            scheduler.grade(wid, ing_scheduler.GRADE_KNOW if know else ing_scheduler.GRADE_DONT, self.clock)
+        progress.close()
+        scheduler.close()
+        if rng.random() < 0.3:
+            stats = json.loads(self.stats.read_text(encoding="utf-8"))
+            stats["example_font_size"] = rng.randint(10, 30)
+            ing_stats.write_json_atomic(self.stats, ing_stats.dump_stats(stats))
+
+    def state(self):
+        conn = ing_sync.connect(self.db)
+        try:
+            reviews = sorted(conn.execute("SELECT word_id, ts, outcome, latency_ms FROM reviews"))
+            cards = conn.execute("SELECT * FROM cards ORDER BY word_id").fetchall()
+        finally:
+            conn.close()
+        settings = json.loads(self.stats.read_text(encoding="utf-8"))
+        return reviews, cards, {key: settings.get(key) for key in ing_sync.SETTINGS_KEYS}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Delta sync round-trips through files: convergence and delta size")
+    parser.add_argument("--devices", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--answers", type=int, default=200, help="answers per device per round")
+    parser.add_argument("--words", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        devices = [Device(tmp / f"device{n}", ing_progress.now_ms() + n) for n in range(args.devices)]
+        sent: list[Path] = []
+        delta_bytes, delta_s, apply_s = [], 0.0, 0.0
+        for round_no in range(args.rounds):
+            for device in devices:
+                device.study(rng, args.answers, args.words)
+            for _ in range(args.devices):
+                a, b = rng.sample(devices, 2)
+                out = tmp / f"changes_{round_no}_{len(sent)}.json"
+                start = time.perf_counter()
+                ing_sync.export_file(a.db, out, a.stats, peer=b.replica)
+                delta_s += time.perf_counter() - start
+                delta_bytes.append(out.stat().st_size)
+                start = time.perf_counter()
+                ing_sync.import_file(b.db, out, b.stats)
+                apply_s += time.perf_counter() - start
+                sent.append(out)
+                if rng.random() < 0.3:   # a stale or duplicated file arrives late
+                    ing_sync.import_file(rng.choice(devices).db, rng.choice(sent), None)
+        for _ in range(2):   # everyone exchanges with everyone until nothing is missing
+            for a in devices:
+                for b in devices:
+                    if a is not b:
+                        out = tmp / "final.json"
+                        ing_sync.export_file(a.db, out, a.stats, peer=b.replica)
+                        ing_sync.import_file(b.db, out, b.stats)
+        states = [device.state() for device in devices]
+        assert all(state[0] == states[0][0] for state in states), "reviews diverged"
+        assert all(state[1] == states[0][1] for state in states), "cards diverged"
+        assert all(state[2] == states[0][2] for state in states), "settings diverged"
+        full = tmp / "full.json"
+        start = time.perf_counter()
+        ing_sync.export_file(devices[0].db, full, devices[0].stats)
+        full_s = time.perf_counter() - start
+        last = delta_bytes[-args.devices:]
+        print(f"{args.devices} devices converged: {len(states[0][0])} reviews, {len(states[0][1])} cards, "
+              f"settings {states[0][2]}")
+        print(f"full history export {full.stat().st_size / 1024:8.1f} KiB in {full_s * 1000:6.1f} ms")
+        print(f"delta exports      {sum(last) / len(last) / 1024:8.1f} KiB avg in the last round "
+              f"({delta_s * 1000 / len(delta_bytes):5.1f} ms export, {apply_s * 1000 / len(delta_bytes):5.1f} ms apply)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_db  # noqa: E402
+import ing_migrations  # noqa: E402
+import ing_words  # noqa: E402
+from synth import make_db  # noqa: E402
+
+DEFAULT_SIZES = [1500, 50_000, 500_000]
+
+
+def _measure(fn) -> tuple[float, int, object]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Startup time and memory: WordSource vs load_all_words"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--steps", type=int, default=1000, help="sequential trainer steps to replay")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            db_path = make_db(Path(tmp) / f"synth_{size}.db", size)
+            ing_migrations.migrate_file(db_path)
+
+            def lazy_start():
+                src = ing_words.WordSource(lambda: ing_migrations.connect_readonly(db_path))
+                return src, src[size // 2]
+
+            eager_s, eager_peak, _ = _measure(lambda: ing_db.load_all_words(db_path))
+            lazy_s, lazy_peak, (src, _) = _measure(lazy_start)
+            start = time.perf_counter()
+            for i in range(min(args.steps, size)):
+                src[i]
+                src.examples(i)
+            step_us = (time.perf_counter() - start) / max(1, min(args.steps, size)) * 1e6
+            src.close()
+            print(
+                f"{size:>8} words  eager {eager_s * 1000:8.1f} ms {eager_peak / 2**20:7.1f} MiB"
+                f"  lazy {lazy_s * 1000:6.1f} ms {lazy_peak / 2**20:6.2f} MiB"
+                f"  step {step_us:6.1f} us"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Load test for ing_server: requests/sec and latency percentiles on localhost.
+
+    python bench/load_test.py                       # starts a server on a synthetic dictionary
+    python bench/load_test.py --db ing_base.db      # ...or on a real one
+    python bench/load_test.py --url http://127.0.0.1:8765
+
+Every client keeps one HTTP/1.1 connection open and sends requests back to
+back: word lookups, examples, dictionary pages, searches, revalidations with
+If-None-Match, and trainer answers for its own learner.
+"""
+import argparse
+import asyncio
+import json
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from synth import make_db  # noqa: E402
+
+# (kind, weight)
+MIX = (("word", 40), ("examples", 15), ("page", 10), ("search", 15), ("revalidate", 10), ("learner", 10))
+
+
+class Client:
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, target: str, headers: Optional[Dict[str, str]] = None
+                      ) -> Tuple[int, Dict[str, str], bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host}"]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        got: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            got[key.strip().lower()] = value.strip()
+        body = await self.reader.readexactly(int(got.get("content-length", 0)))
+        if got.get("connection", "").lower() == "close":
+            self.close()
+        return status, got, body
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+def _percentile(sorted_ms: List[float], q: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))]
+
+
+async def _client(n: int, host: str, port: int, ids: List[int], queries: List[str], deadline: float,
+                  seed: int, latencies: Dict[str, List[float]], errors: Dict[str, int]) -> None:
+    rng = random.Random(seed * 1_000_003 + n)
+    kinds, weights = zip(*MIX)
+    client = Client(host, port)
+    etags: Dict[str, str] = {}
+    try:
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            method, headers = "GET", {}
+            if kind == "word":
+                target = f"/words/{rng.choice(ids)}"
+            elif kind == "examples":
+                target = f"/examples/{rng.choice(ids)}"
+            elif kind == "page":
+                target = f"/words?offset={rng.randrange(0, len(ids), 50)}&limit=50"
+            elif kind == "search":
+                target = f"/search?q={quote(rng.choice(queries))}&limit=20"
+            elif kind == "revalidate" and etags:
+                target = rng.choice(list(etags))
+                headers = {"If-None-Match": etags[target]}
+            elif kind == "learner":
+                if rng.random() < 0.5:
+                    target = f"/learners/load{n}/next"
+                else:
+                    method, target = "POST", f"/learners/load{n}/answer?outcome={rng.choice(('know', 'dont'))}"
+            else:
+                continue
+            start = time.perf_counter()
+            status, got, _ = await client.request(method, target, headers)
+            latencies[kind].append((time.perf_counter() - start) * 1000)
+            if status not in (200, 304) or (kind == "revalidate" and status != 304):
+                errors[kind] += 1
+            if "etag" in got and len(etags) < 256:
+                etags[target] = got["etag"]
+    finally:
+        client.close()
+
+
+async def run(host: str, port: int, clients: int, seconds: float, seed: int) -> int:
+    probe = Client(host, port)
+    _, _, body = await probe.request("GET", "/version")
+    info = json.loads(body)
+    _, _, body = await probe.request("GET", "/words?offset=0&limit=200")
+    sample = json.loads(body)["items"]
+    probe.close()
+    if not sample:
+        print("The dictionary is empty", file=sys.stderr)
+        return 1
+    ids = list(range(1, info["words"] + 1))
+    queries = sorted({w["ingush"][:3] for w in sample if w["ingush"]} | {w["russian"].split()[0] for w in sample
+                                                                           if w["russian"].strip()})
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    started = time.perf_counter()
+    deadline = started + seconds
+    await asyncio.gather(*(_client(n, host, port, ids, queries, deadline, seed, latencies, errors)
+                           for n in range(clients)))
+    elapsed = time.perf_counter() - started
+    every = sorted(ms for values in latencies.values() for ms in values)
+    print(f"{info['words']} words, {clients} keep-alive clients, {elapsed:.1f} s: "
+          f"{len(every) / elapsed:,.0f} requests/s, p50 {_percentile(every, 0.5):.2f} ms, "
+          f"p99 {_percentile(every, 0.99):.2f} ms, errors {sum(errors.values())}")
+    for kind, _ in MIX:
+        values = sorted(latencies.get(kind, []))
+        print(f"  {kind:<10} {len(values):>8} req  p50 {_percentile(values, 0.5):7.2f} ms  "
+              f"p99 {_percentile(values, 0.99):7.2f} ms  errors {errors.get(kind, 0)}")
+    return 1 if errors else 0
+
+
+def _start_server(db_path: Path, data_dir: Path, pool: int) -> Tuple[subprocess.Popen, str, int]:
+    proc = subprocess.Popen([sys.executable, str(ROOT / "ing_server.py"), "--db", str(db_path), "--data", str(data_dir),
+                             "--port", "0", "--pool", str(pool)], stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if " on http://" not in line:
+        proc.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    address = urlsplit(line.rsplit(" on ", 1)[1].strip())
+    return proc, address.hostname, address.port
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Requests/sec and p99 latency of ing_server on localhost")
+    parser.add_argument("--url", help="an already running server; otherwise one is started here")
+    parser.add_argument("--db", type=Path, help="dictionary for the started server (default: synthetic)")
+    parser.add_argument("--words", type=int, default=20_000, help="size of the synthetic dictionary")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--pool", type=int, default=8, help="--pool for the started server")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.url:
+        address = urlsplit(args.url)
+        return asyncio.run(run(address.hostname, address.port or 80, args.clients, args.seconds, args.seed))
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or make_db(Path(tmp) / "load.db", args.words)
+        proc, host, port = _start_server(db_path, Path(tmp) / "server", args.pool)
+        try:
+            return asyncio.run(run(host, port, args.clients, args.seconds, args.seed))
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            try:
+                print("server:", proc.communicate(timeout=30)[0].strip().splitlines()[-1])
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
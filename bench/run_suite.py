@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Benchmark suite: times the app's hot paths on synthetic dictionaries and records the results.
+
+    python bench/run_suite.py                                   # 10k and 100k words, every case
+    python bench/run_suite.py --sizes 10000 --cases export_db trainer_nav
+    python bench/run_suite.py --db-cache /tmp/ing-bench         # reuse generated databases between runs
+    python bench/run_suite.py --baseline bench/results/<earlier>.json --threshold 0.1
+
+Each case reports the best of --repeat runs. The results, with the machine
+and Python version, go to bench/results/<timestamp>.json (or --output).
+With --baseline the run is compared with that earlier results file: a case
+slower than the baseline by more than --threshold (a fraction, default 0.20
+= 20%) is printed as a regression and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+import export_ing_db_to_json as exporter  # noqa: E402
+import ing_db  # noqa: E402
+import ing_migrations  # noqa: E402
+import ing_stats  # noqa: E402
+import ing_words  # noqa: E402
+from synth import make_db  # noqa: E402
+
+BENCH_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCH_DIR / "results"
+DEFAULT_SIZES = [10_000, 100_000]
+DEFAULT_THRESHOLD = 0.20
+CASES = ["load_all_words", "word_source_nav", "save_stats", "export_db", "json_decode", "trainer_nav"]
+
+
+def _best(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _db_for(cache_dir: Path, size: int, examples: tuple[int, int], seed: int) -> Path:
+    path = cache_dir / f"synth_{size}_{examples[0]}-{examples[1]}_s{seed}.db"
+    if not path.exists():
+        tmp = path.with_name(path.name + ".tmp")
+        make_db(tmp, size, examples, seed)
+        os.replace(tmp, path)
+    return path
+
+
+def _word_source_nav(db: Path, steps: int, seed: int) -> dict:
+    source = ing_words.WordSource(lambda: ing_migrations.connect_readonly(db))
+    rng = random.Random(seed)
+    try:
+        n = len(source)
+        i = 0
+        for step in range(steps):
+            i = rng.randrange(n) if step % 20 == 0 else min(n - 1, i + 1)   # mostly forward, sometimes a jump
+            source[i]
+            source.examples(i)
+        return {"queries": source.queries}
+    finally:
+        source.close()
+
+
+def _save_stats(tmp: Path, writes: int) -> dict:
+    stats = {"current_index": 0, "known_count": 0, "unknown_count": 0, "user_name": "bench", "example_font_size": 16}
+    path = tmp / "stats.json"
+    for k in range(writes):
+        stats["current_index"] = k
+        ing_stats.write_json_atomic(path, ing_stats.dump_stats(stats))
+    return {"writes": writes}
+
+
+def _json_decode(out: Path) -> dict:
+    sizes = {}
+    for name in ("words.json", "examples.json", "seed.json"):
+        path = out / name
+        json.loads(path.read_text(encoding="utf-8"))
+        sizes[name] = path.stat().st_size
+    return {"bytes": sizes}
+
+
+def _trainer_nav(db: Path, tmp: Path, steps: int, seed: int) -> dict:
+    home = tmp / "home"
+    home.mkdir(exist_ok=True)
+    env = {**os.environ, "QT_QPA_PLATFORM": "offscreen", "HOME": str(home), "APPDATA": str(home)}
+    proc = subprocess.run(
+        [sys.executable, str(BENCH_DIR / "trainer_nav.py"), str(db), "--steps", str(steps), "--seed", str(seed)],
+        capture_output=True, text=True, env=env,
+    )
+    if proc.returncode != 0:
+        return {"skipped": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(args) -> dict:
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch = Path(scratch)
+        cache_dir = args.db_cache or scratch
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for size in args.sizes:
+            gen_start = time.perf_counter()
+            db = _db_for(cache_dir, size, args.examples, args.seed)
+            gen_s = time.perf_counter() - gen_start
+            tmp = scratch / f"run_{size}"
+            tmp.mkdir()
+            out = tmp / "assets"
+            cases: dict[str, dict] = {}
+            if "load_all_words" in args.cases:
+                s, words = _best(lambda: ing_db.load_all_words(db), args.repeat)
+                cases["load_all_words"] = {"seconds": s, "words": len(words)}
+                del words
+            if "word_source_nav" in args.cases:
+                s, info = _best(lambda: _word_source_nav(db, args.steps, args.seed), args.repeat)
+                cases["word_source_nav"] = {"seconds": s, "steps": args.steps, **info}
+            if "save_stats" in args.cases:
+                s, info = _best(lambda: _save_stats(tmp, 100), args.repeat)
+                cases["save_stats"] = {"seconds": s, **info}
+            if "export_db" in args.cases or "json_decode" in args.cases:
+                s, _ = _best(lambda: exporter.export_db(out, db, force=True), 1)
+                if "export_db" in args.cases:
+                    cases["export_db"] = {"seconds": s}
+            if "json_decode" in args.cases:
+                s, info = _best(lambda: _json_decode(out), args.repeat)
+                cases["json_decode"] = {"seconds": s, **info}
+            if "trainer_nav" in args.cases:
+                cases["trainer_nav"] = _trainer_nav(db, tmp, args.steps, args.seed)
+            results[str(size)] = {"generate_seconds": gen_s, "cases": cases}
+            line = "  ".join(
+                f"{name} {info['seconds'] * 1000:.1f} ms" if "seconds" in info else f"{name} skipped"
+                for name, info in cases.items()
+            )
+            print(f"{size:>9} words  {line}")
+    return results
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    regressions = []
+    for size, entry in current["results"].items():
+        old_cases = baseline.get("results", {}).get(size, {}).get("cases", {})
+        for name, info in entry["cases"].items():
+            old = old_cases.get(name, {})
+            if "seconds" in info and old.get("seconds"):
+                ratio = info["seconds"] / old["seconds"]
+                if ratio > 1 + threshold:
+                    regressions.append(f"{size} {name}: {old['seconds'] * 1000:.1f} -> {info['seconds'] * 1000:.1f} ms "
+                                       f"({(ratio - 1) * 100:+.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite over synthetic dictionaries; results as JSON")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="words per database (10k..1M)")
+    parser.add_argument("--examples", type=int, nargs=2, default=(1, 3), metavar=("MIN", "MAX"),
+                        help="examples per word")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="best of N for each case")
+    parser.add_argument("--steps", type=int, default=2000, help="navigation steps per run")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--db-cache", type=Path, help="keep generated databases here between runs")
+    parser.add_argument("--output", type=Path, help=f"results file (default: {RESULTS_DIR.name}/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, help="earlier results file; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown vs baseline")
+    args = parser.parse_args()
+    args.examples = tuple(args.examples)
+    args.steps = max(1, args.steps)
+
+    started = time.strftime("%Y%m%d-%H%M%S")
+    data = {
+        "meta": {
+            "started": started,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlite": sqlite3.sqlite_version,
+            "args": {"sizes": args.sizes, "examples": list(args.examples), "seed": args.seed,
+                     "repeat": args.repeat, "steps": args.steps, "cases": args.cases},
+        },
+        "results": run(args),
+    }
+    output = args.output or RESULTS_DIR / f"{started}.json"
+    ing_stats.write_json_atomic(output, json.dumps(data, ensure_ascii=False, indent=2))
+    print(f"results: {output}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(baseline, data, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
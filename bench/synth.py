@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import sqlite3
+from pathlib import Path
+
+# Same DDL as the shipped ing_base.db.
+SCHEMA = """
+CREATE TABLE words (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    seq INTEGER NOT NULL,
+    ingush TEXT NOT NULL,
+    russian TEXT NOT NULL,
+    transcription TEXT
+);
+CREATE TABLE examples (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    word_id INTEGER NOT NULL,
+    ing TEXT NOT NULL,
+    rus TEXT NOT NULL,
+    FOREIGN KEY(word_id) REFERENCES words(id)
+);
+"""
+
+ING_SYLLABLES = [
+    "кIа", "хьа", "гIа", "аь", "до", "ла", "ма", "шо", "ди", "ва", "йо", "кхе",
+    "Iа", "тIе", "чIа", "ча", "ко", "ро", "нах", "баь", "са", "ха", "lи", "1о",
+    "ӀӀа", "ц1а", "къа", "хье", "даь", "лаг", "ар", "ув", "ерг", "ий",
+]
+RUS_SYLLABLES = [
+    "ка", "ма", "ра", "то", "ло", "ни", "ве", "ст", "за", "по", "ри", "на",
+    "до", "ку", "ше", "жи", "бы", "лю", "ще", "чо", "го", "ме", "ва", "сла",
+]
+
+
+BATCH_SIZE = 10_000
+
+
+def _word(rng: random.Random, syllables: list[str], lo: int, hi: int) -> str:
+    return "".join(rng.choice(syllables) for _ in range(rng.randint(lo, hi)))
+
+
+def _sentence(rng: random.Random, syllables: list[str]) -> str:
+    words = [_word(rng, syllables, 1, 4) for _ in range(rng.randint(3, 8))]
+    return " ".join(words).capitalize() + "."
+
+
+def make_db(
+    path: Path,
+    n_words: int,
+    examples_per_word: tuple[int, int] = (2, 2),
+    seed: int = 0,
+) -> Path:
+    path = Path(path)
+    if path.exists():
+        path.unlink()
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+        words = []
+        examples = []
+
+        def insert():
+            conn.executemany(
+                "INSERT INTO words (id, seq, ingush, russian, transcription) VALUES (?, ?, ?, ?, ?)",
+                words,
+            )
+            conn.executemany("INSERT INTO examples (word_id, ing, rus) VALUES (?, ?, ?)", examples)
+            words.clear()
+            examples.clear()
+
+        # Same RNG call order as a single pass, inserted in batches so 1M words fit in memory.
+        for wid in range(1, n_words + 1):
+            ing = _word(rng, ING_SYLLABLES, 1, 4).capitalize()
+            rus = _word(rng, RUS_SYLLABLES, 2, 5).capitalize()
+            tr = _word(rng, RUS_SYLLABLES, 1, 3) if rng.random() < 0.2 else ""
+            words.append((wid, wid, ing, rus, tr))
+            for _ in range(rng.randint(*examples_per_word)):
+                examples.append((wid, _sentence(rng, ING_SYLLABLES), _sentence(rng, RUS_SYLLABLES)))
+            if len(words) >= BATCH_SIZE:
+                insert()
+        insert()
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic ing_base.db")
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--words", type=int, default=1500)
+    parser.add_argument("--examples-min", type=int, default=2)
+    parser.add_argument("--examples-max", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    make_db(args.output, args.words, (args.examples_min, args.examples_max), args.seed)
+    print(args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
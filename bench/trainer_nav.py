@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Headless TrainerPage navigation for run_suite.py; prints one JSON object.
+
+Run in a subprocess with QT_QPA_PLATFORM=offscreen and HOME/APPDATA pointing
+at a scratch directory, so the app's DATA_DIR (progress.db, migrated copy)
+never touches the real user profile.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("db", type=Path)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError as e:
+        print(json.dumps({"skipped": f"PyQt5 not available: {e}"}))
+        return 0
+
+    spec = importlib.util.spec_from_file_location("trainer_app", ROOT / "10.py")
+    app_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app_module)
+    app_module.DB_FILE = args.db.resolve()   # get_registry() reads it on first use
+
+    qt_app = QApplication([])
+    start = time.perf_counter()
+    loader = app_module.WordsLoader([app_module.ing_packs.BASE_PACK])
+    loader.run()
+    words = loader.words
+    progress = app_module.ing_progress.ProgressLog(app_module.DATA_DIR / "bench_progress.db")
+    scheduler = app_module.ing_scheduler.Scheduler(app_module.DATA_DIR / "bench_progress.db")
+    stats = {"current_index": 0, "example_font_size": 16}
+    page = app_module.TrainerPage(words, stats, "bench", save_cb=lambda: None, progress=progress, scheduler=scheduler)
+    page.show()
+    qt_app.processEvents()
+    ready_s = time.perf_counter() - start
+
+    rng = random.Random(args.seed)
+    actions = {"know": page._know, "dont": page._dont, "next": page._next, "prev": page._prev}
+    timings: dict[str, list[float]] = {name: [] for name in actions}
+    for _ in range(args.steps):
+        name = rng.choices(list(actions), weights=(5, 3, 2, 1))[0]
+        begin = time.perf_counter()
+        actions[name]()
+        qt_app.processEvents()
+        timings[name].append(time.perf_counter() - begin)
+        if name == "dont":
+            page._next()   # "Не знаю" only reveals the examples; move on as a user would
+            qt_app.processEvents()
+
+    total = sum(sum(values) for values in timings.values())
+    result = {
+        "words": len(words),
+        "ready_seconds": ready_s,
+        "seconds": total,
+        "steps": args.steps,
+        "per_action_ms": {
+            name: {"count": len(values), "mean": sum(values) * 1000 / len(values), "max": max(values) * 1000}
+            for name, values in timings.items() if values
+        },
+        "examples_cache": page.render_stats(),
+    }
+    progress.close()
+    scheduler.close()
+    words.close()
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
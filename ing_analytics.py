@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Аналитика по всей истории ответов (progress.db) для страницы «Достижения»
+(без зависимостей от Qt).
+
+reviews читается одним проходом в столбцы numpy (word_id, ts, outcome,
+latency_ms), дальше всё считается векторно — сортировка, bincount, diff —
+без циклов Python по ответам. Дороже всего разбор строк SQLite, поэтому
+столбцы кэшируются в .npy и при следующем открытии дочитываются только новые
+ответы: миллионы строк укладываются в доли секунды.
+
+    data = ing_analytics.dashboard(PROGRESS_FILE, CACHE_FILE)   # dict, готовый для JSON
+    html = ing_analytics.dashboard_html(data, label_of)
+
+numpy — необязательная зависимость: без него AVAILABLE = False, и страница
+показывает только итоговые счётчики.
+"""
+import html
+import itertools
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import ing_metrics
+import ing_progress
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AVAILABLE = np is not None
+
+DAY_S = 24 * 60 * 60
+HOUR_MS = 60 * 60 * 1000
+
+# Интервал с прошлого ответа на то же слово -> доля «Знаю» (кривая удержания).
+RETENTION_EDGES_MS: List[int] = [HOUR_MS, 24 * HOUR_MS, 2 * 24 * HOUR_MS, 4 * 24 * HOUR_MS,
+                                 8 * 24 * HOUR_MS, 15 * 24 * HOUR_MS, 31 * 24 * HOUR_MS]
+RETENTION_LABELS: List[str] = ["< 1 ч", "< 1 дн", "1 дн", "2–3 дн", "4–7 дн", "8–14 дн", "15–30 дн", "> 30 дн"]
+
+THROUGHPUT_DAYS = 30
+HARDEST_WORDS = 15
+
+
+class History:
+    """Столбцы reviews, сгруппированные по word_id; внутри слова — по ts (при равных ts — по id).
+    Порядок id с временем не совпадает: ing_sync дописывает чужие ответы с новыми id и старыми ts.
+    day — номер локального дня."""
+    __slots__ = ("word_id", "ts", "outcome", "latency_ms", "day")
+
+    def __init__(self, word_id, ts, outcome, latency_ms, utc_offset_s: int = 0):
+        order = np.lexsort((ts, word_id))   # устойчивая: при равных (word_id, ts) остаётся порядок id
+        self.word_id = word_id[order]
+        self.ts = ts[order]
+        self.outcome = outcome[order]
+        self.latency_ms = latency_ms[order]   # -1 — время ответа не записано
+        self.day = (self.ts // 1000 + utc_offset_s) // DAY_S
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+def local_utc_offset() -> int:
+    return time.localtime().tm_gmtoff
+
+
+def local_day(ts_ms: int, utc_offset_s: Optional[int] = None) -> int:
+    offset = local_utc_offset() if utc_offset_s is None else utc_offset_s
+    return (ts_ms // 1000 + offset) // DAY_S
+
+
+def _read_rows(conn, after_id: int) -> "np.ndarray":
+    """Строки reviews с id > after_id (n, 5): id, word_id, ts, outcome, latency_ms (-1 — не записано)."""
+    n = conn.execute("SELECT count(*) FROM reviews WHERE id > ?", (after_id,)).fetchone()[0]
+    rows = conn.execute("SELECT id, word_id, ts, outcome, coalesce(latency_ms, -1) FROM reviews "
+                        "WHERE id > ? ORDER BY id", (after_id,))
+    return np.fromiter(itertools.chain.from_iterable(rows), dtype=np.int64, count=5 * n).reshape(n, 5)
+
+
+def _load_cache(cache_path: Optional[Path]) -> Optional["np.ndarray"]:
+    if cache_path is None:
+        return None
+    try:
+        cols = np.load(cache_path, allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+    return cols if cols.ndim == 2 and cols.shape[1] == 5 else None
+
+
+def _save_cache(cache_path: Path, cols: "np.ndarray") -> None:
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, cols, allow_pickle=False)
+    os.replace(tmp, cache_path)
+
+
+def load_columns(db_path: Path, cache_path: Optional[Path] = None) -> "np.ndarray":
+    """Вся таблица reviews столбцами. reviews только дописывается, поэтому с cache_path (.npy)
+    из SQLite читаются лишь строки новее сохранённых — разбор строк в Python и есть основная цена."""
+    cached = _load_cache(cache_path)
+    last = int(cached[-1, 0]) if cached is not None and len(cached) else 0
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        conn.execute("BEGIN")   # count(*) и выборка — из одного снимка, даже если ProgressLog дописывает
+        if conn.execute("SELECT coalesce(max(id), 0) FROM reviews").fetchone()[0] < last:
+            cached, last = None, 0   # progress.db пересоздан — кэш от другой истории
+        fresh = _read_rows(conn, last)
+    finally:
+        conn.close()
+    cols = fresh if cached is None else np.concatenate((cached, fresh))
+    if cache_path is not None and (len(fresh) or cached is None):
+        try:
+            _save_cache(Path(cache_path), cols)
+        except OSError:
+            ing_metrics.count("errors.analytics_cache")   # без кэша просто медленнее в следующий раз
+    ing_metrics.count("analytics.rows_read", len(fresh))
+    return cols
+
+
+def load_history(db_path: Path, utc_offset_s: Optional[int] = None, cache_path: Optional[Path] = None) -> History:
+    _, word_id, ts, outcome, latency_ms = np.ascontiguousarray(load_columns(db_path, cache_path).T)
+    return History(word_id, ts, outcome.astype(np.int8), latency_ms,
+                   local_utc_offset() if utc_offset_s is None else utc_offset_s)
+
+
+def retention_curve(h: History) -> Dict[str, Any]:
+    """Доля «Знаю» в зависимости от паузы с прошлого показа того же слова (первые показы не в счёт)."""
+    repeat = np.flatnonzero(h.word_id[1:] == h.word_id[:-1]) + 1
+    gaps = h.ts[repeat] - h.ts[repeat - 1]
+    bucket = np.digitize(gaps, RETENTION_EDGES_MS)
+    size = len(RETENTION_LABELS)
+    reviews = np.bincount(bucket, minlength=size)
+    known = np.bincount(bucket, weights=h.outcome[repeat], minlength=size)
+    rate = np.divide(known, reviews, out=np.zeros(size), where=reviews > 0)
+    return {"labels": RETENTION_LABELS, "reviews": reviews.tolist(), "retention": np.round(rate, 3).tolist()}
+
+
+def word_difficulty(h: History, top: int = HARDEST_WORDS) -> Dict[str, Any]:
+    """Самые трудные слова: доля «Не знаю» со сглаживанием (dont + 1) / (n + 2), затем число ошибок."""
+    if not len(h):
+        return {"words": 0, "hardest": []}
+    starts = np.flatnonzero(np.r_[True, h.word_id[1:] != h.word_id[:-1]])
+    ids = h.word_id[starts]
+    n = np.diff(np.r_[starts, len(h)])
+    dont = n - np.add.reduceat(h.outcome.astype(np.int64), starts)
+    timed = h.latency_ms >= 0
+    lat_sum = np.add.reduceat(np.where(timed, h.latency_ms, 0), starts)
+    lat_n = np.add.reduceat(timed.astype(np.int64), starts)
+    score = (dont + 1) / (n + 2)
+    k = min(top, len(ids))
+    pick = np.argpartition(-score, k - 1)[:k]
+    pick = pick[np.lexsort((-dont[pick], -score[pick]))]
+    hardest = [{"word_id": int(ids[i]), "reviews": int(n[i]), "dont": int(dont[i]),
+                "difficulty": round(float(score[i]), 3),
+                "mean_latency_ms": int(lat_sum[i] // lat_n[i]) if lat_n[i] else None}
+               for i in pick if dont[i]]
+    return {"words": len(ids), "hardest": hardest}
+
+
+def streaks(h: History, today: int) -> Dict[str, Any]:
+    """Серии дней подряд с хотя бы одним ответом: текущая (до сегодня или вчера) и самая длинная."""
+    days = np.unique(h.day)
+    if not len(days):
+        return {"active_days": 0, "current": 0, "longest": 0}
+    breaks = np.flatnonzero(np.diff(days) != 1)
+    lengths = np.diff(np.r_[0, breaks + 1, len(days)])
+    current = int(lengths[-1]) if days[-1] >= today - 1 else 0
+    return {"active_days": len(days), "current": current, "longest": int(lengths.max())}
+
+
+def daily_throughput(h: History, today: int, days: int = THROUGHPUT_DAYS) -> Dict[str, Any]:
+    """Ответов в день за последние days дней (сегодня — последний), из них «Знаю»."""
+    first = today - days + 1
+    recent = (h.day >= first) & (h.day <= today)
+    offset = h.day[recent] - first
+    reviews = np.bincount(offset, minlength=days)
+    known = np.bincount(offset, weights=h.outcome[recent], minlength=days).astype(np.int64)
+    return {"first_day": int(first), "reviews": reviews.tolist(), "known": known.tolist(),
+            "mean": round(float(reviews.mean()), 1) if days else 0.0}
+
+
+def totals(h: History) -> Dict[str, Any]:
+    timed = h.latency_ms[h.latency_ms >= 0]
+    known = int(np.count_nonzero(h.outcome))
+    return {"reviews": len(h), "known": known, "dont": len(h) - known,
+            "accuracy": round(known / len(h), 3) if len(h) else 0.0,
+            "median_latency_ms": int(np.median(timed)) if len(timed) else None}
+
+
+def dashboard(db_path: Path, cache_path: Optional[Path] = None, now_ms: Optional[int] = None,
+              utc_offset_s: Optional[int] = None, top: int = HARDEST_WORDS,
+              days: int = THROUGHPUT_DAYS) -> Dict[str, Any]:
+    if not AVAILABLE:
+        raise RuntimeError("numpy is required for ing_analytics")
+    offset = local_utc_offset() if utc_offset_s is None else utc_offset_s
+    today = local_day(ing_progress.now_ms() if now_ms is None else now_ms, offset)
+    with ing_metrics.timer("analytics.load"):
+        h = load_history(db_path, offset, cache_path)
+    with ing_metrics.timer("analytics.compute"):
+        return {"totals": totals(h), "retention": retention_curve(h), "difficulty": word_difficulty(h, top),
+                "streaks": streaks(h, today), "throughput": daily_throughput(h, today, days)}
+
+
+# ---- HTML для QTextBrowser ----
+def _bar(value: float, peak: float, width: int = 220, color: str = "#2563EB") -> str:
+    w = max(1, int(width * value / peak)) if peak and value else 0
+    return f"<table cellspacing='0' cellpadding='0'><tr><td width='{w}' height='10' bgcolor='{color}'></td></tr></table>" if w else ""
+
+
+def dashboard_html(data: Dict[str, Any], word_label: Callable[[int], Optional[str]]) -> str:
+    """word_label(word_id) — «слово — перевод» или None, если слова нет в открытых словарях."""
+    t, s, r, th = data["totals"], data["streaks"], data["retention"], data["throughput"]
+    lat = f"{t['median_latency_ms'] / 1000:.1f} с" if t["median_latency_ms"] is not None else "—"
+    parts = [
+        "<h2>Достижения</h2>",
+        f"<p>Ответов: <b>{t['reviews']}</b> · Знаю: <b>{t['known']}</b> · Не знаю: <b>{t['dont']}</b> · "
+        f"Точность: <b>{t['accuracy'] * 100:.0f}%</b> · Слов встречено: <b>{data['difficulty']['words']}</b> · "
+        f"Медиана ответа: <b>{lat}</b></p>",
+        f"<p>Серия: <b>{s['current']}</b> дн. подряд · Лучшая серия: <b>{s['longest']}</b> · "
+        f"Дней с занятиями: <b>{s['active_days']}</b></p>",
+        "<h3>Удержание</h3><table cellspacing='4'>",
+    ]
+    for label, n, rate in zip(r["labels"], r["reviews"], r["retention"]):
+        parts.append(f"<tr><td>{label}</td><td>{_bar(rate, 1.0, color='#22C55E')}</td>"
+                     f"<td>{rate * 100:.0f}%</td><td style='color:#9CA3AF'>{n}</td></tr>")
+    parts.append(f"</table><h3>Ответов в день (последние {len(th['reviews'])} дн., в среднем {th['mean']})</h3>"
+                 "<table cellspacing='2'>")
+    peak = max(th["reviews"], default=0)
+    for k, (n, known) in enumerate(zip(th["reviews"], th["known"])):
+        day = time.strftime("%d.%m", time.gmtime((th["first_day"] + k) * DAY_S))
+        parts.append(f"<tr><td>{day}</td><td>{_bar(n, peak)}</td><td>{n}</td>"
+                     f"<td style='color:#9CA3AF'>{known}</td></tr>")
+    parts.append("</table><h3>Трудные слова</h3>")
+    hardest = data["difficulty"]["hardest"]
+    if hardest:
+        parts.append("<table cellspacing='4'><tr><th align='left'>Слово</th><th>Показов</th><th>Не знаю</th></tr>")
+        for w in hardest:
+            label = word_label(w["word_id"]) or f"#{w['word_id']}"
+            parts.append(f"<tr><td>{html.escape(label)}</td><td align='center'>{w['reviews']}</td>"
+                         f"<td align='center'>{w['dont']}</td></tr>")
+        parts.append("</table>")
+    else:
+        parts.append("<p>Пока нет</p>")
+    return "".join(parts)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Зашифрованный словарь (SQLCipher) без расшифровки на каждом запросе
+(без зависимостей от Qt).
+
+Ключ вводится один раз на процесс: open_snapshot() открывает зашифрованную
+базу, выгружает её расшифрованную копию в общую базу в памяти и доводит схему
+копии до актуальной (ing_migrations). Все соединения — Snapshot.connect() —
+читают из памяти: ни вывода ключа (PBKDF2), ни расшифровки страниц.
+Расшифрованные данные на диск не попадают.
+
+Копия делается через sqlcipher_export, а не backup API: SQLCipher не
+копирует backup'ом между зашифрованной и открытой базой.
+
+Нужен pysqlcipher3 или sqlcipher3 (необязательные зависимости); без них
+AVAILABLE = False и open_snapshot() бросает RuntimeError.
+
+    snap = open_snapshot(Path("ing_base_encrypted.db"), key)   # расшифровка — только здесь
+    conn = snap.connect(check_same_thread=False)
+"""
+import itertools
+import threading
+from pathlib import Path
+from typing import Dict
+
+import ing_metrics
+import ing_migrations
+from ing_migrations import SQLITE_HEADER, is_encrypted  # noqa: F401 — проверка заголовка не требует SQLCipher
+
+try:
+    from pysqlcipher3 import dbapi2 as sqlcipher
+except ImportError:
+    try:
+        from sqlcipher3 import dbapi2 as sqlcipher
+    except ImportError:
+        sqlcipher = None
+
+AVAILABLE = sqlcipher is not None
+
+_lock = threading.Lock()
+_snapshots: Dict[Path, "Snapshot"] = {}
+_names = itertools.count(1)
+
+
+def _require() -> None:
+    if sqlcipher is None:
+        raise RuntimeError("SQLCipher is not available: install pysqlcipher3 or sqlcipher3")
+
+
+def _quote(text: str) -> str:
+    return "'" + str(text).replace("'", "''") + "'"   # PRAGMA и ATTACH не принимают параметры
+
+
+def connect_encrypted(db_path: Path, key: str, check_same_thread: bool = True):
+    """Соединение прямо с зашифрованной базой (read-only); ключ выводится при каждом открытии."""
+    _require()
+    conn = sqlcipher.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True,
+                             check_same_thread=check_same_thread)
+    try:
+        conn.execute(f"PRAGMA key = {_quote(key)}")
+        conn.execute("SELECT count(*) FROM sqlite_master").fetchone()   # неверный ключ — ошибка здесь
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+class Snapshot:
+    """Расшифрованная копия базы в памяти; живёт, пока не вызван close()."""
+
+    def __init__(self, db_path: Path, key: str):
+        _require()
+        self.db_path = Path(db_path)
+        self.uri = f"file:ing_snapshot_{next(_names)}?mode=memory&cache=shared"
+        # пока открыто хоть одно соединение, общая база в памяти не исчезает
+        self._keeper = sqlcipher.connect(self.uri, uri=True, check_same_thread=False)
+        try:
+            src = connect_encrypted(self.db_path, key)
+            try:
+                src.execute(f"ATTACH DATABASE {_quote(self.uri)} AS snapshot KEY ''")
+                src.execute("SELECT sqlcipher_export('snapshot')")
+                src.execute("DETACH DATABASE snapshot")
+                version = ing_migrations.get_version(src)
+            finally:
+                src.close()
+            # sqlcipher_export вписывает виртуальные таблицы (FTS5) прямо в sqlite_master, а схема
+            # при общем кэше одна на все соединения — перечитываем её
+            self._keeper.execute("PRAGMA writable_schema = RESET")
+            self._keeper.execute(f"PRAGMA user_version = {int(version)}")   # sqlcipher_export его не переносит
+            ing_migrations.migrate(self._keeper)
+        except Exception:
+            self._keeper.close()
+            raise
+
+    def connect(self, check_same_thread: bool = True):
+        conn = sqlcipher.connect(self.uri, uri=True, check_same_thread=check_same_thread)
+        ing_migrations.apply_read_pragmas(conn)
+        conn.execute("PRAGMA read_uncommitted = ON")   # общий кэш: без табличных блокировок, копию после загрузки не пишут
+        return conn
+
+    def close(self) -> None:
+        self._keeper.close()
+
+
+def open_snapshot(db_path: Path, key: str) -> Snapshot:
+    """Общая на процесс копия db_path в памяти; база расшифровывается при первом вызове."""
+    path = Path(db_path).resolve()
+    with _lock:
+        snap = _snapshots.get(path)
+        if snap is None:
+            if not key:
+                raise ValueError(f"{path.name} is encrypted, but no key was given")
+            with ing_metrics.timer("crypto.snapshot"):
+                snap = _snapshots[path] = Snapshot(path, key)
+        return snap
+
+
+def close_all() -> None:
+    with _lock:
+        for snap in _snapshots.values():
+            snap.close()
+        _snapshots.clear()
+
+
+def encrypt_copy(src_path: Path, dst_path: Path, key: str) -> Path:
+    """Зашифрованная копия открытой базы: сборка ing_base_encrypted.db, тестовые базы и замеры."""
+    _require()
+    dst_path = Path(dst_path)
+    tmp = dst_path.with_name(dst_path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlcipher.connect(str(src_path))
+    try:
+        version = ing_migrations.get_version(conn)
+        conn.execute(f"ATTACH DATABASE {_quote(tmp)} AS encrypted KEY {_quote(key)}")
+        conn.execute("SELECT sqlcipher_export('encrypted')")
+        conn.execute(f"PRAGMA encrypted.user_version = {int(version)}")
+        conn.execute("DETACH DATABASE encrypted")
+    finally:
+        conn.close()
+    tmp.replace(dst_path)
+    return dst_path
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Чтение словаря из SQLite (без зависимостей от Qt).
+
+load_all_words читает words и examples двумя запросами и раскладывает
+примеры по словам в памяти, а не делает SELECT на каждое слово.
+load_compact — те же два запроса, но в ing_words.CompactWordSource:
+столбцы и один буфер строк вместо словаря на каждое слово и пример.
+"""
+import sqlite3
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable
+
+import ing_metrics
+import ing_words
+
+WORDS_SQL = "SELECT id, ingush, russian, transcription FROM words ORDER BY id"
+EXAMPLES_SQL = "SELECT word_id, ing, rus FROM examples ORDER BY id"
+EXAMPLES_BY_WORD_SQL = "SELECT word_id, ing, rus FROM examples ORDER BY word_id, id"   # idx_examples_word_id
+
+
+@ing_metrics.timed("db.load_all_words")
+def load_all_words(db_path: Path, connect: Optional[Callable[[], Any]] = None) -> List[Dict[str, Any]]:
+    """Все слова с примерами: [{"id","ingush","russian","transcription","examples"}]."""
+    if not Path(db_path).exists():
+        return []
+    conn = connect() if connect is not None else sqlite3.connect(str(db_path))
+    try:
+        cur = conn.cursor()
+        words: List[Dict[str, Any]] = []
+        by_id: Dict[int, List[Dict[str, str]]] = {}
+        for wid, ing, rus, tr in cur.execute(WORDS_SQL):
+            exs: List[Dict[str, str]] = []
+            by_id[wid] = exs
+            words.append({"id": wid, "ingush": ing, "russian": rus, "transcription": tr or "", "examples": exs})
+        # ORDER BY id сохраняет порядок примеров внутри каждого слова
+        for wid, ing, rus in cur.execute(EXAMPLES_SQL):
+            exs = by_id.get(wid)
+            if exs is not None:
+                exs.append({"ing": ing, "rus": rus})
+    finally:
+        conn.close()
+    return words
+
+
+@ing_metrics.timed("db.load_compact")
+def load_compact(db_path: Path, connect: Optional[Callable[[], Any]] = None) -> ing_words.CompactWordSource:
+    """Весь словарь в памяти в компактном виде; протокол ing_words (len, [i], examples, index_of)."""
+    if not Path(db_path).exists():
+        return ing_words.CompactWordSource([], [])
+    conn = connect() if connect is not None else sqlite3.connect(str(db_path))
+    try:
+        # второй курсор: слова и примеры читаются одновременно, слиянием по word_id
+        return ing_words.CompactWordSource(conn.execute(WORDS_SQL), conn.cursor().execute(EXAMPLES_BY_WORD_SQL))
+    finally:
+        conn.close()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Таймеры, гистограммы и счётчики горячих путей (без зависимостей от Qt).
+
+По умолчанию выключено: timer() отдаёт общий пустой контекст-менеджер,
+count()/observe() сразу возвращаются — стоимость одна проверка флага.
+Включается enable() (в приложении — флаг --metrics или ING_METRICS=1).
+
+    with ing_metrics.timer("trainer.load"): ...
+    @ing_metrics.timed("db.load_all_words")
+    ing_metrics.count("db.queries")
+
+snapshot() / export_json() — всё собранное в JSON; сравнить два прогона:
+    python ing_metrics.py old.json new.json
+"""
+import argparse
+import functools
+import json
+import math
+import sys
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ENABLED = False
+
+# Корзины гистограммы: верхние границы в мс, ×2 от 0.01 мс до ~42 с.
+BUCKETS_MS: List[float] = [0.01 * 2 ** k for k in range(23)]
+
+_lock = threading.Lock()
+_counters: Dict[str, int] = {}
+_histograms: Dict[str, "Histogram"] = {}
+
+
+class Histogram:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)   # последняя — всё, что выше BUCKETS_MS[-1]
+
+    def add(self, value_ms: float) -> None:
+        self.count += 1
+        self.total += value_ms
+        self.min = min(self.min, value_ms)
+        self.max = max(self.max, value_ms)
+        self.buckets[bisect_left(BUCKETS_MS, value_ms)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Оценка по корзинам: верхняя граница корзины, в которую попал q-й перцентиль."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(self.max, BUCKETS_MS[k]) if k < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {"count": self.count, "total_ms": round(self.total, 3),
+                "mean_ms": round(self.total / self.count, 4) if self.count else 0.0,
+                "min_ms": round(self.min, 4) if self.count else 0.0, "max_ms": round(self.max, 4),
+                "p50_ms": round(self.percentile(0.50), 4), "p95_ms": round(self.percentile(0.95), 4),
+                "p99_ms": round(self.percentile(0.99), 4)}
+
+
+def enable(on: bool = True) -> None:
+    global ENABLED
+    ENABLED = on
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def count(name: str, n: int = 1) -> None:
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def observe(name: str, value_ms: float) -> None:
+    if not ENABLED:
+        return
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.add(value_ms)
+
+
+class _Timer:
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, (time.perf_counter() - self._start) * 1000)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullTimer()
+
+
+def timer(name: str):
+    return _Timer(name) if ENABLED else _NULL
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    def wrap(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(label, (time.perf_counter() - start) * 1000)
+        return inner
+    return wrap
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        return {"counters": dict(sorted(_counters.items())),
+                "timers": {name: hist.summary() for name, hist in sorted(_histograms.items())}}
+
+
+def export_json(path: Path, extra: Optional[Dict[str, Any]] = None) -> Path:
+    import ing_stats  # только при выгрузке
+    data = snapshot()
+    if extra:
+        data.update(extra)
+    ing_stats.write_json_atomic(Path(path), json.dumps(data, ensure_ascii=False, indent=2))
+    return Path(path)
+
+
+def format_summary(data: Optional[Dict[str, Any]] = None, limit: int = 12) -> str:
+    """Текст для оверлея/лога: самые дорогие таймеры по суммарному времени и счётчики."""
+    data = data or snapshot()
+    timers = sorted(data["timers"].items(), key=lambda item: -item[1]["total_ms"])[:limit]
+    lines = [f"{name:<24} n={s['count']:<6} p50={s['p50_ms']:.2f} p95={s['p95_ms']:.2f} max={s['max_ms']:.1f} ms"
+             for name, s in timers]
+    lines += [f"{name:<24} {value}" for name, value in data["counters"].items()]
+    return "\n".join(lines)
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    lines = []
+    for name in sorted(set(old.get("timers", {})) | set(new.get("timers", {}))):
+        a, b = old.get("timers", {}).get(name), new.get("timers", {}).get(name)
+        if a is None or b is None:
+            lines.append(f"{name:<28} {'only in new' if a is None else 'only in old'}")
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            before, after = a[key], b[key]
+            change = f"{(after - before) / before * 100:+6.1f}%" if before else "   n/a"
+            lines.append(f"{name:<28} {key:<7} {before:10.3f} -> {after:10.3f}  {change}")
+    for name in sorted(set(old.get("counters", {})) | set(new.get("counters", {}))):
+        before, after = old.get("counters", {}).get(name, 0), new.get("counters", {}).get(name, 0)
+        if before != after:
+            lines.append(f"{name:<28} count   {before:10} -> {after:10}")
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare two metrics JSON exports")
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    args = parser.parse_args()
+    try:
+        old, new = (json.loads(p.read_text(encoding="utf-8")) for p in (args.old, args.new))
+    except (OSError, ValueError) as e:
+        print(f"Cannot read metrics: {e}", file=sys.stderr)
+        return 1
+    print("\n".join(compare(old, new)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Версионированные миграции ing_base.db (PRAGMA user_version).
+
+- migrate(conn)            — применяет недостающие шаги и делает ANALYZE;
+- ensure_migrated(db, dir) — если база устарела, мигрирует её копию в dir
+                             (исходник в _MEIPASS / рядом с exe только читаем);
+- connect_readonly(path)   — read-only соединение с pragma для чтения;
+- is_encrypted(path)       — не SQLite-заголовок, т.е. база SQLCipher (ing_crypto).
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from ing_search import FTS_TABLE, normalize
+
+SQLITE_HEADER = b"SQLite format 3\x00"   # у зашифрованной базы первые 16 байт — соль
+
+# (версия, шаг). Шаги только добавляют — старые версии остаются читаемыми.
+MIGRATIONS: List[Tuple[int, Callable[[sqlite3.Connection], None]]] = []
+
+
+def migration(version: int):
+    def register(fn):
+        MIGRATIONS.append((version, fn))
+        MIGRATIONS.sort(key=lambda item: item[0])
+        return fn
+    return register
+
+
+@migration(1)
+def _add_indexes(conn: sqlite3.Connection) -> None:
+    # (word_id, id): поиск примеров слова + ORDER BY id без сортировки
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_examples_word_id ON examples(word_id, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_words_seq ON words(seq)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_words_ingush ON words(ingush)")
+
+
+@migration(2)
+def _add_search_index(conn: sqlite3.Connection) -> None:
+    # Индекс без копии текста (content=''): строки берём из words по rowid = words.id.
+    try:
+        conn.create_function("ing_norm", 1, normalize, deterministic=True)
+    except TypeError:
+        conn.create_function("ing_norm", 1, normalize)   # pysqlcipher3: без deterministic
+    try:
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "ingush, russian, transcription, examples, content='', prefix='1 2 3')")
+    except conn.OperationalError as e:   # у sqlite3 и у драйверов SQLCipher — свои классы ошибок
+        # sqlite3 без FTS5: поиск просто недоступен (ing_search.SearchIndex.available)
+        print("FTS5 is not available, search index skipped:", e)
+        return
+    conn.execute(
+        f"INSERT INTO {FTS_TABLE}(rowid, ingush, russian, transcription, examples) "
+        "SELECT w.id, ing_norm(w.ingush), ing_norm(w.russian), ing_norm(w.transcription), "
+        "(SELECT ing_norm(group_concat(e.ing || ' ' || e.rus, ' ')) FROM examples AS e WHERE e.word_id = w.id) "
+        "FROM words AS w")
+
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+READ_PRAGMAS = (
+    "PRAGMA query_only = ON",
+    "PRAGMA mmap_size = 268435456",   # 256 MiB
+    "PRAGMA cache_size = -16384",     # 16 MiB
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+def get_version(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Доводит схему до SCHEMA_VERSION. Возвращает итоговую версию."""
+    current = get_version(conn)
+    pending = [(v, fn) for v, fn in MIGRATIONS if v > current]
+    if not pending:
+        return current
+    for version, fn in pending:
+        # Явный BEGIN: модуль sqlite3 сам открывает транзакцию только перед DML, а DDL
+        # без неё фиксируется сразу — упавший шаг оставил бы схему наполовину.
+        conn.execute("BEGIN")
+        try:
+            fn(conn)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    conn.execute("ANALYZE")
+    conn.commit()
+    return get_version(conn)
+
+
+def migrate_file(db_path: Path) -> int:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return migrate(conn)
+    finally:
+        conn.close()
+
+
+def is_encrypted(db_path: Path) -> bool:
+    """Файл есть, но заголовок не SQLite — значит, страницы зашифрованы."""
+    try:
+        with open(db_path, "rb") as f:
+            head = f.read(len(SQLITE_HEADER))
+    except OSError:
+        return False
+    return len(head) == len(SQLITE_HEADER) and head != SQLITE_HEADER
+
+
+def apply_read_pragmas(conn) -> None:
+    for pragma in READ_PRAGMAS:
+        conn.execute(pragma)
+
+
+def connect_readonly(db_path: Path, check_same_thread: bool = True) -> sqlite3.Connection:
+    # check_same_thread=False — для соединения, которое открывают в фоновом
+    # потоке и затем целиком передают другому (одновременно им не пользуются).
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True,
+                           check_same_thread=check_same_thread)
+    apply_read_pragmas(conn)
+    return conn
+
+
+def _file_version(db_path: Path) -> int:
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        return get_version(conn)
+    finally:
+        conn.close()
+
+
+def _fingerprint(db_path: Path) -> str:
+    # По содержимому, а не по mtime: onefile-сборка PyInstaller распаковывает
+    # _MEIPASS заново при каждом запуске, и mtime исходника всякий раз новый.
+    digest = hashlib.blake2b(digest_size=16)
+    with open(db_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return f"{db_path.stat().st_size}:{digest.hexdigest()}:{SCHEMA_VERSION}"
+
+
+def ensure_migrated(db_path: Path, cache_dir: Path) -> Path:
+    """Путь к базе актуальной версии.
+
+    Актуальную базу отдаём как есть. Иначе мигрируем копию в cache_dir и
+    переиспользуем её, пока не изменится содержимое исходного файла.
+    """
+    db_path = Path(db_path)
+    if not db_path.exists() or _file_version(db_path) >= SCHEMA_VERSION:
+        return db_path
+    cache_dir = Path(cache_dir)
+    target = cache_dir / db_path.name
+    stamp = target.with_name(target.name + ".src")
+    fingerprint = _fingerprint(db_path)
+    try:
+        if target.exists() and stamp.read_text(encoding="utf-8") == fingerprint:
+            return target
+    except OSError:
+        pass
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.copyfile(db_path, tmp)
+    migrate_file(tmp)
+    os.replace(tmp, target)
+    stamp.write_text(fingerprint, encoding="utf-8")
+    return target
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Несколько словарей (тематические пакеты .db) и пул соединений к ним
+(без зависимостей от Qt).
+
+- Registry   — основной словарь («base») плюс *.db из папок пакетов; у
+               каждого пакета постоянный номер (packs.json), из него
+               строится глобальный id слова: номер * PACK_ID_STRIDE + words.id.
+               У base номер 0, поэтому его id и progress.db не меняются.
+- ConnectionPool — несколько долгоживущих read-only соединений к одной
+               базе; потокобезопасен, соединение открывается один раз и
+               дальше переиспользуется. Зашифрованную базу connect()
+               читает из расшифрованной копии в памяти (ing_crypto).
+- MultiWordSource — выбранные пакеты подряд под протоколом ing_words;
+               каждый пакет читается своим WordSource окнами, как и раньше.
+"""
+import json
+import threading
+from bisect import bisect_right
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import ing_migrations
+import ing_search
+import ing_stats
+import ing_words
+
+BASE_PACK = "base"
+PACK_ID_STRIDE = 1 << 32
+POOL_SIZE = 4
+
+
+def split_id(global_id: int) -> Tuple[int, int]:
+    """Глобальный id -> (номер пакета, words.id внутри пакета)."""
+    return divmod(global_id, PACK_ID_STRIDE)
+
+
+class Pack:
+    __slots__ = ("name", "path", "number")
+
+    def __init__(self, name: str, path: Path, number: int):
+        self.name, self.path, self.number = name, Path(path), number
+
+    def global_id(self, word_id: int) -> int:
+        return self.number * PACK_ID_STRIDE + word_id
+
+
+class ConnectionPool:
+    def __init__(self, connect: Callable[[], Any], size: int = POOL_SIZE):
+        self._connect = connect
+        self.size = max(1, size)
+        self._idle: List[Any] = []
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.opened = 0   # сколько соединений открыто за всё время (у SQLCipher — сколько раз вводили ключ)
+        self.waits = 0    # сколько раз ждали освобождения соединения
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("connection pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                self.waits += 1
+                if not self._cond.wait(timeout):
+                    raise TimeoutError("no free connection in the pool")
+        try:
+            conn = self._connect()   # вне блокировки: открытие и ключ SQLCipher не задерживают других
+        except BaseException:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.opened += 1
+        return conn
+
+    def release(self, conn: Any) -> None:
+        with self._cond:
+            if self._closed:
+                self._created -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Закрывает свободные соединения; занятые закроются при release()."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.close()
+
+
+class MultiWordSource:
+    """Слова нескольких пакетов подряд; id слов — глобальные (Pack.global_id)."""
+
+    def __init__(self, parts: Sequence[Tuple[Pack, Any]], release: Callable[[], None] = lambda: None):
+        self._parts = list(parts)
+        self._by_number = {pack.number: k for k, (pack, _) in enumerate(self._parts)}
+        self._starts: List[int] = []
+        total = 0
+        for _, source in self._parts:
+            self._starts.append(total)
+            total += len(source)
+        self._len = total
+        self._release = release
+
+    @property
+    def packs(self) -> List[str]:
+        return [pack.name for pack, _ in self._parts]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _locate(self, i: int) -> Tuple[Pack, Any, int]:
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        k = bisect_right(self._starts, i) - 1
+        pack, source = self._parts[k]
+        return pack, source, i - self._starts[k]
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        pack, source, local = self._locate(i)
+        word = source[local]
+        if pack.number == 0:
+            return word
+        return dict(word, id=pack.global_id(word["id"]))
+
+    def examples(self, i: int) -> List[Dict[str, str]]:
+        _, source, local = self._locate(i)
+        return source.examples(local)
+
+    def index_of(self, word_id: int) -> Optional[int]:
+        number, local_id = split_id(word_id)
+        k = self._by_number.get(number)
+        if k is None:
+            return None
+        local = self._parts[k][1].index_of(local_id)
+        return None if local is None else self._starts[k] + local
+
+    def contains(self, word_id: int) -> bool:
+        number, local_id = split_id(word_id)
+        k = self._by_number.get(number)
+        return k is not None and self._parts[k][1].contains(local_id)
+
+    def close(self) -> None:
+        self._release()
+
+
+class MultiSearch:
+    """ing_search по выбранным пакетам; результаты склеиваются в порядке пакетов."""
+
+    def __init__(self, registry: "Registry", names: Sequence[str]):
+        self._parts = []
+        for name in names:
+            pack, pool = registry.get(name), registry.pool(name)
+            conn = pool.acquire()
+            self._parts.append((pack, pool, conn, ing_search.SearchIndex(lambda conn=conn: conn)))
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        for pack, _, _, index in self._parts:
+            for word in index.search(query, limit - len(results)):
+                if pack.number:
+                    word["id"] = pack.global_id(word["id"])
+                results.append(word)
+            if len(results) >= limit:
+                break
+        return results
+
+    def close(self) -> None:
+        for _, pool, conn, _ in self._parts:
+            pool.release(conn)
+        self._parts = []
+
+
+class Registry:
+    def __init__(self, base_path: Path, pack_dirs: Sequence[Path], cache_dir: Path,
+                 connect: Callable[[Path], Any], pool_size: int = POOL_SIZE):
+        """connect(path) открывает read-only соединение, годное для передачи между
+        потоками (check_same_thread=False); для SQLCipher — сразу с ключом."""
+        self.cache_dir = Path(cache_dir)
+        self._connect = connect
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._pools: Dict[str, ConnectionPool] = {}
+        self._paths: Dict[str, Path] = {}
+        self._numbers_file = self.cache_dir / "packs.json"
+        numbers = self._load_numbers()
+        found = [(BASE_PACK, Path(base_path))]
+        for folder in pack_dirs:
+            if Path(folder).is_dir():
+                found += [(path.stem, path) for path in sorted(Path(folder).glob("*.db")) if path.stem != BASE_PACK]
+        self._packs: Dict[str, Pack] = {}
+        for name, path in found:
+            if name in self._packs or not path.exists():
+                continue   # одноимённый пакет из следующей папки не перекрывает уже найденный
+            if name not in numbers:
+                numbers[name] = 0 if name == BASE_PACK else max(numbers.values(), default=0) + 1
+            self._packs[name] = Pack(name, path, numbers[name])
+        if numbers != self._load_numbers():
+            ing_stats.write_json_atomic(self._numbers_file, json.dumps(numbers, ensure_ascii=False, indent=2))
+
+    def _load_numbers(self) -> Dict[str, int]:
+        try:
+            numbers = json.loads(self._numbers_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            numbers = {}
+        numbers[BASE_PACK] = 0
+        return numbers
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._packs)
+
+    def get(self, name: str) -> Pack:
+        return self._packs[name]
+
+    def select(self, names: Sequence[str]) -> List[str]:
+        """Известные пакеты из names; пустой выбор — основной словарь."""
+        chosen = [name for name in dict.fromkeys(names) if name in self._packs]
+        return chosen or [name for name in (BASE_PACK,) if name in self._packs]
+
+    def db_path(self, name: str) -> Path:
+        """Путь к базе актуальной схемы (копия мигрируется один раз, см. ing_migrations)."""
+        with self._lock:
+            path = self._paths.get(name)
+            if path is None:
+                pack = self._packs[name]
+                cache = self.cache_dir if name == BASE_PACK else self.cache_dir / "pack_cache"
+                try:
+                    # зашифрованную базу не копируем на диск: её копию в памяти мигрирует ing_crypto
+                    path = pack.path if ing_migrations.is_encrypted(pack.path) else ing_migrations.ensure_migrated(pack.path, cache)
+                except Exception as e:
+                    print(f"Error migrating {pack.path.name}:", e)
+                    path = pack.path
+                self._paths[name] = path
+            return path
+
+    def pool(self, name: str) -> ConnectionPool:
+        path = self.db_path(name)
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = self._pools[name] = ConnectionPool(lambda: self._connect(path), self.pool_size)
+            return pool
+
+    def open_words(self, names: Sequence[str]) -> MultiWordSource:
+        """Источник слов выбранных пакетов. Каждому пакету — одно соединение из пула на всё время жизни."""
+        leases = []
+        parts = []
+        try:
+            for name in self.select(names):
+                pool = self.pool(name)
+                conn = pool.acquire()
+                leases.append((pool, conn))
+                parts.append((self._packs[name], ing_words.WordSource(lambda conn=conn: conn)))
+        except BaseException:
+            for pool, conn in leases:
+                pool.release(conn)
+            raise
+
+        def release():
+            for pool, conn in leases:
+                pool.release(conn)
+            leases.clear()
+
+        return MultiWordSource(parts, release)
+
+    def search(self, names: Sequence[str]) -> MultiSearch:
+        return MultiSearch(self, self.select(names))
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
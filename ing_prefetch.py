@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Упреждающее чтение карточек тренажёра в фоновом потоке (без зависимостей от Qt).
+
+Сессия почти всегда идёт подряд, поэтому следующие карточки готовятся
+заранее: Session.upcoming(depth) предсказывает, что покажут дальше
+(просроченные повторения ing_scheduler, затем новые слова по порядку),
+поток читает их из своего источника слов — со своим соединением, SQLite и
+SQLCipher не делят соединение между потоками — и складывает готовые
+карточки. Заранее читается только строка слова: примеры нужны лишь после
+«Не знаю», их читает examples_html() по запросу (и запоминает в карточке).
+
+    prefetch = Prefetcher(lambda: open_words(packs), depth=8)
+    card = prefetch.get(idx, words)     # готовая карточка; промах — чтение из words на месте
+    prefetch.plan(*session.upcoming(prefetch.depth))
+    html = prefetch.examples_html(idx, words)   # «Не знаю»
+
+depth=0 — без потока, get() всегда читает сам. Попадания и промахи —
+counters() и счётчики ing_metrics «prefetch.hit» / «prefetch.miss».
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import ing_metrics
+import ing_render
+
+DEPTH = 8   # сколько карточек вперёд готовить
+
+
+class Prepared:
+    __slots__ = ("index", "word", "html")
+
+    def __init__(self, index: int, word: Dict[str, Any], html: Optional[str] = None):
+        self.index, self.word, self.html = index, word, html   # html — примеры, если их уже запрашивали
+
+
+def prepare(words, i: int) -> Prepared:
+    return Prepared(i, words[i])
+
+
+class Prefetcher:
+    def __init__(self, open_source: Callable[[], Any], depth: int = DEPTH, capacity: Optional[int] = None):
+        # open_source() вызывается в потоке; источник закрывается там же в close()
+        self.depth = max(0, depth)
+        self.capacity = capacity or max(4 * self.depth, 32)   # с запасом на «назад»
+        self._ready: "OrderedDict[int, Prepared]" = OrderedDict()
+        self._queue: List[Tuple[str, int]] = []   # ("id", word_id) или ("index", i)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.fetched = 0
+        self.fetch_s = 0.0   # время чтения в потоке
+        self._thread = None
+        if self.depth:
+            self._thread = threading.Thread(target=self._run, args=(open_source,), name="ing-prefetch", daemon=True)
+            self._thread.start()
+
+    def plan(self, word_ids: Iterable[int] = (), indices: Iterable[int] = ()) -> None:
+        """Новый прогноз заменяет старый: сначала повторения (по word_id), потом индексы."""
+        if not self.depth:
+            return
+        wanted = [("id", wid) for wid in word_ids] + [("index", i) for i in indices]
+        with self._cond:
+            self._queue = [w for w in dict.fromkeys(wanted) if w[0] == "id" or w[1] not in self._ready]
+            if self._queue:
+                self._cond.notify()
+
+    def get(self, i: int, words) -> Prepared:
+        """Карточка i: из готовых или прочитанная сейчас из words (источник вызывающего потока)."""
+        with self._cond:
+            card = self._ready.get(i)
+            if card is not None:
+                self._ready.move_to_end(i)
+        if card is not None:
+            self.hits += 1
+            ing_metrics.count("prefetch.hit")
+            return card
+        if self.depth:
+            self.misses += 1
+            ing_metrics.count("prefetch.miss")
+        with ing_metrics.timer("prefetch.sync_read"):
+            return prepare(words, i)
+
+    def examples_html(self, i: int, words) -> str:
+        """HTML примеров карточки i (ing_render.examples_html) — читается из words только сейчас;
+        в готовой карточке запоминается, повторный «Не знаю» (после «назад») не читает снова."""
+        with self._cond:
+            card = self._ready.get(i)
+        if card is not None and card.html is not None:
+            return card.html
+        with ing_metrics.timer("prefetch.examples_read"):
+            html = ing_render.examples_html(words.examples(i))
+        if card is not None:
+            card.html = html   # пишет только вызывающий поток; поток чтения карточки не заменяет
+        return html
+
+    def __contains__(self, i: int) -> bool:
+        with self._cond:
+            return i in self._ready
+
+    def _run(self, open_source: Callable[[], Any]) -> None:
+        try:
+            source = open_source()
+        except Exception as e:
+            ing_metrics.count("errors.prefetch"); print("Prefetch disabled:", e)
+            return
+        try:
+            while True:
+                with self._cond:
+                    while not self._queue and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return
+                    kind, key = self._queue.pop(0)
+                start = time.perf_counter()
+                try:
+                    i = source.index_of(key) if kind == "id" else key
+                    if i is None or i in self or not 0 <= i < len(source):
+                        continue
+                    card = prepare(source, i)
+                except Exception as e:
+                    ing_metrics.count("errors.prefetch"); print("Prefetch error:", e)
+                    continue
+                elapsed = time.perf_counter() - start
+                ing_metrics.observe("prefetch.fetch", elapsed * 1000)
+                with self._cond:
+                    self.fetched += 1
+                    self.fetch_s += elapsed
+                    self._ready[i] = card
+                    while len(self._ready) > self.capacity:
+                        self._ready.popitem(last=False)
+        finally:
+            source.close()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._queue.clear()
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def counters(self) -> Dict[str, Any]:
+        return {"depth": self.depth, "hits": self.hits, "misses": self.misses, "fetched": self.fetched,
+                "hit_rate": round(self.hit_rate, 3),
+                "avg_fetch_ms": round(self.fetch_s * 1000 / self.fetched, 3) if self.fetched else 0.0}
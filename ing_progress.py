@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Журнал ответов пользователя: DATA_DIR/progress.db (без зависимостей от Qt).
+
+reviews — только дописывается: (word_id, ts, outcome, latency_ms).
+Ответы копятся в памяти и пишутся пачкой одной транзакцией (WAL). Счётчики
+«знаю / не знаю» при открытии берутся индексированным count(*) и дальше
+ведутся в памяти — запись ответа O(1) при любом размере истории.
+
+«Сбросить прогресс» историю не стирает: в meta запоминается последний id,
+и счётчики считаются только по более новым строкам.
+"""
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import ing_metrics
+
+OUTCOME_DONT = 0
+OUTCOME_KNOW = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    word_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,            -- unix time, ms
+    outcome INTEGER NOT NULL,       -- 1 = знаю, 0 = не знаю
+    latency_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_word_ts ON reviews(word_id, ts);
+CREATE INDEX IF NOT EXISTS idx_reviews_ts ON reviews(ts);
+CREATE INDEX IF NOT EXISTS idx_reviews_outcome ON reviews(outcome);  -- (outcome, rowid) для счётчиков
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class ProgressLog:
+    def __init__(self, db_path: Path, batch_size: int = 64):
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self._conn = connect(self.db_path)
+        self._pending: List[Tuple[int, int, int, Optional[int]]] = []
+        self.known, self.unknown = self._load_counts()
+
+    # ---- meta ----
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def set_meta(self, key: str, value: Any) -> None:
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", (key, value))
+
+    # ---- ответы ----
+    def record(self, word_id: int, outcome: int, latency_ms: Optional[int] = None,
+               ts: Optional[int] = None) -> None:
+        self._pending.append((word_id, now_ms() if ts is None else ts, outcome, latency_ms))
+        if outcome == OUTCOME_KNOW:
+            self.known += 1
+        else:
+            self.unknown += 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, []
+        with ing_metrics.timer("progress.flush"), self._conn:
+            self._conn.executemany(
+                "INSERT INTO reviews(word_id, ts, outcome, latency_ms) VALUES (?, ?, ?, ?)", batch)
+        ing_metrics.count("db.writes")
+        return len(batch)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def counts(self) -> Tuple[int, int]:
+        return self.known, self.unknown
+
+    def reset_counters(self) -> None:
+        self.flush()
+        last_id = self._conn.execute("SELECT coalesce(max(id), 0) FROM reviews").fetchone()[0]
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", [
+                ("counted_after_id", last_id), ("base_known", 0), ("base_unknown", 0)])
+        self.known = self.unknown = 0
+
+    def _load_counts(self) -> Tuple[int, int]:
+        after = self.get_meta("counted_after_id", 0)
+        known, unknown = self.get_meta("base_known", 0), self.get_meta("base_unknown", 0)
+        count = "SELECT count(*) FROM reviews WHERE outcome = ? AND id > ?"
+        known += self._conn.execute(count, (OUTCOME_KNOW, after)).fetchone()[0]
+        unknown += self._conn.execute(count, (OUTCOME_DONT, after)).fetchone()[0]
+        return known, unknown
+
+    # ---- перенос со stats.json ----
+    def import_stats(self, stats: Dict[str, Any]) -> bool:
+        """Один раз переносит счётчики из старого stats.json (по словам их там нет — только итоги)."""
+        if self.get_meta("stats_imported"):
+            return False
+        known = int(stats.get("known_count", 0) or 0)
+        unknown = int(stats.get("unknown_count", 0) or 0)
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", [
+                ("stats_imported", 1),
+                ("base_known", self.get_meta("base_known", 0) + known),
+                ("base_unknown", self.get_meta("base_unknown", 0) + unknown)])
+        self.known += known
+        self.unknown += unknown
+        return True
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
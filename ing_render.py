@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+HTML карточки примеров для «Не знаю» и LRU-кэш отрисованных карточек
+(без зависимостей от Qt).
+
+Текст примеров экранируется (html.escape): «<», «&» и кавычки в базе больше
+не ломают разметку. Кэш хранит то, что вернёт render (в приложении — готовый
+QTextDocument), и считает попадания и время отрисовки.
+"""
+import html
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+EMPTY_HTML = "<div class='excard' style='text-align:center;'><p>Нет примеров</p></div>"
+
+ITEM_HTML = (
+    "<div class='item' style='margin-top:{top}px; margin-bottom:18px;'>"
+    "<div class='ing' style='font-weight:700; margin-bottom:14px;'>{ing}</div>"
+    "<div class='rus' style='color:#6B7280; line-height:1.55;'>{rus}</div>"
+    "</div>"
+)
+
+
+def examples_html(examples: List[Dict[str, Any]]) -> str:
+    if not examples:
+        return EMPTY_HTML
+    parts = []
+    for i, e in enumerate(examples):
+        parts.append(ITEM_HTML.format(
+            top=50 if i == 2 else 12,   # третий пример отделён от первых двух
+            ing=html.escape(str(e.get("ing") or "")),
+            rus=html.escape(str(e.get("rus") or ""))))
+    return "<div class='excard' style='text-align:center;'>{}</div>".format("".join(parts))
+
+
+class RenderCache:
+    """LRU: key -> render(key). evict(value) зовётся для вытесненных значений."""
+
+    def __init__(self, render: Callable[[Hashable], Any], capacity: int = 64,
+                 evict: Optional[Callable[[Any], None]] = None):
+        self._render = render
+        self._evict = evict
+        self.capacity = capacity
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.render_s = 0.0   # суммарное время render()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def get(self, key: Hashable) -> Any:
+        value = self._items.get(key)
+        if value is not None:
+            self.hits += 1
+            self._items.move_to_end(key)
+            return value
+        self.misses += 1
+        return self._put(key)
+
+    def _put(self, key: Hashable) -> Any:
+        start = time.perf_counter()
+        value = self._render(key)
+        self.render_s += time.perf_counter() - start
+        self._items[key] = value
+        while len(self._items) > self.capacity:
+            _, old = self._items.popitem(last=False)
+            if self._evict is not None:
+                self._evict(old)
+        return value
+
+    def clear(self) -> None:
+        while self._items:
+            _, old = self._items.popitem(last=False)
+            if self._evict is not None:
+                self._evict(old)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def counters(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 3),
+                "avg_render_ms": round(self.render_s * 1000 / self.misses, 3) if self.misses else 0.0}
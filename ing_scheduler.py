@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Интервальные повторения (SM-2) для тренажёра (без зависимостей от Qt).
+
+Для каждого показанного слова храним ease, интервал и время следующего
+показа (таблица cards в progress.db). Очередь к повторению — куча
+(due, word_id) с ленивым удалением устаревших записей: выбор следующей
+карточки и оценка ответа — O(log n), без прохода по словарю.
+"""
+import heapq
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import ing_metrics
+import ing_progress
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# Оценки SM-2 (0..5). Кнопки тренажёра дают две из них.
+GRADE_KNOW = 4
+GRADE_DONT = 1
+
+START_EASE = 2.5
+MIN_EASE = 1.3
+RELEARN_MS = 10 * 60 * 1000   # «Не знаю» — вернуть слово через 10 минут
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    word_id INTEGER PRIMARY KEY,
+    ease REAL NOT NULL,
+    interval_days REAL NOT NULL,
+    reps INTEGER NOT NULL,
+    lapses INTEGER NOT NULL,
+    due INTEGER NOT NULL            -- unix time, ms
+);
+CREATE INDEX IF NOT EXISTS idx_cards_due ON cards(due);
+"""
+
+
+class Card:
+    __slots__ = ("word_id", "ease", "interval_days", "reps", "lapses", "due")
+
+    def __init__(self, word_id: int, ease: float = START_EASE, interval_days: float = 0.0,
+                 reps: int = 0, lapses: int = 0, due: int = 0):
+        self.word_id, self.ease, self.interval_days = word_id, ease, interval_days
+        self.reps, self.lapses, self.due = reps, lapses, due
+
+    def row(self) -> Tuple[int, float, float, int, int, int]:
+        return (self.word_id, self.ease, self.interval_days, self.reps, self.lapses, self.due)
+
+
+def review(card: Card, grade: int, now_ms: int) -> Card:
+    """Шаг SM-2: меняет card на месте и возвращает её."""
+    if grade < 3:
+        card.reps = 0
+        card.lapses += 1
+        card.interval_days = 0.0
+        card.due = now_ms + RELEARN_MS
+    else:
+        card.reps += 1
+        if card.reps == 1:
+            card.interval_days = 1.0
+        elif card.reps == 2:
+            card.interval_days = 6.0
+        else:
+            card.interval_days = round(card.interval_days * card.ease, 2)
+        card.due = now_ms + int(card.interval_days * DAY_MS)
+    card.ease = max(MIN_EASE, card.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    return card
+
+
+class Scheduler:
+    def __init__(self, db_path: Path):
+        self._conn = ing_progress.connect(db_path)
+        self._conn.executescript(SCHEMA)
+        self._cards: Dict[int, Card] = {}
+        self._heap: List[Tuple[int, int]] = []
+        self._dirty: Dict[int, Card] = {}
+        self._relearn: Set[int] = set()   # после «Не знаю» (reps == 0): вернутся через RELEARN_MS
+        for row in self._conn.execute("SELECT word_id, ease, interval_days, reps, lapses, due FROM cards"):
+            card = Card(*row)
+            self._cards[card.word_id] = card
+            self._heap.append((card.due, card.word_id))
+            if card.reps == 0:
+                self._relearn.add(card.word_id)
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __contains__(self, word_id: int) -> bool:
+        return word_id in self._cards
+
+    def card(self, word_id: int) -> Optional[Card]:
+        return self._cards.get(word_id)
+
+    @property
+    def relearning(self) -> Set[int]:
+        """word_id слов, которые «Не знаю» вернуло на переучивание (не копия — не менять)."""
+        return self._relearn
+
+    def grade(self, word_id: int, grade: int, now_ms: Optional[int] = None) -> Card:
+        now_ms = ing_progress.now_ms() if now_ms is None else now_ms
+        card = self._cards.get(word_id)
+        if card is None:
+            card = self._cards[word_id] = Card(word_id)
+        review(card, grade, now_ms)
+        if card.reps == 0:
+            self._relearn.add(word_id)
+        else:
+            self._relearn.discard(word_id)
+        heapq.heappush(self._heap, (card.due, word_id))  # старая запись в куче станет устаревшей
+        if len(self._heap) > 2 * len(self._cards) + 1024:
+            self._heap = [(c.due, c.word_id) for c in self._cards.values()]
+            heapq.heapify(self._heap)
+        self._dirty[word_id] = card
+        return card
+
+    def next_due(self, now_ms: Optional[int] = None, exclude: Optional[int] = None,
+                 accept: Optional[Callable[[int], bool]] = None) -> Optional[int]:
+        """word_id самой просроченной карточки (due <= now) или None.
+        accept(word_id) — показать ли её здесь (слова снятых с выбора пакетов — нет): такие
+        пропускаются, а не загораживают следующие."""
+        found = self.upcoming(now_ms, 1, exclude, accept)
+        return found[0] if found else None
+
+    def upcoming(self, now_ms: Optional[int] = None, n: int = 8, exclude: Optional[int] = None,
+                 accept: Optional[Callable[[int], bool]] = None) -> List[int]:
+        """До n word_id, которые next_due отдаст следующими (due <= now, по возрастанию due); куча не меняется."""
+        now_ms = ing_progress.now_ms() if now_ms is None else now_ms
+        self._peek()   # устаревшие записи с вершины — заодно убрать
+        heap, out = self._heap, []
+        todo = [(heap[0], 0)] if heap else []   # обход кучи по возрастанию: дети узла k — 2k+1, 2k+2
+        while todo and len(out) < n:
+            (due, word_id), k = heapq.heappop(todo)
+            if due > now_ms:
+                break
+            card = self._cards.get(word_id)
+            if card is not None and card.due == due and word_id != exclude and (accept is None or accept(word_id)):
+                out.append(word_id)
+            for child in (2 * k + 1, 2 * k + 2):
+                if child < len(heap):
+                    heapq.heappush(todo, (heap[child], child))
+        return out
+
+    def due_count(self, now_ms: Optional[int] = None) -> int:
+        """Сколько карточек ждут повторения (индекс по due, без загрузки в Python)."""
+        self.flush()
+        now_ms = ing_progress.now_ms() if now_ms is None else now_ms
+        return self._conn.execute("SELECT count(*) FROM cards WHERE due <= ?", (now_ms,)).fetchone()[0]
+
+    def _peek(self) -> Optional[Tuple[int, int]]:
+        heap = self._heap
+        while heap:
+            due, word_id = heap[0]
+            card = self._cards.get(word_id)
+            if card is not None and card.due == due:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def flush(self) -> int:
+        if not self._dirty:
+            return 0
+        rows = [card.row() for card in self._dirty.values()]
+        self._dirty.clear()
+        with ing_metrics.timer("scheduler.flush"), self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cards(word_id, ease, interval_days, reps, lapses, due) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        ing_metrics.count("db.writes")
+        return len(rows)
+
+    def reset(self) -> None:
+        self._cards.clear()
+        self._relearn.clear()
+        self._heap.clear()
+        self._dirty.clear()
+        with self._conn:
+            self._conn.execute("DELETE FROM cards")
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Полнотекстовый поиск по словарю (SQLite FTS5, без зависимостей от Qt).
+
+Индекс words_fts строится миграцией (ing_migrations, версия 2) из
+words.ingush/russian/transcription и всех examples.ing/rus слова.
+Текст индекса и запросов проходит через normalize(): регистр и варианты
+палочки (I, 1, Ӏ, l) сводятся к «ӏ», поэтому «кIа», «к1а» и «кӀа» совпадают.
+"""
+import re
+from typing import Any, Callable, Dict, List
+
+import ing_metrics
+
+PALOCHKA = "ӏ"  # ӏ — после casefold() к ней же приводится «Ӏ»
+_PALOCHKA_VARIANTS = str.maketrans({"i": PALOCHKA, "l": PALOCHKA, "1": PALOCHKA})
+_TOKEN_RE = re.compile(r"\w+")
+
+FTS_TABLE = "words_fts"
+# Порядок выдачи: сначала совпадения в самом слове, потом в переводе и
+# транскрипции, потом в примерах; внутри яруса — по id. bm25 не используем:
+# для коротких префиксов он обходит весь список совпадений (сотни мс на
+# 500k слов), а запрос по ярусу без ORDER BY останавливается на LIMIT.
+RANK_TIERS = ("{ingush}", "{russian transcription}", "{examples}")
+
+
+def normalize(text) -> str:
+    return (text or "").casefold().translate(_PALOCHKA_VARIANTS)
+
+
+def match_expression(query: str) -> str:
+    """Все токены запроса как префиксы: «кIа дог» -> '"кӏа"* "дог"*'."""
+    return " ".join(f'"{tok}"*' for tok in _TOKEN_RE.findall(normalize(query)))
+
+
+class SearchIndex:
+    def __init__(self, connect: Callable[[], Any]):
+        self._conn = connect()
+        self.available = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (FTS_TABLE,)).fetchone() is not None
+
+    @ing_metrics.timed("search.query")
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """[{"id","ingush","russian","transcription"}] в порядке RANK_TIERS."""
+        expr = match_expression(query)
+        if not expr or not self.available:
+            return []
+        ids: List[int] = []
+        for columns in RANK_TIERS:
+            for (wid,) in self._conn.execute(
+                    f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ? LIMIT ?",
+                    (f"{columns} : ({expr})", limit + len(ids))):
+                if wid not in ids:
+                    ids.append(wid)
+            if len(ids) >= limit:
+                break
+        ids = ids[:limit]
+        if not ids:
+            return []
+        rows = self._conn.execute(
+            f"SELECT id, ingush, russian, transcription FROM words WHERE id IN ({', '.join('?' * len(ids))})",
+            ids).fetchall()
+        by_id = {wid: {"id": wid, "ingush": ing, "russian": rus, "transcription": tr or ""}
+                 for wid, ing, rus, tr in rows}
+        return [by_id[wid] for wid in ids if wid in by_id]
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP-сервис словаря для нескольких машин класса (asyncio, без Qt и без
+сторонних пакетов).
+
+    python ing_server.py --db ing_base.db --data server_data --port 8765
+
+GET  /version                      — версия данных и число слов
+GET  /words?offset=0&limit=50      — страница словаря
+GET  /words/<id>                   — слово с примерами
+GET  /examples/<word_id>           — примеры слова
+GET  /search?q=...&limit=20        — поиск (ing_search, FTS5)
+GET  /learners/<name>/next         — карточка ученика (ing_session, как в тренажёре)
+POST /learners/<name>/answer?outcome=know|dont — ответ и следующая карточка
+
+Запросы к словарю выполняются в пуле потоков на пуле read-only соединений
+(ing_packs.ConnectionPool). У их ответов ETag из версии данных (размер и
+время изменения файла, версия схемы) и адреса: If-None-Match отвечается 304
+без обращения к базе, готовые тела ответов лежат в LRU. Замену базы сервер
+не отслеживает — после неё его перезапускают (меняется и ETag).
+
+Ученики — как в tools/ing_batch.py: DATA/learners/<name>/{progress.db,
+stats.json}. Их базы пишутся в одном отдельном потоке: соединения SQLite
+не переходят между потоками, а записи всё равно идут пачками. Раз в
+FLUSH_SECONDS пачки и stats.json сбрасываются на диск (ing_stats.StatsStore
+пишет файл, только если он изменился); остальное — при остановке (Ctrl+C, SIGTERM).
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import signal
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import ing_crypto
+import ing_db
+import ing_metrics
+import ing_migrations
+import ing_packs
+import ing_progress
+import ing_scheduler
+import ing_search
+import ing_session
+import ing_stats
+import ing_words
+
+DEFAULT_PORT = 8765
+POOL_SIZE = 8             # read-only соединений и потоков для запросов к словарю
+CACHE_SIZE = 4096         # готовых ответов в LRU
+MAX_LIMIT = 200
+OPEN_LEARNERS = 256       # сколько учеников держать открытыми (остальные закрываются по LRU)
+FLUSH_SECONDS = 5.0
+LEARNER_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+ENTITY_TAG = re.compile(r'\s*(?:W/)?("[^"]*")\s*(?:,|$)')
+DB_KEY_ENV = "ING_DB_KEY"
+
+WORD_SQL = f"SELECT {ing_words.WORD_COLUMNS} FROM words WHERE id = ?"
+PAGE_SQL = f"SELECT {ing_words.WORD_COLUMNS} FROM words ORDER BY id LIMIT ? OFFSET ?"
+EXAMPLES_SQL = "SELECT ing, rus FROM examples WHERE word_id = ? ORDER BY id"
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str = ""):
+        super().__init__(message or REASONS.get(status, ""))
+        self.status = status
+
+
+def _word(row) -> Dict[str, Any]:
+    wid, ing, rus, tr = row
+    return {"id": wid, "ingush": ing, "russian": rus, "transcription": tr or ""}
+
+
+def parse_if_none_match(header: str) -> Tuple[bool, set]:
+    """If-None-Match -> (любой — «*», множество ETag). W/ отбрасывается: для If-None-Match
+    сравнение слабое (RFC 7232, 3.2); ETag сравниваются целиком, а не подстрокой."""
+    header = header.strip()
+    if header == "*":
+        return True, set()
+    tags, pos = set(), 0
+    while pos < len(header):
+        m = ENTITY_TAG.match(header, pos)
+        if m is None:
+            return False, set()   # испорченный заголовок — как без него
+        tags.add(m.group(1))
+        pos = m.end()
+    return False, tags
+
+
+def _int(params: Dict[str, list], name: str, default: int, lo: int = 0, hi: Optional[int] = None) -> int:
+    try:
+        value = int(params.get(name, [default])[0])
+    except ValueError:
+        raise HttpError(400, f"{name} must be an integer")
+    return max(lo, value if hi is None else min(value, hi))
+
+
+# ---- запросы к словарю (в потоках пула) ----
+def _get_word(conn, word_id: int) -> Dict[str, Any]:
+    row = conn.execute(WORD_SQL, (word_id,)).fetchone()
+    if row is None:
+        raise HttpError(404, f"no word {word_id}")
+    return {**_word(row), "examples": _get_examples(conn, word_id)}
+
+
+def _get_examples(conn, word_id: int):
+    return [{"ing": ing, "rus": rus} for ing, rus in conn.execute(EXAMPLES_SQL, (word_id,))]
+
+
+def _get_page(conn, offset: int, limit: int) -> Dict[str, Any]:
+    return {"offset": offset, "items": [_word(row) for row in conn.execute(PAGE_SQL, (limit, offset))]}
+
+
+def _search(conn, query: str, limit: int):
+    return {"query": query, "items": ing_search.SearchIndex(lambda: conn).search(query, limit)}
+
+
+class Learner:
+    """Сессия одного ученика; живёт только в потоке учеников."""
+
+    def __init__(self, folder: Path, words):
+        stats_file = folder / "stats.json"
+        try:
+            stats = json.loads(stats_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            stats = {}
+        self.stats = ing_stats.StatsStore(stats_file, stats)
+        self.progress = ing_progress.ProgressLog(folder / "progress.db")
+        self.scheduler = ing_scheduler.Scheduler(folder / "progress.db")
+        self.session = ing_session.Session(words, self.progress, self.scheduler, stats.get("current_index", 0))
+
+    def card(self) -> Dict[str, Any]:
+        s = self.session
+        card = {**s.current(), "examples": s.words.examples(s.idx)} if s.poll() else None
+        # card = None: finished — всё пройдено, иначе повторения «Не знаю» наступят в relearn_due (мс)
+        return {"index": s.idx, "card": card, "finished": s.finished, "relearn_due": s.relearn_due(),
+                "summary": s.summary()}
+
+    def answer(self, outcome: str) -> Dict[str, Any]:
+        if outcome == "know":
+            self.session.know()
+        elif outcome == "dont":
+            if self.session.dont():
+                self.session.advance()   # примеры клиент уже показал вместе с карточкой
+        else:
+            raise HttpError(400, "outcome must be know or dont")
+        self.stats.stats.update(self.session.export_stats())
+        self.stats.mark_dirty()
+        return self.card()
+
+    def flush(self) -> None:
+        self.progress.flush()
+        self.stats.flush()
+
+    def close(self) -> None:
+        self.stats.flush()
+        self.progress.close()
+        self.scheduler.close()
+
+
+class DictionaryService:
+    def __init__(self, db_path: Path, data_dir: Path, pool_size: int = POOL_SIZE, cache_size: int = CACHE_SIZE):
+        self.data_dir = Path(data_dir)
+        db_path = Path(db_path)
+        if ing_crypto.is_encrypted(db_path):
+            snapshot = ing_crypto.open_snapshot(db_path, os.environ.get(DB_KEY_ENV))
+            connect = lambda: snapshot.connect(check_same_thread=False)
+            self.db_path = db_path
+        else:
+            self.db_path = ing_migrations.ensure_migrated(db_path, self.data_dir / "cache")
+            connect = lambda: ing_migrations.connect_readonly(self.db_path, check_same_thread=False)
+        st = db_path.stat()
+        self.version = f"{st.st_size}-{st.st_mtime_ns}-{ing_migrations.SCHEMA_VERSION}"
+        self.pool = ing_packs.ConnectionPool(connect, pool_size)
+        self._readers = ThreadPoolExecutor(pool_size, thread_name_prefix="ing-read")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="ing-learners")
+        self._cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self.cache_size = cache_size
+        self._learners: "OrderedDict[str, Learner]" = OrderedDict()
+        self.words = ing_db.load_compact(self.db_path, connect=connect)   # общий для сессий всех учеников
+        self.hits = self.misses = self.not_modified = 0
+
+    # ---- словарь: ETag, кэш, пул ----
+    def _etag(self, target: str) -> str:
+        return '"' + hashlib.sha1(f"{self.version} {target}".encode("utf-8")).hexdigest()[:24] + '"'
+
+    def _query(self, fn, *args) -> bytes:
+        with self.pool.connection() as conn:
+            data = fn(conn, *args)
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _not_modified(self, cache_headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        self.not_modified += 1
+        ing_metrics.count("server.not_modified")
+        return 304, cache_headers, b""
+
+    async def dataset(self, target: str, headers: Dict[str, str], fn, *args) -> Tuple[int, Dict[str, str], bytes]:
+        etag = self._etag(target)
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}   # клиент хранит, но каждый раз сверяет ETag
+        any_tag, tags = parse_if_none_match(headers.get("if-none-match", ""))
+        if etag in tags:
+            return self._not_modified(cache_headers)
+        cached = self._cache.get(target)
+        if cached is not None:
+            self._cache.move_to_end(target)
+            self.hits += 1
+            ing_metrics.count("server.cache_hit")
+            body = cached[1]
+        else:
+            self.misses += 1
+            body = await asyncio.get_running_loop().run_in_executor(self._readers, self._query, fn, *args)
+            self._cache[target] = (etag, body)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        if any_tag:   # «*» — 304, если ресурс есть; его существование ясно только после запроса (иначе 404)
+            return self._not_modified(cache_headers)
+        return 200, cache_headers, body
+
+    # ---- ученики: всё в одном потоке ----
+    def _learner(self, name: str) -> Learner:
+        learner = self._learners.get(name)
+        if learner is None:
+            learner = self._learners[name] = Learner(self.data_dir / "learners" / name, self.words)
+            while len(self._learners) > OPEN_LEARNERS:
+                self._learners.popitem(last=False)[1].close()
+        self._learners.move_to_end(name)
+        return learner
+
+    async def learner(self, name: str, action: str, outcome: Optional[str] = None) -> Tuple[int, Dict[str, str], bytes]:
+        if not LEARNER_NAME.match(name):
+            raise HttpError(400, "learner name: letters, digits, _ and -")
+
+        def run():
+            learner = self._learner(name)
+            data = learner.card() if action == "next" else learner.answer(outcome or "")
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        body = await asyncio.get_running_loop().run_in_executor(self._writer, run)
+        return 200, {"Cache-Control": "no-store"}, body
+
+    # ---- маршруты ----
+    async def respond(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        params = parse_qs(url.query)
+        if len(parts) == 3 and parts[0] == "learners":
+            if (method, parts[2]) == ("GET", "next"):
+                return await self.learner(parts[1], "next")
+            if (method, parts[2]) == ("POST", "answer"):
+                return await self.learner(parts[1], "answer", params.get("outcome", [""])[0])
+            raise HttpError(405 if parts[2] in ("next", "answer") else 404)
+        if method not in ("GET", "HEAD"):
+            raise HttpError(405)
+        if parts == ["version"]:
+            cache_headers = {"ETag": self._etag(target), "Cache-Control": "no-cache"}
+            any_tag, tags = parse_if_none_match(headers.get("if-none-match", ""))
+            if any_tag or cache_headers["ETag"] in tags:
+                return self._not_modified(cache_headers)
+            body = json.dumps({"version": self.version, "words": len(self.words)}).encode("utf-8")
+            return 200, cache_headers, body
+        if parts == ["words"]:
+            offset, limit = _int(params, "offset", 0), _int(params, "limit", 50, 1, MAX_LIMIT)
+            return await self.dataset(target, headers, _get_page, offset, limit)
+        if len(parts) == 2 and parts[0] in ("words", "examples"):
+            try:
+                word_id = int(parts[1])
+            except ValueError:
+                raise HttpError(404)
+            return await self.dataset(target, headers, _get_word if parts[0] == "words" else _get_examples, word_id)
+        if parts == ["search"]:
+            query = params.get("q", [""])[0].strip()
+            if not query:
+                raise HttpError(400, "q is required")
+            return await self.dataset(target, headers, _search, query, _int(params, "limit", 20, 1, MAX_LIMIT))
+        raise HttpError(404)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """HTTP/1.1 с keep-alive: запросы одного соединения обрабатываются по очереди."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                started = time.perf_counter()
+                try:
+                    method, target, version = line.decode("utf-8", "replace").split()   # curl шлёт кириллицу без %-кодирования
+                except ValueError:
+                    break
+                headers: Dict[str, str] = {}
+                while True:
+                    raw = await reader.readline()
+                    if raw in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = raw.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+                try:
+                    status, extra, body = await self.respond(method, target, headers)
+                except HttpError as e:
+                    status, extra, body = e.status, {}, json.dumps({"error": str(e)}).encode("utf-8")
+                except Exception as e:
+                    ing_metrics.count("errors.server")
+                    print("Error serving", target, e, file=sys.stderr)
+                    status, extra, body = 500, {}, b'{"error":"internal"}'
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                        f"Content-Length: {len(body)}", "Connection: " + ("keep-alive" if keep_alive else "close")]
+                if status != 304:
+                    head.append("Content-Type: application/json; charset=utf-8")
+                head += [f"{k}: {v}" for k, v in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + (b"" if method == "HEAD" else body))
+                await writer.drain()
+                ing_metrics.observe("server.request", (time.perf_counter() - started) * 1000)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self) -> None:
+        self._readers.shutdown()
+        self._writer.submit(self._close_learners).result()
+        self._writer.shutdown()
+        self.pool.close()
+
+    async def flush_forever(self, every: float = FLUSH_SECONDS) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(every)
+            await loop.run_in_executor(self._writer, self._flush_learners)
+
+    def _flush_learners(self) -> None:
+        for learner in self._learners.values():
+            learner.flush()
+
+    def _close_learners(self) -> None:
+        while self._learners:
+            self._learners.popitem(last=False)[1].close()
+
+    def counters(self) -> Dict[str, Any]:
+        return {"cache_hits": self.hits, "cache_misses": self.misses, "not_modified": self.not_modified,
+                "cached": len(self._cache), "learners_open": len(self._learners), "pool_waits": self.pool.waits}
+
+
+async def serve(service: DictionaryService, host: str, port: int) -> None:
+    server = await asyncio.start_server(service.handle, host, port, backlog=512)
+    bound = server.sockets[0].getsockname()
+    print(f"Serving {service.db_path} ({len(service.words)} words) on http://{bound[0]}:{bound[1]}", flush=True)
+    stop = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    except (NotImplementedError, AttributeError):   # Windows: только Ctrl+C
+        pass
+    flusher = asyncio.create_task(service.flush_forever())
+    async with server:
+        await stop.wait()
+    flusher.cancel()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve the dictionary and trainer sessions over HTTP")
+    parser.add_argument("--db", type=Path, default=Path(__file__).resolve().parent / "ing_base.db")
+    parser.add_argument("--data", type=Path, default=Path("ing_server_data"), help="learners and migrated cache")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    parser.add_argument("--pool", type=int, default=POOL_SIZE, help="read-only connections / reader threads")
+    parser.add_argument("--cache", type=int, default=CACHE_SIZE, help="responses kept in memory")
+    parser.add_argument("--metrics", action="store_true", help="print ing_metrics on exit")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"No database at {args.db}", file=sys.stderr)
+        return 1
+    ing_metrics.enable(args.metrics or bool(os.environ.get("ING_METRICS")))
+    service = DictionaryService(args.db, args.data, args.pool, args.cache)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        counters = service.counters()
+        service.close()
+        if ing_metrics.ENABLED:
+            print(ing_metrics.format_summary())
+        print(json.dumps(counters))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Сессия тренажёра без Qt: какая карточка показана, «Знаю» / «Не знаю»,
+переходы вперёд/назад и итоги для stats.json.
+
+TrainerPage в 10.py — только отображение поверх Session; та же логика
+гоняется без экрана в tools/ing_batch.py (тысячи учеников в пуле процессов).
+
+    session = Session(words, progress, scheduler, start_index=stats["current_index"])
+    session.show()           # карточка на экране — с этого момента считается время ответа
+    session.know()           # записывает ответ и переходит к следующей карточке
+    session.dont()           # записывает ответ; дальше — advance() (кнопка »)
+    session.poll()           # новых слов нет, ждём повторений после «Не знаю» — не наступили ли
+
+Сессия закончена (finished), когда новые слова пройдены и ни одно слово
+«Не знаю» не ждёт переучивания; до тех пор current() может вернуть None —
+карточка появится в relearn_due().
+
+Время берётся из clock() в мс (по умолчанию ing_progress.now_ms): при
+симуляции можно подставить свои часы, и повторения ing_scheduler будут
+наступать по ним. upcoming(n) — прогноз следующих карточек для
+упреждающего чтения (ing_prefetch).
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import ing_progress
+import ing_scheduler
+
+HISTORY_SIZE = 100   # сколько карточек назад можно вернуться
+UPCOMING_AHEAD_MS = 60_000   # upcoming() учитывает и повторения, которые наступят, пока смотрят на карточку
+
+
+class Session:
+    def __init__(self, words, progress, scheduler, start_index: int = 0,
+                 clock: Callable[[], int] = ing_progress.now_ms, history_size: int = HISTORY_SIZE):
+        self.words, self.progress, self.scheduler = words, progress, scheduler
+        self.clock = clock
+        self.history_size = history_size
+        self.total = len(words)
+        # cursor — следующее новое слово по порядку словаря; idx — показанная карточка
+        self.cursor = max(0, min(start_index, self.total - 1 if self.total else 0))
+        self.idx = self.cursor
+        self._history: List[int] = []
+        self._member: Dict[int, bool] = {}   # word_id -> есть ли в words (выбор пакетов за сессию не меняется)
+        self.known, self.unknown = progress.counts()
+        self.locked = False   # ответ на показанную карточку уже дан
+        self._shown_at = clock()
+        self._pick()
+
+    # ---- состояние ----
+    @property
+    def finished(self) -> bool:
+        return self.idx >= self.total and not self._relearn_pending()
+
+    def _relearn_pending(self) -> List[int]:
+        # слова других словарей (пакет сняли с выбора) здесь не покажут — их не ждём
+        return [wid for wid in self.scheduler.relearning if self._in_words(wid)]
+
+    def _in_words(self, word_id: int) -> bool:
+        known = self._member.get(word_id)
+        if known is None:
+            known = self._member[word_id] = self.words.contains(word_id)
+        return known
+
+    def relearn_due(self) -> Optional[int]:
+        """Когда (мс) наступит ближайшее повторение после «Не знаю»; None — таких нет."""
+        dues = [self.scheduler.card(wid).due for wid in self._relearn_pending()]
+        return min(dues) if dues else None
+
+    def poll(self) -> bool:
+        """Нет карточки — выбрать снова (могли наступить повторения). True, если карточка есть."""
+        if self.idx >= self.total:
+            self._pick()
+            if self.idx < self.total:
+                self.show()
+        return self.idx < self.total
+
+    @property
+    def can_go_back(self) -> bool:
+        return bool(self._history)
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        return None if self.idx >= self.total else self.words[self.idx]
+
+    def show(self) -> None:
+        """Карточка idx показана: ответ снова доступен, время ответа считается отсюда."""
+        self.locked = False
+        self._shown_at = self.clock()
+
+    # ---- ответы ----
+    def know(self) -> bool:
+        if self.locked or self.idx >= self.total:
+            return False
+        self._record(ing_progress.OUTCOME_KNOW, ing_scheduler.GRADE_KNOW)
+        self.advance()
+        return True
+
+    def dont(self) -> bool:
+        """Ответ «Не знаю»; карточка остаётся (показать примеры), дальше — advance()."""
+        if self.locked or self.idx >= self.total:
+            return False
+        self._record(ing_progress.OUTCOME_DONT, ing_scheduler.GRADE_DONT)
+        return True
+
+    def _record(self, outcome: int, grade: int) -> None:
+        now = self.clock()
+        wid = self.words[self.idx]["id"]
+        self.progress.record(wid, outcome, max(0, now - self._shown_at), ts=now)
+        self.scheduler.grade(wid, grade, now)
+        self.known, self.unknown = self.progress.counts()
+        self.locked = True
+
+    def upcoming(self, n: int) -> Tuple[List[int], List[int]]:
+        """Прогноз для ing_prefetch: (word_id повторений, индексы слов) — что покажут после idx.
+        _pick сначала отдаёт просроченные повторения, потом новые слова с cursor; последним — «назад»."""
+        if n <= 0 or self.idx >= self.total:
+            return [], []
+        due = self.scheduler.upcoming(self.clock() + UPCOMING_AHEAD_MS, n, exclude=self.words[self.idx]["id"],
+                                      accept=self._in_words)
+        start = self.cursor + 1 if self.idx == self.cursor else self.cursor
+        indices = list(range(start, min(start + max(1, n - len(due)), self.total)))
+        if self._history:
+            indices.append(self._history[-1])
+        return due, indices
+
+    # ---- переходы ----
+    def _pick(self) -> None:
+        """Следующая карточка: просроченное повторение (ing_scheduler), иначе новое слово по порядку."""
+        current = self.words[self.idx]["id"] if 0 <= self.idx < self.total else None
+        wid = self.scheduler.next_due(self.clock(), exclude=current, accept=self._in_words)
+        idx = self.words.index_of(wid) if wid is not None else None
+        self.idx = idx if idx is not None else self.cursor
+
+    def _push_history(self) -> None:
+        if self.idx < self.total:
+            self._history.append(self.idx)
+            del self._history[:-self.history_size]
+
+    def advance(self) -> None:
+        self._push_history()
+        if self.idx == self.cursor < self.total:   # без карточки (ждём повторений) cursor не уходит за конец
+            self.cursor += 1
+        self._pick()
+        self.show()
+
+    def back(self) -> bool:
+        if not self._history:
+            return False
+        self.idx = self._history.pop()
+        self.show()
+        return True
+
+    def go_to(self, idx: int) -> None:
+        self._push_history()
+        self.idx = max(0, min(idx, self.total - 1 if self.total else 0))
+        self.show()
+
+    def reset(self) -> None:
+        """«Сбросить прогресс»: счётчики и повторения с нуля, словарь с начала (история ответов остаётся)."""
+        self.progress.reset_counters()
+        self.scheduler.reset()
+        self.cursor = self.idx = 0
+        self._history.clear()
+        self.known, self.unknown = self.progress.counts()
+        self.show()
+
+    # ---- итоги ----
+    def summary(self) -> Dict[str, int]:
+        """done/known/unknown — ответы (с повторениями); remaining — слова без единого ответа
+        (карточка ing_scheduler есть у каждого отвеченного слова), relearn — ждут переучивания."""
+        done = self.known + self.unknown
+        return {"total": self.total, "remaining": max(0, self.total - len(self.scheduler)), "done": done,
+                "known": self.known, "unknown": self.unknown, "relearn": len(self._relearn_pending())}
+
+    def export_stats(self) -> Dict[str, Any]:
+        return {"current_index": self.cursor, "known_count": self.known, "unknown_count": self.unknown}
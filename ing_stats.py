@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Отложенная запись stats.json (без зависимостей от Qt).
+
+Каждый шаг тренажёра и каждое движение слайдера только помечают статистику
+изменённой (mark_dirty). Записывает flush(): его зовёт таймер окна и
+closeEvent, так что серия изменений превращается в одну запись. Запись
+атомарная: временный файл + fsync + os.replace.
+
+Настройки SETTINGS_KEYS обмениваются между устройствами (ing_sync) по
+правилу «последняя правка выигрывает», поэтому время правки хранится рядом:
+stats["settings_ts"] = {ключ: мс}. У ни разу не менявшегося значения (имя
+«Гость» по умолчанию) отметки нет — для ing_sync это ts 0, любая настоящая
+правка с другого устройства его перебивает.
+"""
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import ing_metrics
+
+SETTINGS_KEYS = ("user_name", "example_font_size", "packs")
+SETTINGS_TS = "settings_ts"
+
+
+def stamp_settings(stats: Dict[str, Any], keys: Iterable[str], now_ms: Optional[int] = None) -> None:
+    """Отмечает keys как изменённые сейчас (now_ms)."""
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    stats.setdefault(SETTINGS_TS, {}).update({key: now_ms for key in keys})
+
+
+def settings_ts(stats: Dict[str, Any], key: str) -> int:
+    """Когда key меняли на этом устройстве; 0 — никогда."""
+    return int(stats.get(SETTINGS_TS, {}).get(key, 0))
+
+
+def dump_stats(stats: Dict[str, Any]) -> str:
+    return json.dumps(stats, ensure_ascii=False, indent=2)
+
+
+@ing_metrics.timed("file.write_json")
+def write_json_atomic(filepath: Path, text: str) -> None:
+    ing_metrics.count("file.writes")
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    tmp = str(filepath) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, str(filepath))
+
+
+class StatsStore:
+    def __init__(self, filepath: Path, stats: Dict[str, Any],
+                 save: Optional[Callable[[Path, Dict[str, Any]], Optional[bool]]] = None,
+                 stamped: Iterable[str] = ()):
+        self.filepath = filepath
+        self.stats = stats
+        # stamped — ключи, у которых flush() отмечает время правки (stamp_settings)
+        self._stamped = {key: json.dumps(stats.get(key)) for key in stamped}
+        self._save = save or (lambda path, data: write_json_atomic(path, dump_stats(data)))
+        self._dirty = False
+        self._last_written: Optional[str] = None
+        self.requests = 0    # сколько раз просили сохранить
+        self.writes = 0      # сколько раз реально записали файл
+        self.unchanged = 0   # flush() без изменений содержимого — запись пропущена
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    @property
+    def avoided(self) -> int:
+        return self.requests - self.writes
+
+    def mark_dirty(self) -> None:
+        self.requests += 1
+        self._dirty = True
+
+    def flush(self) -> bool:
+        """Записывает файл, если есть изменения. True — если запись была."""
+        if not self._dirty:
+            return False
+        self._dirty = False
+        self._stamp_changed()
+        text = dump_stats(self.stats)
+        if text == self._last_written:
+            self.unchanged += 1
+            return False
+        if self._save(self.filepath, self.stats) is False:
+            self._dirty = True  # не удалось — попробуем при следующем flush()
+            return False
+        self._last_written = text
+        self.writes += 1
+        return True
+
+    def _stamp_changed(self) -> None:
+        now = {key: json.dumps(self.stats.get(key)) for key in self._stamped}
+        changed = [key for key, value in now.items() if value != self._stamped[key]]
+        if changed:
+            stamp_settings(self.stats, changed)
+            self._stamped = now
+
+    def counters(self) -> Dict[str, int]:
+        return {"requests": self.requests, "writes": self.writes,
+                "avoided": self.avoided, "unchanged": self.unchanged}
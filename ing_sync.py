@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Обмен прогрессом между устройствами журналами изменений (без зависимостей от Qt).
+
+У каждой копии прогресса (progress.db) свой replica id. Ответ — событие
+(replica, seq): у своих ответов seq = reviews.id, чужие записываются в
+reviews как обычные строки, а их происхождение — в sync_origin. Часы —
+вектор {replica: последний seq}, отдельно для ответов и для настроек.
+
+changes_since(conn, since) отдаёт только то, чего нет у получателя по его
+часам; apply_changes() пропускает уже известные события, так что журнал
+можно применять повторно и в любом порядке — копии сходятся:
+- ответы — объединение множеств;
+- карточки ing_scheduler затронутых слов пересчитываются из объединённой
+  истории в порядке (ts, replica, seq), а не дописываются поверх;
+- настройки (SETTINGS_KEYS из stats.json) — «последняя запись выигрывает»
+  по (ts, replica, seq), где ts — время правки (ing_stats.settings_ts).
+
+Формат журнала (JSON):
+    {"format": 1, "replica": "...", "clock": {"reviews": {r: seq}, "settings": {r: seq}},
+     "reviews": {replica: [[seq, word_id, ts, outcome, latency_ms], ...]},
+     "settings": {key: [value, ts, replica, seq]}}
+
+Применять к progress.db закрытого приложения (ProgressLog и Scheduler
+держат часть состояния в памяти). Обмен файлами — tools/ing_sync.py.
+"""
+import json
+import sqlite3
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import ing_metrics
+import ing_progress
+import ing_scheduler
+import ing_stats
+
+FORMAT = 1
+SETTINGS_KEYS = ing_stats.SETTINGS_KEYS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_origin (
+    replica TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    review_id INTEGER NOT NULL UNIQUE,   -- строка reviews, куда записано чужое событие
+    PRIMARY KEY (replica, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sync_settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,                 -- JSON
+    ts INTEGER NOT NULL,
+    replica TEXT NOT NULL,
+    seq INTEGER NOT NULL
+);
+"""
+
+Clock = Dict[str, Dict[str, int]]
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    conn = ing_progress.connect(db_path)
+    conn.executescript(SCHEMA + ing_scheduler.SCHEMA)
+    return conn
+
+
+def _meta(conn: sqlite3.Connection, key: str, default: Any = None) -> Any:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return default if row is None else json.loads(row[0])
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: Any) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+
+def replica_id(conn: sqlite3.Connection) -> str:
+    replica = _meta(conn, "sync_replica")
+    if replica is None:
+        replica = uuid.uuid4().hex
+        with conn:
+            _set_meta(conn, "sync_replica", replica)
+    return replica
+
+
+def clock(conn: sqlite3.Connection) -> Clock:
+    """Что есть в этой копии: {"reviews": {replica: seq}, "settings": {replica: seq}}."""
+    me = replica_id(conn)
+    own = conn.execute(
+        "SELECT max(id) FROM reviews WHERE id NOT IN (SELECT review_id FROM sync_origin)").fetchone()[0]
+    reviews = dict(conn.execute("SELECT replica, max(seq) FROM sync_origin GROUP BY replica"))
+    if own:
+        reviews[me] = own
+    return {"reviews": reviews, "settings": _meta(conn, "sync_settings_clock", {})}
+
+
+def _merge_clock(a: Dict[str, int], b: Dict[str, int]) -> Dict[str, int]:
+    return {r: max(a.get(r, 0), b.get(r, 0)) for r in a.keys() | b.keys()}
+
+
+def record_settings(conn: sqlite3.Connection, stats: Dict[str, Any]) -> int:
+    """Локальные правки настроек в stats.json становятся событиями этой копии; сколько новых.
+    ts события — время правки из stats["settings_ts"], а не время синхронизации: иначе «Гость»
+    со свежего устройства перебил бы настоящую, но более раннюю правку другого."""
+    me = replica_id(conn)
+    known = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM sync_settings")}
+    changed = [key for key in SETTINGS_KEYS if key in stats and known.get(key, ()) != stats[key]]
+    if not changed:
+        return 0
+    settings_clock = _meta(conn, "sync_settings_clock", {})
+    seq = settings_clock.get(me, 0)
+    with conn:
+        for key in changed:
+            seq += 1
+            conn.execute("INSERT OR REPLACE INTO sync_settings(key, value, ts, replica, seq) VALUES (?, ?, ?, ?, ?)",
+                         (key, json.dumps(stats[key], ensure_ascii=False), ing_stats.settings_ts(stats, key), me, seq))
+        settings_clock[me] = seq
+        _set_meta(conn, "sync_settings_clock", settings_clock)
+    return len(changed)
+
+
+@ing_metrics.timed("sync.changes_since")
+def changes_since(conn: sqlite3.Connection, since: Optional[Clock] = None) -> Dict[str, Any]:
+    """Журнал всего, чего нет у копии с часами since (None — всё)."""
+    since = since or {}
+    seen, seen_settings = since.get("reviews", {}), since.get("settings", {})
+    me = replica_id(conn)
+    now = clock(conn)
+    reviews: Dict[str, List[list]] = {}
+    for replica, top in now["reviews"].items():
+        after = seen.get(replica, 0)
+        if top <= after:
+            continue
+        if replica == me:
+            rows = conn.execute(
+                "SELECT id, word_id, ts, outcome, latency_ms FROM reviews "
+                "WHERE id > ? AND id NOT IN (SELECT review_id FROM sync_origin) ORDER BY id", (after,))
+        else:
+            rows = conn.execute(
+                "SELECT o.seq, r.word_id, r.ts, r.outcome, r.latency_ms FROM sync_origin AS o "
+                "JOIN reviews AS r ON r.id = o.review_id WHERE o.replica = ? AND o.seq > ? ORDER BY o.seq",
+                (replica, after))
+        reviews[replica] = [list(row) for row in rows]
+    settings = {key: [json.loads(value), ts, replica, seq] for key, value, ts, replica, seq in conn.execute(
+        "SELECT key, value, ts, replica, seq FROM sync_settings") if seq > seen_settings.get(replica, 0)}
+    return {"format": FORMAT, "replica": me, "clock": now, "reviews": reviews, "settings": settings}
+
+
+def _stamp(entry: list) -> Tuple[int, str, int]:
+    _, ts, replica, seq = entry
+    return ts, replica, seq
+
+
+@ing_metrics.timed("sync.apply")
+def apply_changes(conn: sqlite3.Connection, changes: Dict[str, Any],
+                  stats: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """Применяет журнал (повторно — безвредно). stats — словарь stats.json, в нём обновятся настройки."""
+    if changes.get("format") != FORMAT:
+        raise ValueError(f"unsupported sync format: {changes.get('format')!r}")
+    me = replica_id(conn)
+    if stats is not None:
+        record_settings(conn, stats)   # свои несинхронизированные правки участвуют в сравнении
+    added = 0
+    # свои ответы после прошлого применения тоже пересчитываются: Scheduler наложил их на карточку
+    # в порядке записи, а чужие ответы с более поздним ts могли прийти раньше (часы устройств расходятся)
+    touched = {wid for (wid,) in conn.execute(
+        "SELECT DISTINCT word_id FROM reviews WHERE id > ?", (_meta(conn, "sync_cards_after_id", 0),))}
+    with conn:
+        for replica, rows in changes.get("reviews", {}).items():
+            if replica == me or not rows:
+                continue
+            known = {seq for (seq,) in conn.execute(
+                "SELECT seq FROM sync_origin WHERE replica = ? AND seq BETWEEN ? AND ?",
+                (replica, rows[0][0], rows[-1][0]))}
+            for seq, word_id, ts, outcome, latency_ms in rows:
+                if seq in known:
+                    continue
+                review_id = conn.execute("INSERT INTO reviews(word_id, ts, outcome, latency_ms) VALUES (?, ?, ?, ?)",
+                                         (word_id, ts, outcome, latency_ms)).lastrowid
+                conn.execute("INSERT INTO sync_origin(replica, seq, review_id) VALUES (?, ?, ?)",
+                             (replica, seq, review_id))
+                known.add(seq)
+                touched.add(word_id)
+                added += 1
+        updated = 0
+        if stats is not None:   # без stats.json настройки не принимаем: иначе следующий record_settings их перебьёт
+            updated = _apply_settings(conn, changes.get("settings", {}), stats)
+            settings_clock = _merge_clock(_meta(conn, "sync_settings_clock", {}), changes["clock"].get("settings", {}))
+            _set_meta(conn, "sync_settings_clock", settings_clock)
+        # что есть у отправителя — с этого места следующий журнал для него
+        _set_meta(conn, f"sync_peer:{changes['replica']}", changes["clock"])
+        cards = rebuild_cards(conn, touched)
+        _set_meta(conn, "sync_cards_after_id", conn.execute("SELECT coalesce(max(id), 0) FROM reviews").fetchone()[0])
+    ing_metrics.count("sync.reviews_applied", added)
+    return {"reviews": added, "settings": updated, "cards": cards}
+
+
+def _apply_settings(conn: sqlite3.Connection, incoming: Dict[str, list], stats: Dict[str, Any]) -> int:
+    current = {key: [json.loads(value), ts, replica, seq] for key, value, ts, replica, seq in conn.execute(
+        "SELECT key, value, ts, replica, seq FROM sync_settings")}
+    updated = 0
+    for key, entry in incoming.items():
+        if key not in SETTINGS_KEYS:
+            continue
+        mine = current.get(key)
+        if mine is not None and _stamp(mine) >= _stamp(entry):
+            continue
+        value, ts, replica, seq = entry
+        conn.execute("INSERT OR REPLACE INTO sync_settings(key, value, ts, replica, seq) VALUES (?, ?, ?, ?, ?)",
+                     (key, json.dumps(value, ensure_ascii=False), ts, replica, seq))
+        stats[key] = value
+        ing_stats.stamp_settings(stats, [key], ts)
+        updated += 1
+    return updated
+
+
+def rebuild_cards(conn: sqlite3.Connection, word_ids: Iterable[int]) -> int:
+    """Карточки SM-2 слов word_ids заново из всей истории (после «Сбросить прогресс» — из новой части)."""
+    word_ids = sorted(set(word_ids))
+    if not word_ids:
+        return 0
+    me = replica_id(conn)
+    after = conn.execute("SELECT value FROM meta WHERE key = 'counted_after_id'").fetchone()
+    after = after[0] if after is not None else 0
+    history: Dict[int, List[tuple]] = defaultdict(list)
+    for start in range(0, len(word_ids), 500):
+        chunk = word_ids[start:start + 500]
+        for word_id, ts, outcome, replica, seq in conn.execute(
+                "SELECT r.word_id, r.ts, r.outcome, coalesce(o.replica, ?), coalesce(o.seq, r.id) "
+                "FROM reviews AS r LEFT JOIN sync_origin AS o ON o.review_id = r.id "
+                f"WHERE r.id > ? AND r.word_id IN ({', '.join('?' * len(chunk))})", (me, after, *chunk)):
+            history[word_id].append((ts, replica, seq, outcome))
+    rows = []
+    for word_id, events in history.items():
+        card = ing_scheduler.Card(word_id)
+        for ts, _, _, outcome in sorted(events):   # один и тот же порядок на любой копии
+            grade = ing_scheduler.GRADE_KNOW if outcome == ing_progress.OUTCOME_KNOW else ing_scheduler.GRADE_DONT
+            ing_scheduler.review(card, grade, ts)
+        rows.append(card.row())
+    conn.executemany("INSERT OR REPLACE INTO cards(word_id, ease, interval_days, reps, lapses, due) "
+                     "VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def peer_clock(conn: sqlite3.Connection, peer: str) -> Optional[Clock]:
+    """Часы копии peer из её последнего журнала (None — журналов от неё не было)."""
+    return _meta(conn, f"sync_peer:{peer}")
+
+
+def _load_stats(path: Optional[Path]) -> Optional[Dict[str, Any]]:
+    if path is None:
+        return None
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def export_file(db_path: Path, out_path: Path, stats_path: Optional[Path] = None,
+                peer: Optional[str] = None) -> Dict[str, Any]:
+    """Журнал для peer (только то, чего у него нет по его последнему журналу) в out_path."""
+    conn = connect(db_path)
+    try:
+        stats = _load_stats(stats_path)
+        if stats:
+            record_settings(conn, stats)
+        changes = changes_since(conn, peer_clock(conn, peer) if peer else None)
+    finally:
+        conn.close()
+    ing_stats.write_json_atomic(Path(out_path), json.dumps(changes, ensure_ascii=False, separators=(",", ":")))
+    return changes
+
+
+def import_file(db_path: Path, in_path: Path, stats_path: Optional[Path] = None) -> Dict[str, int]:
+    changes = json.loads(Path(in_path).read_text(encoding="utf-8"))
+    stats = _load_stats(stats_path)
+    conn = connect(db_path)
+    try:
+        result = apply_changes(conn, changes, stats)
+    finally:
+        conn.close()
+    if stats_path is not None and result["settings"]:
+        ing_stats.write_json_atomic(Path(stats_path), ing_stats.dump_stats(stats))
+    return result
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Источник слов для тренажёра без загрузки всего словаря в память.
+
+Протокол (его использует TrainerPage):
+    len(src)          — число слов;
+    src[i]            — {"id","ingush","russian","transcription"} слова с индексом i;
+    src.examples(i)   — [{"ing","rus"}, ...] примеры того же слова;
+    src.index_of(id)  — индекс слова по words.id (None, если такого нет);
+    src.contains(id)  — есть ли такое слово; дешевле index_of (у WordSource
+                        тот считает count(*) по всем меньшим id).
+
+WordSource читает слова из SQLite окнами по `window` строк вокруг текущего
+индекса и держит ограниченный LRU последних слов и примеров.
+ListWordSource — то же поверх готового списка (load_all_words).
+CompactWordSource — весь словарь в памяти, но столбцами: id в array('i'),
+строки — один буфер UTF-8 со смещениями, примеры слова — диапазон
+[ex_start[i], ex_start[i + 1]). Словари создаются только при обращении.
+"""
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import ing_metrics
+
+WORD_COLUMNS = "id, ingush, russian, transcription"
+
+
+def _row_to_word(row) -> Dict[str, Any]:
+    wid, ing, rus, tr = row
+    return {"id": wid, "ingush": ing, "russian": rus, "transcription": tr or ""}
+
+
+class ListWordSource:
+    def __init__(self, words: List[Dict[str, Any]]):
+        self._words = words
+        self._ids: Optional[set] = None
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        return self._words[i]
+
+    def examples(self, i: int) -> List[Dict[str, str]]:
+        return self._words[i].get("examples", [])
+
+    def index_of(self, word_id: int) -> Optional[int]:
+        for i, word in enumerate(self._words):
+            if word["id"] == word_id:
+                return i
+        return None
+
+    def contains(self, word_id: int) -> bool:
+        if self._ids is None:
+            self._ids = {word["id"] for word in self._words}
+        return word_id in self._ids
+
+    def close(self) -> None:
+        pass
+
+
+INTERN_MAX_LEN = 24   # короткие строки (слова, переводы, транскрипции) хранятся один раз
+
+
+class CompactWordSource:
+    """Протокол ing_words поверх столбцов; строится из строк (id, ingush, russian, transcription),
+    отсортированных по id, и примеров (word_id, ing, rus), отсортированных по (word_id, id)."""
+
+    def __init__(self, word_rows: Iterable[Tuple[int, str, str, Optional[str]]],
+                 example_rows: Iterable[Tuple[int, str, str]]):
+        self._ids = array("i")
+        self._word_str = array("I")   # по 3 на слово: ingush, russian, transcription
+        self._ex_str = array("I")     # по 2 на пример: ing, rus
+        self._ex_start = array("I", [0])
+        self._buf = bytearray()
+        self._offsets = array("I", [0])
+        interned: Dict[str, int] = {}
+        buf, offsets = self._buf, self._offsets
+
+        def put(text: Optional[str]) -> int:
+            k = interned.get(text)
+            if k is None:
+                k = len(offsets) - 1
+                buf.extend((text or "").encode("utf-8"))
+                offsets.append(len(buf))
+                if text is None or len(text) <= INTERN_MAX_LEN:
+                    interned[text] = k
+            return k
+
+        ids, word_str, ex_str, ex_start = self._ids, self._word_str, self._ex_str, self._ex_start
+        examples = iter(example_rows)
+        pending = next(examples, None)
+        for wid, ing, rus, tr in word_rows:
+            ids.append(wid)
+            word_str.extend((put(ing), put(rus), put(tr)))
+            while pending is not None and pending[0] < wid:   # примеры без слова пропускаем
+                pending = next(examples, None)
+            while pending is not None and pending[0] == wid:
+                ex_str.extend((put(pending[1]), put(pending[2])))
+                pending = next(examples, None)
+            ex_start.append(len(ex_str) // 2)
+        self._buf = bytes(buf)
+
+    def _text(self, k: int) -> str:
+        return self._buf[self._offsets[k]:self._offsets[k + 1]].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += len(self._ids)
+        if not 0 <= i < len(self._ids):
+            raise IndexError(i)
+        s = self._word_str
+        return {"id": self._ids[i], "ingush": self._text(s[3 * i]), "russian": self._text(s[3 * i + 1]),
+                "transcription": self._text(s[3 * i + 2])}
+
+    def examples(self, i: int) -> List[Dict[str, str]]:
+        if i < 0:
+            i += len(self._ids)
+        s = self._ex_str
+        return [{"ing": self._text(s[2 * k]), "rus": self._text(s[2 * k + 1])}
+                for k in range(self._ex_start[i], self._ex_start[i + 1])]
+
+    def index_of(self, word_id: int) -> Optional[int]:
+        i = bisect_left(self._ids, word_id)
+        return i if i < len(self._ids) and self._ids[i] == word_id else None
+
+    def contains(self, word_id: int) -> bool:
+        return self.index_of(word_id) is not None
+
+    def nbytes(self) -> int:
+        """Сколько занимают столбцы и буфер строк."""
+        columns = (self._ids, self._word_str, self._ex_str, self._ex_start, self._offsets)
+        return len(self._buf) + sum(a.itemsize * len(a) for a in columns)
+
+    def close(self) -> None:
+        pass
+
+
+class WordSource:
+    def __init__(self, connect: Callable[[], Any], window: int = 64, cache_size: int = 512):
+        self._conn = connect()
+        self.window = max(1, window)
+        self.cache_size = max(self.window * 2, cache_size)
+        self._words: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._examples: "OrderedDict[int, List[Dict[str, str]]]" = OrderedDict()
+        self._len: Optional[int] = None
+        self.queries = 0
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = self._conn.execute("SELECT count(*) FROM words").fetchone()[0]
+        return self._len
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        word = self._words.get(i)
+        if word is None:
+            self._fetch_window(i)
+            word = self._words[i]
+        self._words.move_to_end(i)
+        return word
+
+    def examples(self, i: int) -> List[Dict[str, str]]:
+        wid = self[i]["id"]
+        exs = self._examples.get(wid)
+        if exs is None:
+            self.queries += 1
+            ing_metrics.count("db.queries")
+            exs = [{"ing": ing, "rus": rus} for ing, rus in self._conn.execute(
+                "SELECT ing, rus FROM examples WHERE word_id = ? ORDER BY id", (wid,))]
+            self._examples[wid] = exs
+            if len(self._examples) > self.cache_size:
+                self._examples.popitem(last=False)
+        self._examples.move_to_end(wid)
+        return exs
+
+    def index_of(self, word_id: int) -> Optional[int]:
+        ing_metrics.count("db.queries")
+        if self._conn.execute("SELECT 1 FROM words WHERE id = ?", (word_id,)).fetchone() is None:
+            return None
+        return self._conn.execute("SELECT count(*) FROM words WHERE id < ?", (word_id,)).fetchone()[0]
+
+    def contains(self, word_id: int) -> bool:
+        ing_metrics.count("db.queries")
+        return self._conn.execute("SELECT 1 FROM words WHERE id = ?", (word_id,)).fetchone() is not None
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _fetch_window(self, i: int) -> None:
+        # Шаг вперёд/назад от уже загруженного соседа — keyset по id (без OFFSET).
+        self.queries += 1
+        ing_metrics.count("db.queries")
+        prev, nxt = self._words.get(i - 1), self._words.get(i + 1)
+        if prev is not None:
+            rows = self._conn.execute(
+                f"SELECT {WORD_COLUMNS} FROM words WHERE id > ? ORDER BY id LIMIT ?",
+                (prev["id"], self.window)).fetchall()
+            start = i
+        elif nxt is not None:
+            rows = self._conn.execute(
+                f"SELECT {WORD_COLUMNS} FROM words WHERE id < ? ORDER BY id DESC LIMIT ?",
+                (nxt["id"], self.window)).fetchall()
+            rows.reverse()
+            start = i - len(rows) + 1
+        else:
+            start = max(0, i - self.window // 4)
+            rows = self._conn.execute(
+                f"SELECT {WORD_COLUMNS} FROM words ORDER BY id LIMIT ? OFFSET ?",
+                (self.window, start)).fetchall()
+        for offset, row in enumerate(rows):
+            self._words[start + offset] = _row_to_word(row)
+            self._words.move_to_end(start + offset)
+        while len(self._words) > self.cache_size:
+            self._words.popitem(last=False)
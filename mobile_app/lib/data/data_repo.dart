@@ -13,6 +13,13 @@ class DataRepo {
   List<WordItem>? _wordsCache;
   Map<int, List<ExampleItem>>? _examplesByWordId;
 
+  // examples.json from the exporter is grouped by word and carries
+  // word_offsets aligned with words.json: the examples of word i are
+  // _examples[_wordOffsets[i].._wordOffsets[i + 1]). Older files have no
+  // offsets and fall back to _examplesByWordId.
+  List<ExampleItem>? _examples;
+  List<int>? _wordOffsets;
+
   Future<List<WordItem>> getWords() async {
     if (_wordsCache != null) {
       return _wordsCache!;
@@ -36,15 +43,43 @@ class DataRepo {
   }
 
   Future<List<ExampleItem>> getExamplesForWord(int wordId) async {
-    if (_examplesByWordId == null) {
+    if (_examplesByWordId == null && _wordOffsets == null) {
       await _loadExamplesIndex();
     }
-    return _examplesByWordId![wordId] ?? <ExampleItem>[];
+    final List<int>? offsets = _wordOffsets;
+    if (offsets == null) {
+      return _examplesByWordId![wordId] ?? <ExampleItem>[];
+    }
+    final int position = _wordPosition(_wordsCache!, wordId);
+    if (position < 0) {
+      return <ExampleItem>[];
+    }
+    return _examples!.sublist(offsets[position], offsets[position + 1]);
+  }
+
+  // words.json is ordered by id, so a word's position is a binary search.
+  int _wordPosition(List<WordItem> words, int wordId) {
+    int lo = 0;
+    int hi = words.length - 1;
+    while (lo <= hi) {
+      final int mid = (lo + hi) >> 1;
+      final int id = words[mid].id;
+      if (id == wordId) {
+        return mid;
+      }
+      if (id < wordId) {
+        lo = mid + 1;
+      } else {
+        hi = mid - 1;
+      }
+    }
+    return -1;
   }
 
   Future<List<T>> _loadItems<T>({
     required String path,
     required T Function(Map<String, dynamic> json) mapper,
+    void Function(Map<String, dynamic> payload)? onPayload,
   }) async {
     try {
       final String raw = await rootBundle.loadString(path);
@@ -52,6 +87,7 @@ class DataRepo {
       if (decoded is Map<String, dynamic>) {
         final Object? items = decoded['items'];
         if (items is List) {
+          onPayload?.call(decoded);
           return items
               .whereType<Map<String, dynamic>>()
               .map(mapper)
@@ -75,11 +111,30 @@ class DataRepo {
 
   Future<void> _loadExamplesIndex() async {
     try {
+      List<int>? offsets;
       final List<ExampleItem> examples = await _loadItems(
         path: 'assets/db/examples.json',
         mapper: _mapExample,
+        onPayload: (Map<String, dynamic> payload) {
+          final Object? value = payload['word_offsets'];
+          if (value is List) {
+            offsets = value.map(_readInt).toList(growable: false);
+          }
+        },
       );
       await _logLoaded('examples', examples);
+      if (offsets != null) {
+        final List<WordItem> words = await getWords();
+        if (offsets!.length == words.length + 1 &&
+            offsets!.last == examples.length) {
+          _examples = examples;
+          _wordOffsets = offsets;
+          return;
+        }
+        await AppLog.instance.add(
+          'DataRepo: word_offsets do not match words.json, indexing examples.',
+        );
+      }
       final Map<int, List<ExampleItem>> index = <int, List<ExampleItem>>{};
       for (final ExampleItem example in examples) {
         index.putIfAbsent(example.wordId, () => <ExampleItem>[]).add(example);
@@ -0,0 +1,40 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+import ing_crypto
+import ing_db
+
+pytestmark = pytest.mark.skipif(not ing_crypto.AVAILABLE, reason="pysqlcipher3/sqlcipher3 is not installed")
+
+SHIPPED_DB = Path(__file__).resolve().parents[1] / "mobile_app" / "ing_base.db"
+KEY = "test-key"
+
+
+@pytest.fixture
+def fixture_dbs(tmp_path: Path):
+    plain = tmp_path / "plain.db"
+    shutil.copyfile(SHIPPED_DB, plain)
+    encrypted = ing_crypto.encrypt_copy(plain, tmp_path / "encrypted.db", KEY)
+    yield plain, encrypted
+    ing_crypto.close_all()
+
+
+def test_snapshot_matches_plaintext(fixture_dbs):
+    plain, encrypted = fixture_dbs
+    assert ing_crypto.is_encrypted(encrypted) and not ing_crypto.is_encrypted(plain)
+    snap = ing_crypto.open_snapshot(encrypted, KEY)
+    assert ing_crypto.open_snapshot(encrypted, KEY) is snap
+    words = ing_db.load_all_words(plain, connect=snap.connect)
+    assert words and words == ing_db.load_all_words(plain)
+
+
+def test_wrong_key_fails_cleanly(fixture_dbs):
+    _, encrypted = fixture_dbs
+    with pytest.raises(ing_crypto.sqlcipher.DatabaseError):
+        ing_crypto.connect_encrypted(encrypted, "wrong")
+    with pytest.raises(ing_crypto.sqlcipher.DatabaseError):
+        ing_crypto.open_snapshot(encrypted, "wrong")
+    assert Path(encrypted).resolve() not in ing_crypto._snapshots   # no half-built snapshot is cached
+    assert ing_crypto.open_snapshot(encrypted, KEY).connect().execute("SELECT count(*) FROM words").fetchone()[0]
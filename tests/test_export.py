@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+import export_ing_db_to_json as exporter
+from synth import make_db
+
+OUTPUTS = ["words.json", "examples.json", exporter.OUTPUT_PATH.name, exporter.BUNDLE_NAME]
+
+
+@pytest.fixture(scope="module")
+def source(tmp_path_factory) -> Path:
+    return make_db(tmp_path_factory.mktemp("src") / "synth.db", 3_000)
+
+
+def test_jobs_output_is_byte_identical(source: Path, tmp_path: Path):
+    # Shards are cut by id range; odd chunk sizes make chunk and shard edges disagree.
+    serial, sharded = tmp_path / "jobs1", tmp_path / "jobs3"
+    exporter.export_db(serial, source, bundle=True, jobs=1, chunk_size=97)
+    report = exporter.export_db(sharded, source, bundle=True, jobs=3, chunk_size=97)
+    assert set(report) == set(OUTPUTS)
+    for name in OUTPUTS:
+        assert (sharded / name).read_bytes() == (serial / name).read_bytes(), name
+
+
+def test_shard_rejects_a_changed_source(source: Path):
+    exporter._init_worker(str(source))
+    try:
+        stale = {"words": {"rows": 1, "max_id": 1}}
+        with pytest.raises(RuntimeError, match="changed during export"):
+            exporter._shard_task("seed", "words", [], None, None, None, stale, 100)
+    finally:
+        exporter._worker_conn.close()
+        exporter._worker_conn = None
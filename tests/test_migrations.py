@@ -0,0 +1,49 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import ing_migrations
+from synth import make_db
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    (tmp_path / "src").mkdir()
+    return make_db(tmp_path / "src" / "ing_base.db", 500)
+
+
+def test_cache_survives_a_new_mtime(source: Path, tmp_path: Path):
+    cache = tmp_path / "cache"
+    target = ing_migrations.ensure_migrated(source, cache)
+    assert target != source and ing_migrations._file_version(target) == ing_migrations.SCHEMA_VERSION
+    migrated_ns = target.stat().st_mtime_ns
+    os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 10**9))   # like a fresh _MEIPASS
+    assert ing_migrations.ensure_migrated(source, cache) == target
+    assert target.stat().st_mtime_ns == migrated_ns   # not copied and migrated again
+
+    with sqlite3.connect(source) as conn:
+        conn.execute("UPDATE words SET russian = 'другое' WHERE id = 1")
+    conn.close()
+    ing_migrations.ensure_migrated(source, cache)
+    check = ing_migrations.connect_readonly(target)
+    assert check.execute("SELECT russian FROM words WHERE id = 1").fetchone()[0] == "другое"
+    check.close()
+
+
+def test_failed_step_leaves_schema_untouched(source: Path, monkeypatch):
+    def broken(conn):
+        conn.execute("CREATE INDEX idx_broken ON words(russian)")
+        raise RuntimeError("step failed")
+
+    first = ing_migrations.MIGRATIONS[0]
+    monkeypatch.setattr(ing_migrations, "MIGRATIONS", [first, (first[0] + 1, broken)])
+    conn = sqlite3.connect(source)
+    try:
+        with pytest.raises(RuntimeError):
+            ing_migrations.migrate(conn)
+        assert ing_migrations.get_version(conn) == first[0]   # the first step committed on its own
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_broken'").fetchone() is None
+    finally:
+        conn.close()
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+import ing_server
+from synth import make_db
+
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("server")
+    svc = ing_server.DictionaryService(make_db(tmp / "dict.db", 50), tmp / "data", pool_size=2)
+    yield svc
+    svc.close()
+
+
+def _get(svc, target: str, if_none_match: str = ""):
+    headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return asyncio.run(svc.respond("GET", target, headers))
+
+
+def test_parse_if_none_match():
+    assert ing_server.parse_if_none_match('W/"a", "b"') == (False, {'"a"', '"b"'})
+    assert ing_server.parse_if_none_match(" * ") == (True, set())
+    assert ing_server.parse_if_none_match('"unterminated') == (False, set())
+
+
+@pytest.mark.parametrize("target", ["/version", "/words/3"])
+def test_conditional_get(service, target: str):
+    status, headers, body = _get(service, target)
+    etag = headers["ETag"]
+    assert status == 200 and body
+    assert _get(service, target, etag)[0] == 304
+    assert _get(service, target, f'"other", W/{etag}')[0] == 304
+    assert _get(service, target, "*")[0] == 304
+    assert _get(service, target, '"' + etag.strip('"')[:-1] + '"')[0] == 200   # a prefix is not a match
+    assert _get(service, target, '"x' + etag.strip('"') + '"')[0] == 200   # neither is a superstring
+
+
+def test_star_does_not_hide_a_missing_word(service):
+    with pytest.raises(ing_server.HttpError) as e:
+        _get(service, "/words/999999", "*")
+    assert e.value.status == 404
@@ -0,0 +1,94 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import ing_progress
+import ing_scheduler
+import ing_session
+import ing_words
+
+N_WORDS = 5
+START_MS = 1_700_000_000_000
+
+
+@pytest.fixture
+def session(tmp_path: Path):
+    words = ing_words.CompactWordSource([(i, f"w{i}", f"r{i}", "") for i in range(1, N_WORDS + 1)], [])
+    progress = ing_progress.ProgressLog(tmp_path / "progress.db")
+    scheduler = ing_scheduler.Scheduler(tmp_path / "progress.db")
+    clock = [START_MS]
+    s = ing_session.Session(words, progress, scheduler, clock=lambda: clock[0])
+    s.tick = lambda ms: clock.__setitem__(0, clock[0] + ms)
+    yield s
+    progress.close()
+    scheduler.close()
+
+
+def test_remaining_counts_words_not_reviews(session):
+    session.dont()
+    first = session.current()["id"]
+    session.advance()
+    session.tick(ing_scheduler.RELEARN_MS)
+    session.know()
+    assert session.current()["id"] == first   # the due relearn card comes before new words
+    session.know()
+    s = session.summary()
+    assert s["done"] == 3 and s["remaining"] == N_WORDS - 2 and s["relearn"] == 0
+
+
+def test_finished_waits_for_relearn_cards(session):
+    session.dont()
+    session.advance()
+    while session.current() is not None:
+        session.know()
+    assert not session.finished and session.summary()["relearn"] == 1
+    assert session.relearn_due() == START_MS + ing_scheduler.RELEARN_MS
+    assert not session.poll()   # not due yet
+    session.tick(ing_scheduler.RELEARN_MS)
+    assert session.poll()
+    session.know()
+    assert session.current() is None and session.finished
+    assert session.summary()["remaining"] == 0
+
+
+def test_relearn_checks_use_membership_not_position(tmp_path: Path):
+    conn = sqlite3.connect(tmp_path / "dict.db")
+    conn.execute("CREATE TABLE words (id INTEGER PRIMARY KEY, ingush TEXT, russian TEXT, transcription TEXT)")
+    conn.execute("CREATE TABLE examples (id INTEGER PRIMARY KEY, word_id INTEGER, ing TEXT, rus TEXT)")
+    conn.executemany("INSERT INTO words VALUES (?, ?, ?, '')", [(i, f"w{i}", f"r{i}") for i in range(1, 21)])
+    conn.commit()
+    conn.close()
+    words = ing_words.WordSource(lambda: sqlite3.connect(tmp_path / "dict.db"))
+    progress = ing_progress.ProgressLog(tmp_path / "progress.db")
+    scheduler = ing_scheduler.Scheduler(tmp_path / "progress.db")
+    s = ing_session.Session(words, progress, scheduler, clock=lambda: START_MS)
+    try:
+        for _ in range(5):
+            s.dont()
+            s.advance()
+        positional = []
+        words.index_of = lambda wid: positional.append(wid)   # count(*) per call: must stay off this path
+        assert not s.finished and s.summary()["relearn"] == 5
+        assert s.relearn_due() == START_MS + ing_scheduler.RELEARN_MS
+        assert positional == []
+        assert words.contains(1) and not words.contains(999)
+    finally:
+        progress.close()
+        scheduler.close()
+        words.close()
+
+
+def test_due_cards_from_other_packs_do_not_block(session):
+    for foreign in (100, 101):   # reviewed under another pack selection, due long ago
+        session.scheduler.grade(foreign, 0, START_MS - 2 * ing_scheduler.RELEARN_MS)
+    session.dont()
+    session.advance()
+    while session.current() is not None:
+        session.know()
+    assert session.summary()["relearn"] == 1
+    session.tick(ing_scheduler.RELEARN_MS)
+    assert session.poll() and session.current()["id"] == 1
+    assert session.upcoming(4)[0] == []
+    session.know()
+    assert session.finished
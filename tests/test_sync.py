@@ -0,0 +1,101 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import ing_analytics
+import ing_progress
+import ing_scheduler
+import ing_stats
+import ing_sync
+
+START_MS = 1_700_000_000_000
+
+
+class Replica:
+    def __init__(self, folder: Path, font_size: int):
+        self.db, self.stats = folder / "progress.db", folder / "stats.json"
+        ing_stats.write_json_atomic(self.stats, ing_stats.dump_stats({"user_name": folder.name,
+                                                                      "example_font_size": font_size}))
+        conn = ing_sync.connect(self.db)
+        self.replica = ing_sync.replica_id(conn)
+        conn.close()
+
+    def answer(self, answers):
+        progress, scheduler = ing_progress.ProgressLog(self.db), ing_scheduler.Scheduler(self.db)
+        for word_id, ts, know in answers:
+            progress.record(word_id, ing_progress.OUTCOME_KNOW if know else ing_progress.OUTCOME_DONT, 900, ts=ts)
+            scheduler.grade(word_id, ing_scheduler.GRADE_KNOW if know else ing_scheduler.GRADE_DONT, ts)
+        progress.close()
+        scheduler.close()
+
+    def send(self, other: "Replica", out: Path) -> Path:
+        ing_sync.export_file(self.db, out, self.stats, peer=other.replica)
+        return out
+
+    def state(self):
+        conn = ing_sync.connect(self.db)
+        try:
+            reviews = sorted(conn.execute("SELECT word_id, ts, outcome, latency_ms FROM reviews"))
+            cards = conn.execute("SELECT * FROM cards ORDER BY word_id").fetchall()
+        finally:
+            conn.close()
+        settings = json.loads(self.stats.read_text(encoding="utf-8"))
+        return reviews, cards, {key: settings.get(key) for key in ing_sync.SETTINGS_KEYS}
+
+
+@pytest.fixture
+def pair(tmp_path: Path):
+    a, b = Replica(tmp_path / "a", 14), Replica(tmp_path / "b", 20)
+    # b answers the same words later in time, but its rows land in a's progress.db with larger ids
+    a.answer([(1, START_MS + 50_000, True), (2, START_MS + 60_000, False), (3, START_MS + 70_000, True)])
+    b.answer([(1, START_MS + 10_000, False), (2, START_MS + 20_000, True), (4, START_MS + 30_000, True)])
+    return a, b
+
+
+def test_round_trip_converges(pair, tmp_path: Path):
+    a, b = pair
+    to_b, to_a = a.send(b, tmp_path / "a_to_b.json"), b.send(a, tmp_path / "b_to_a.json")
+    assert ing_sync.import_file(b.db, to_b, b.stats)["reviews"] == 3
+    assert ing_sync.import_file(a.db, to_a, a.stats)["reviews"] == 3
+    first = a.state()
+    assert first == b.state()
+    assert len(first[0]) == 6 and [card[0] for card in first[1]] == [1, 2, 3, 4]
+
+    # the same logs again, in the other order: nothing changes
+    assert ing_sync.import_file(a.db, to_a, a.stats)["reviews"] == 0
+    assert ing_sync.import_file(b.db, to_b, b.stats)["reviews"] == 0
+    assert a.state() == b.state() == first
+
+
+def test_delta_is_empty_once_in_sync(pair, tmp_path: Path):
+    a, b = pair
+    ing_sync.import_file(b.db, a.send(b, tmp_path / "1.json"), b.stats)
+    ing_sync.import_file(a.db, b.send(a, tmp_path / "2.json"), a.stats)
+    ing_sync.import_file(b.db, a.send(b, tmp_path / "3.json"), b.stats)
+    assert not ing_sync.export_file(b.db, tmp_path / "4.json", b.stats, peer=a.replica)["reviews"]
+
+
+def test_setting_edited_on_one_side_wins(pair, tmp_path: Path):
+    a, b = pair
+    stats = json.loads(a.stats.read_text(encoding="utf-8"))
+    store = ing_stats.StatsStore(a.stats, stats, stamped=ing_stats.SETTINGS_KEYS)
+    stats["user_name"] = "Мадина"
+    store.mark_dirty()
+    assert store.flush() and ing_stats.settings_ts(stats, "user_name") > 0
+    # b never touched its name: syncing later must not make its default the newest edit
+    to_a = b.send(a, tmp_path / "b_to_a.json")
+    to_b = a.send(b, tmp_path / "a_to_b.json")
+    ing_sync.import_file(a.db, to_a, a.stats)
+    ing_sync.import_file(b.db, to_b, b.stats)
+    assert a.state()[2]["user_name"] == b.state()[2]["user_name"] == "Мадина"
+    assert a.state() == b.state()
+
+
+@pytest.mark.skipif(not ing_analytics.AVAILABLE, reason="numpy is not installed")
+def test_history_is_in_time_order_after_sync(pair, tmp_path: Path):
+    a, b = pair
+    ing_sync.import_file(a.db, b.send(a, tmp_path / "b_to_a.json"), a.stats)
+    h = ing_analytics.load_history(a.db, 0, tmp_path / "history.npy")
+    same_word = h.word_id[1:] == h.word_id[:-1]
+    assert same_word.any() and (h.ts[1:][same_word] >= h.ts[:-1][same_word]).all()
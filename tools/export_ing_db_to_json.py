@@ -1,15 +1,45 @@
 #!/usr/bin/env python3
+import argparse
+import hashlib
 import json
+import os
 import sqlite3
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_migrations  # noqa: E402
+from ing_bundle import bundle_from_db  # noqa: E402
+
 DB_CANDIDATES = [
     ROOT / "ing_base.db",
     ROOT / "mobile_app" / "assets" / "db" / "ing_base.db",
+    ROOT / "mobile_app" / "ing_base.db",
 ]
-OUTPUT_PATH = ROOT / "mobile_app" / "assets" / "db" / "seed.json"
+OUTPUT_DIR = ROOT / "mobile_app" / "assets" / "db"
+OUTPUT_PATH = OUTPUT_DIR / "seed.json"
+BUNDLE_NAME = "ing_bundle.bin"
+STATE_NAME = ".export_state.json"  # machine-local (source mtime, hashes); kept out of git via .gitignore
+# Bumped whenever the file layouts change, so stale outputs are not "skipped".
+LAYOUT_VERSION = 2
+CHUNK_SIZE = 1000
+
+# Layouts read by mobile_app/lib/data/data_repo.dart.
+TABLE_EXPORTS = {
+    "words.json": ("words", ["id", "seq", "ingush", "russian", "transcription"]),
+    "examples.json": ("examples", ["id", "word_id", "ing", "rus"]),
+}
+# examples.json is grouped by word, (word_id, id) order, and carries OFFSETS_KEY
+# aligned with the words.json items: the examples of word i are
+# items[word_offsets[i]:word_offsets[i + 1]], so the client needs no index of its own.
+GROUP_COLUMNS = {"examples": "word_id"}
+OFFSETS_KEY = "word_offsets"
+OFFSETS_PER_LINE = 1000
 
 
 def _table_columns(cursor: sqlite3.Cursor, table: str) -> list[str]:
@@ -24,7 +54,193 @@ def _pick_first(columns: list[str], candidates: list[str]) -> str | None:
     return None
 
 
-def _load_words(cursor: sqlite3.Cursor) -> list[dict]:
+def _has_table(cursor: sqlite3.Cursor, table: str) -> bool:
+    return cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,)
+    ).fetchone() is not None
+
+
+def _iter_rows(cursor: sqlite3.Cursor, sql: str, chunk_size: int, params: tuple = ()) -> Iterator[tuple]:
+    cursor.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
+
+
+class _HashingWriter:
+    def __init__(self, handle):
+        self._handle = handle
+        self.digest = hashlib.sha256()
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self.digest.update(data)
+        self._handle.write(data)
+
+    def write_bytes(self, data: bytes) -> None:
+        self.digest.update(data)
+        self._handle.write(data)
+
+
+_encode_scalar = json.JSONEncoder(ensure_ascii=False).encode
+_encode_str = json.encoder.encode_basestring
+
+
+def _format_json(value, indent: str) -> str:
+    # json.dumps(indent=2) goes through the pure-Python encoder; this emits the
+    # same text but leaves scalars to the C encoder.
+    kind = type(value)
+    if kind is str:
+        return _encode_str(value)
+    if kind is int:
+        return int.__repr__(value)
+    if kind is dict:
+        if not value:
+            return "{}"
+        inner = indent + "  "
+        body = ",\n".join(
+            f"{inner}{_encode_str(str(key))}: {_format_json(item, inner)}" for key, item in value.items()
+        )
+        return "{\n" + body + "\n" + indent + "}"
+    if kind is list or kind is tuple:
+        if not value:
+            return "[]"
+        inner = indent + "  "
+        return "[\n" + ",\n".join(inner + _format_json(item, inner) for item in value) + "\n" + indent + "]"
+    return _encode_scalar(value)
+
+
+def _write_items(out: _HashingWriter, items: Iterator[dict], indent: str) -> bool:
+    # Same bytes as json.dump(..., ensure_ascii=False, indent=2) for the list body.
+    wrote = False
+    for item in items:
+        out.write(("\n" if not wrote else ",\n") + indent + _format_json(item, indent))
+        wrote = True
+    return wrote
+
+
+def _payload_head(source_table: str, count: int) -> str:
+    return (
+        "{\n"
+        f'  "source_table": {json.dumps(source_table, ensure_ascii=False)},\n'
+        f'  "count_exported": {count},\n'
+        '  "items": ['
+    )
+
+
+def _payload_tail(out: _HashingWriter, wrote: bool, offsets: Iterator[int] | None) -> None:
+    out.write("\n  ]" if wrote else "]")
+    if offsets is not None:
+        # Compact rows of ints: one value per line would multiply the file size.
+        out.write(f',\n  "{OFFSETS_KEY}": [')
+        line: list[str] = []
+        first = True
+        for offset in offsets:
+            line.append(int.__repr__(offset))
+            if len(line) == OFFSETS_PER_LINE:
+                out.write(("\n    " if first else ",\n    ") + ", ".join(line))
+                first, line = False, []
+        if line:
+            out.write(("\n    " if first else ",\n    ") + ", ".join(line))
+        out.write("\n  ]")
+    out.write("\n}\n")
+
+
+def _write_payload(
+    out: _HashingWriter, source_table: str, count: int, items: Iterator[dict], offsets: Iterator[int] | None = None
+) -> int:
+    out.write(_payload_head(source_table, count))
+    written = 0
+
+    def counted():
+        nonlocal written
+        for item in items:
+            written += 1
+            yield item
+
+    _payload_tail(out, _write_items(out, counted(), "    "), offsets)
+    return written
+
+
+def _write_list(out: _HashingWriter, items: Iterator[dict]) -> None:
+    out.write("[")
+    out.write("\n]" if _write_items(out, items, "  ") else "]")
+
+
+def _id_range(column: str, lo: int | None, hi: int | None) -> tuple[list[str], tuple]:
+    # Shard bounds: lo <= column < hi, None leaves that side open.
+    conditions, params = [], []
+    if lo is not None:
+        conditions.append(f"{column} >= ?")
+        params.append(lo)
+    if hi is not None:
+        conditions.append(f"{column} < ?")
+        params.append(hi)
+    return conditions, tuple(params)
+
+
+def _where(conditions: list[str]) -> str:
+    return f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+def _iter_table_items(
+    cursor: sqlite3.Cursor,
+    table: str,
+    wanted: list[str],
+    chunk_size: int,
+    lo: int | None = None,
+    hi: int | None = None,
+    group: str | None = None,
+):
+    # group: rows come out grouped by that column (then by id) and lo/hi apply to it.
+    columns = [c for c in wanted if c in _table_columns(cursor, table)]
+    order = "id" if "id" in columns else "rowid"
+    conditions, params = _id_range(group or order, lo, hi)
+    sql = f"SELECT {', '.join(columns)} FROM {table}{_where(conditions)} ORDER BY {group + ', ' if group else ''}{order}"
+    for row in _iter_rows(cursor, sql, chunk_size, params):
+        yield dict(zip(columns, row))
+
+
+def _iter_word_offsets(conn: sqlite3.Connection, chunk_size: int) -> Iterator[int]:
+    # Start of every word's group in the (word_id, id)-ordered examples, then the
+    # total; merge-joins word ids with per-word counts from idx_examples_word_id.
+    cursor = conn.cursor()
+    order = "id" if "id" in _table_columns(cursor, "words") else "rowid"
+    total = cursor.execute("SELECT count(*) FROM examples WHERE word_id IS NULL").fetchone()[0]  # NULLs sort first
+    words = _iter_rows(cursor, f"SELECT {order} FROM words ORDER BY {order}", chunk_size)
+    groups = _iter_rows(
+        conn.cursor(),
+        "SELECT word_id, count(*) FROM examples WHERE word_id IS NOT NULL GROUP BY word_id ORDER BY word_id",
+        chunk_size,
+    )
+    pending = next(groups, None)
+    for (word_id,) in words:
+        # Examples of a missing word (the foreign key rules them out) would fall into the previous range.
+        while pending is not None and pending[0] < word_id:
+            total += pending[1]
+            pending = next(groups, None)
+        yield total
+        if pending is not None and pending[0] == word_id:
+            total += pending[1]
+            pending = next(groups, None)
+    while pending is not None:
+        total += pending[1]
+        pending = next(groups, None)
+    yield total
+
+
+def _iter_seed_entries(
+    conn: sqlite3.Connection,
+    chunk_size: int,
+    lo: int | None = None,
+    hi: int | None = None,
+) -> Iterator[dict]:
+    # Seed layout: one entry per word with all of its examples ("example" keeps the
+    # first one for older clients), merge-joined over two cursors ordered by word
+    # id so memory stays at one chunk per cursor.
+    cursor = conn.cursor()
     columns = _table_columns(cursor, "words")
     word_id = _pick_first(columns, ["id", "word_id", "wordId"])
     word_col = _pick_first(columns, ["ingush", "word", "ing"])
@@ -32,12 +248,38 @@ def _load_words(cursor: sqlite3.Cursor) -> list[dict]:
     transcription_col = _pick_first(columns, ["transcription"])
     select_cols = [c for c in [word_id, word_col, translation_col, transcription_col] if c]
     if not select_cols:
-        return []
-    rows = cursor.execute(
-        f"SELECT {', '.join(select_cols)} FROM words"
-    ).fetchall()
-    entries = []
-    for row in rows:
+        return
+    order = word_id or "rowid"
+    conditions, params = _id_range(order, lo, hi)
+    words = _iter_rows(
+        cursor,
+        f"SELECT {', '.join(select_cols)} FROM words{_where(conditions)} ORDER BY {order}",
+        chunk_size,
+        params,
+    )
+
+    examples: Iterator[tuple] = iter(())
+    ex_cols: list[str] = []
+    ex_word_id = ex_ing = ex_rus = None
+    if _has_table(cursor, "examples"):
+        columns = _table_columns(cursor, "examples")
+        ex_word_id = _pick_first(columns, ["word_id", "wordId", "wordid", "id"])
+        ex_ing = _pick_first(columns, ["ing", "ingush", "example"])
+        ex_rus = _pick_first(columns, ["rus", "russian", "translation"])
+        ex_cols = [c for c in [ex_word_id, ex_ing, ex_rus] if c]
+        if ex_word_id is not None:
+            conditions, params = _id_range(ex_word_id, lo, hi)
+            examples = _iter_rows(
+                conn.cursor(),
+                f"SELECT {', '.join(ex_cols)} FROM examples"
+                f"{_where([f'{ex_word_id} IS NOT NULL'] + conditions)} "
+                f"ORDER BY {ex_word_id}, rowid",
+                chunk_size,
+                params,
+            )
+    pending = next(examples, None)
+
+    for row in words:
         data = dict(zip(select_cols, row))
         entry = {
             "id": data.get(word_id),
@@ -46,39 +288,24 @@ def _load_words(cursor: sqlite3.Cursor) -> list[dict]:
         }
         if transcription_col:
             entry["transcription"] = data.get(transcription_col)
-        entries.append(entry)
-    return entries
-
-
-def _load_examples(cursor: sqlite3.Cursor) -> dict:
-    if not cursor.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='examples'"
-    ).fetchone():
-        return {}
-    columns = _table_columns(cursor, "examples")
-    word_id = _pick_first(columns, ["word_id", "wordId", "wordid", "id"])
-    example_ing = _pick_first(columns, ["ing", "ingush", "example"])
-    example_rus = _pick_first(columns, ["rus", "russian", "translation"])
-    select_cols = [c for c in [word_id, example_ing, example_rus] if c]
-    if not select_cols or word_id is None:
-        return {}
-    rows = cursor.execute(
-        f"SELECT {', '.join(select_cols)} FROM examples"
-    ).fetchall()
-    example_map: dict = {}
-    for row in rows:
-        data = dict(zip(select_cols, row))
-        key = data.get(word_id)
-        if key is None or key in example_map:
-            continue
-        example = {}
-        if example_ing:
-            example["ing"] = data.get(example_ing)
-        if example_rus:
-            example["rus"] = data.get(example_rus)
-        if example:
-            example_map[key] = example
-    return example_map
+        key = entry["id"]
+        found = []
+        while pending is not None and key is not None and pending[0] < key:
+            pending = next(examples, None)
+        while pending is not None and pending[0] == key:
+            row = dict(zip(ex_cols, pending))
+            example = {}
+            if ex_ing:
+                example["ing"] = row.get(ex_ing)
+            if ex_rus:
+                example["rus"] = row.get(ex_rus)
+            if example:
+                found.append(example)
+            pending = next(examples, None)
+        if found:
+            entry["example"] = found[0]
+            entry["examples"] = found
+        yield entry
 
 
 def _select_db_path() -> Path | None:
@@ -88,29 +315,271 @@ def _select_db_path() -> Path | None:
     return None
 
 
-def export_db() -> list[dict]:
-    db_path = _select_db_path()
+def _load_state(output_dir: Path) -> dict:
+    try:
+        return json.loads((output_dir / STATE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(output_dir: Path, state: dict) -> None:
+    path = output_dir / STATE_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _watermark(cursor: sqlite3.Cursor, table: str) -> dict:
+    if not _has_table(cursor, table):
+        return {"rows": 0, "max_id": None}
+    order = "id" if "id" in _table_columns(cursor, table) else "rowid"
+    rows, max_id = cursor.execute(f"SELECT count(*), max({order}) FROM {table}").fetchone()
+    return {"rows": rows, "max_id": max_id}
+
+
+def _source_fingerprint(db_path: Path) -> dict:
+    st = db_path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _export_file(path: Path, previous: dict, write) -> tuple[str, str]:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as handle:
+        out = _HashingWriter(handle)
+        write(out)
+    digest = out.digest.hexdigest()
+    if path.exists() and previous.get("sha256") == digest:
+        tmp.unlink()
+        return "unchanged", digest
+    os.replace(tmp, path)
+    return "written", digest
+
+
+# ---- --jobs N: shards by id range in a process pool ----
+
+_worker_conn: sqlite3.Connection | None = None
+
+
+def _init_worker(db_path: str) -> None:
+    global _worker_conn
+    _worker_conn = ing_migrations.connect_readonly(Path(db_path))
+
+
+def _format_shard(items: Iterator[dict], indent: str) -> tuple[str, int]:
+    parts = [indent + _format_json(item, indent) for item in items]
+    return ",\n".join(parts), len(parts)
+
+
+def _shard_task(
+    kind: str,
+    table: str,
+    wanted: list[str],
+    lo: int | None,
+    hi: int | None,
+    group: str | None,
+    marks: dict,
+    chunk_size: int,
+):
+    # Workers read outside the parent's snapshot: each shard re-checks the parent's
+    # watermarks inside its own read transaction before serialising anything.
+    conn = _worker_conn
+    cursor = conn.cursor()
+    cursor.execute("BEGIN")
+    try:
+        for name, mark in marks.items():
+            if _watermark(cursor, name) != mark:
+                raise RuntimeError(f"{name}: source database changed during export")
+        if kind == "table":
+            return _format_shard(_iter_table_items(cursor, table, wanted, chunk_size, lo, hi, group), "    ")
+        if kind == "seed":
+            return _format_shard(_iter_seed_entries(conn, chunk_size, lo, hi), "  ")
+        return bundle_from_db(conn, chunk_size)
+    finally:
+        conn.rollback()
+
+
+def _shard_bounds(cursor: sqlite3.Cursor, table: str, column: str | None, rows: int, shards: int) -> list[tuple]:
+    # Equal row counts per shard; cut points come from the same read snapshot as the watermarks.
+    if column is None or shards <= 1 or rows <= 1:
+        return [(None, None)]
+    cuts: list[int] = []
+    for k in range(1, shards):
+        row = cursor.execute(
+            f"SELECT {column} FROM {table} ORDER BY {column} LIMIT 1 OFFSET ?", (rows * k // shards,)
+        ).fetchone()
+        if row is not None and (not cuts or row[0] > cuts[-1]):
+            cuts.append(row[0])
+    edges = [None, *cuts, None]
+    return list(zip(edges, edges[1:]))
+
+
+def _write_shards(out: _HashingWriter, futures: list[Future]) -> tuple[bool, int]:
+    # Joins shard bodies exactly as _write_items joins single items.
+    wrote, total = False, 0
+    for future in futures:
+        text, count = future.result()
+        if count:
+            out.write(("\n" if not wrote else ",\n") + text)
+            wrote = True
+            total += count
+    return wrote, total
+
+
+def _merge_payload(
+    out: _HashingWriter, futures: list[Future], table: str, count: int, offsets: Iterator[int] | None = None
+) -> None:
+    out.write(_payload_head(table, count))
+    wrote, total = _write_shards(out, futures)
+    _payload_tail(out, wrote, offsets)
+    if total != count:
+        raise RuntimeError(f"{table}: row count changed during export")
+
+
+def _merge_list(out: _HashingWriter, futures: list[Future]) -> None:
+    out.write("[")
+    wrote, _ = _write_shards(out, futures)
+    out.write("\n]" if wrote else "]")
+
+
+def export_db(
+    output_dir: Path = OUTPUT_DIR,
+    db_path: Path | None = None,
+    migrate: bool = False,
+    force: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    bundle: bool = False,
+    jobs: int = 1,
+) -> dict[str, str]:
+    """Export words.json, examples.json and seed.json (and ing_bundle.bin when
+    bundle=True); returns {file name: status}.
+
+    Status is "skipped" (source and table watermark unchanged, file not read),
+    "unchanged" (re-serialised, identical hash, file left untouched) or "written".
+
+    With jobs > 1 every table is split into id ranges that worker processes
+    serialise over their own read-only connections; the shards are joined into
+    the same bytes the single-process path writes. The workers cannot share the
+    parent's read snapshot, so the source database must not be written during an
+    export: every shard checks the parent's row-count/max-id watermarks and the
+    export fails with RuntimeError on a mismatch (in-place updates that keep
+    both are not detected).
+    """
+    db_path = db_path or _select_db_path()
     if db_path is None:
-        return []
-    conn = sqlite3.connect(db_path)
+        return {}
+    if migrate:
+        ing_migrations.migrate_file(db_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    state = {} if force else _load_state(output_dir)
+    fingerprint = _source_fingerprint(db_path)
+    same_source = state.get("source") == fingerprint and state.get("layout") == LAYOUT_VERSION
+    outputs = state.get("outputs", {})
+    report: dict[str, str] = {}
+
+    conn = ing_migrations.connect_readonly(db_path)
     try:
         cursor = conn.cursor()
-        words = _load_words(cursor)
-        examples = _load_examples(cursor)
-        for entry in words:
-            entry_id = entry.get("id")
-            if entry_id in examples:
-                entry["example"] = examples[entry_id]
-        return words
+        cursor.execute("BEGIN")  # one read snapshot for counts and rows
+        marks = {table: _watermark(cursor, table) for table in ("words", "examples")}
+        # (name, watermark, serial writer, shard tasks, writer that merges the shards)
+        exports = []
+        for name, (table, wanted) in TABLE_EXPORTS.items():
+            if not _has_table(cursor, table):
+                continue
+            count = marks[table]["rows"]
+            group = GROUP_COLUMNS.get(table)
+            if group not in _table_columns(cursor, table) or not _has_table(cursor, "words"):
+                group = None
+            # The offsets follow the words.json order, so a grouped file also depends on words.
+            mark = {t: marks[t] for t in ("words", table)} if group else {table: marks[table]}
+
+            def offsets(group=group):
+                return _iter_word_offsets(conn, chunk_size) if group else None
+
+            def write(out, table=table, wanted=wanted, count=count, group=group, offsets=offsets):
+                items = _iter_table_items(conn.cursor(), table, wanted, chunk_size, group=group)
+                if _write_payload(out, table, count, items, offsets()) != count:
+                    raise RuntimeError(f"{table}: row count changed during export")
+
+            order = "id" if "id" in _table_columns(cursor, table) else "rowid"
+            tasks = [("table", table, wanted, lo, hi, group, mark)
+                     for lo, hi in _shard_bounds(cursor, table, group or order, count, jobs)]
+            merge = lambda out, futures, table=table, count=count, offsets=offsets: _merge_payload(
+                out, futures, table, count, offsets()
+            )
+            exports.append((name, mark, write, tasks, merge))
+        seed_key = _pick_first(_table_columns(cursor, "words"), ["id", "word_id", "wordId"])
+        exports.append((
+            OUTPUT_PATH.name,
+            marks,
+            lambda out: _write_list(out, _iter_seed_entries(conn, chunk_size)),
+            [("seed", "words", [], lo, hi, None, marks)
+             for lo, hi in _shard_bounds(cursor, "words", seed_key, marks["words"]["rows"], jobs)],
+            _merge_list,
+        ))
+        if bundle and all(_has_table(cursor, table) for table in ("words", "examples")):
+            # The string table is interned across the whole file, so the bundle is one task.
+            exports.append((
+                BUNDLE_NAME,
+                marks,
+                lambda out: out.write_bytes(bundle_from_db(conn, chunk_size)),
+                [("bundle", "", [], None, None, None, marks)],
+                lambda out, futures: out.write_bytes(futures[0].result()),
+            ))
+
+        pending = []
+        for name, mark, write, tasks, merge in exports:
+            path = output_dir / name
+            previous = outputs.get(name, {})
+            if same_source and previous.get("watermark") == mark and path.exists():
+                report[name] = "skipped"
+                continue
+            report[name] = ""
+            pending.append((name, mark, write, tasks, merge, path, previous))
+
+        pool = None
+        if jobs > 1 and pending:
+            pool = ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(str(db_path),))
+        try:
+            # Submit every shard of every file up front so tables and formats overlap.
+            shards = {name: [pool.submit(_shard_task, *task, chunk_size) for task in tasks]
+                      for name, _, _, tasks, _, _, _ in pending} if pool else {}
+            for name, mark, write, _, merge, path, previous in pending:
+                if pool:
+                    write = lambda out, merge=merge, futures=shards[name]: merge(out, futures)
+                report[name], digest = _export_file(path, previous, write)
+                outputs[name] = {"watermark": mark, "sha256": digest}
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+        conn.rollback()
     finally:
         conn.close()
 
+    _save_state(output_dir, {"layout": LAYOUT_VERSION, "source": fingerprint, "outputs": outputs})
+    return report
+
 
 def main() -> int:
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    data = export_db()
-    with OUTPUT_PATH.open("w", encoding="utf-8") as handle:
-        json.dump(data, handle, ensure_ascii=False, indent=2)
+    parser = argparse.ArgumentParser(description="Export ing_base.db to the mobile JSON assets")
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="upgrade the source database in place (indexes, ANALYZE) before exporting",
+    )
+    parser.add_argument("--db", type=Path, help="source database (default: first of DB_CANDIDATES)")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--force", action="store_true", help="ignore the export state and rewrite everything")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows fetched per cursor round-trip")
+    parser.add_argument("--bundle", action="store_true", help=f"also write the binary {BUNDLE_NAME}")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes; tables are split by id range")
+    args = parser.parse_args()
+    report = export_db(args.output_dir, args.db, args.migrate, args.force, args.chunk_size, args.bundle, args.jobs)
+    if not report:
+        print("No source database found.", file=sys.stderr)
+        return 1
+    for name, status in report.items():
+        print(f"{name}: {status}")
     return 0
 
 
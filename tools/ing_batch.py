@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Run many trainer sessions headlessly (classroom server, load tests).
+
+Every learner gets its own progress store under OUTPUT/learners/<id>/
+(progress.db + stats.json, the same files the desktop app keeps in its data
+dir) and is driven through ing_session.Session, the engine behind the
+TrainerPage. Learners are spread over a multiprocessing pool; each worker
+opens the dictionary once, read-only, and shares it between all of its
+learners (the OS page cache shares it between workers).
+
+Learners are either simulated (per-learner ability, per-word difficulty,
+answers get easier with repetitions) or follow --script, a file of
+whitespace-separated actions: know/k, dont/d, next/n, prev/p, replayed in a
+loop. Time is simulated too, so scheduled reviews come due during the run.
+An OUTPUT that already has learners is refused unless --resume is given;
+then every learner continues from its stored progress, and the summary's
+done/known/unknown include the earlier runs (answers counts this run only).
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_migrations  # noqa: E402
+import ing_progress  # noqa: E402
+import ing_scheduler  # noqa: E402
+import ing_session  # noqa: E402
+import ing_stats  # noqa: E402
+import ing_words  # noqa: E402
+
+DEFAULT_DB = ROOT / "ing_base.db"
+ACTIONS = {"know": "know", "k": "know", "dont": "dont", "d": "dont", "next": "next", "n": "next",
+           "prev": "prev", "p": "prev"}
+THINK_MS = (1_500, 8_000)     # simulated time spent on a card
+BREAK_EVERY = 40              # simulated learners pause after this many cards...
+BREAK_MS = 30 * 60 * 1000     # ...for half an hour, so relearn steps come due
+
+_words = None
+
+
+def _init_worker(db_path: str) -> None:
+    global _words
+    _words = ing_words.WordSource(lambda: ing_migrations.connect_readonly(Path(db_path)), cache_size=4096)
+
+
+class SimClock:
+    """Milliseconds that only move when the driver says so."""
+
+    def __init__(self, start_ms: int):
+        self.now = start_ms
+
+    def __call__(self) -> int:
+        return self.now
+
+
+def _difficulty(word_id: int) -> float:
+    return (word_id * 2654435761 % 1000) / 1000 * 0.35   # stable per word, same for every learner
+
+
+def _simulate(session: ing_session.Session, clock: SimClock, rng: random.Random, steps: int) -> None:
+    ability = rng.uniform(0.55, 0.95)
+    for step in range(steps):
+        if not session.poll():
+            if session.finished:
+                break
+            clock.now = max(clock.now, session.relearn_due())   # only relearn cards are left: wait for them
+            session.poll()
+        card = session.current()
+        clock.now += rng.randint(*THINK_MS)
+        known = session.scheduler.card(card["id"])
+        reps = known.reps if known is not None else 0
+        if rng.random() < min(0.97, ability - _difficulty(card["id"]) + 0.12 * reps):
+            session.know()
+        else:
+            session.dont()
+            clock.now += rng.randint(*THINK_MS)   # reading the examples
+            session.advance()
+        if (step + 1) % BREAK_EVERY == 0:
+            clock.now += BREAK_MS
+
+
+def _replay(session: ing_session.Session, clock: SimClock, rng: random.Random, steps: int, script: list[str]) -> None:
+    for step in range(steps):
+        if session.finished:
+            break
+        if not session.poll():
+            clock.now = max(clock.now, session.relearn_due())
+            session.poll()
+        clock.now += rng.randint(*THINK_MS)
+        action = script[step % len(script)]
+        if action == "know":
+            session.know()
+        elif action == "dont":
+            session.dont()
+        elif action == "next":
+            session.advance()
+        else:
+            session.back()
+
+
+def run_learner(task: tuple) -> dict[str, Any]:
+    learner, steps, seed, script, output_dir, start_ms = task
+    folder = Path(output_dir) / "learners" / f"{learner:05d}"
+    stats_file = folder / "stats.json"
+    try:
+        stats = json.loads(stats_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        stats = {}
+    started = time.perf_counter()
+    progress = ing_progress.ProgressLog(folder / "progress.db", batch_size=256)
+    scheduler = ing_scheduler.Scheduler(folder / "progress.db")
+    try:
+        clock = SimClock(max(start_ms, stats.get("clock_ms", 0)))
+        session = ing_session.Session(_words, progress, scheduler, stats.get("current_index", 0), clock=clock)
+        before = session.known + session.unknown
+        rng = random.Random(seed * 1_000_003 + learner)
+        if script:
+            _replay(session, clock, rng, steps, script)
+        else:
+            _simulate(session, clock, rng, steps)
+        stats.update(session.export_stats(), clock_ms=clock.now)
+        ing_stats.write_json_atomic(stats_file, ing_stats.dump_stats(stats))
+        due = scheduler.due_count(clock.now)
+    finally:
+        progress.close()
+        scheduler.close()
+    return {"learner": learner, "answers": session.known + session.unknown - before, **session.summary(),
+            "cursor": session.cursor, "due": due,
+            "seconds": round(time.perf_counter() - started, 4)}
+
+
+def _read_script(path: Path) -> list[str]:
+    words = path.read_text(encoding="utf-8").split()
+    unknown = sorted({w for w in words if w.lower() not in ACTIONS})
+    if unknown or not words:
+        raise ValueError(f"bad actions in {path}: {', '.join(unknown) or 'empty script'}")
+    return [ACTIONS[w.lower()] for w in words]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run simulated or scripted trainer sessions without a display")
+    parser.add_argument("output", type=Path, help="directory for per-learner progress and summary.jsonl")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="dictionary database (read-only)")
+    parser.add_argument("--learners", type=int, default=100)
+    parser.add_argument("--first", type=int, default=0, help="id of the first learner")
+    parser.add_argument("--steps", type=int, default=200, help="cards per learner")
+    parser.add_argument("--script", type=Path, help="actions to replay instead of simulating")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--resume", action="store_true", help="continue the learners already in OUTPUT")
+    parser.add_argument("--jobs", type=int, default=multiprocessing.cpu_count(), help="worker processes")
+    args = parser.parse_args()
+    args.jobs = max(1, args.jobs)
+
+    if not args.db.exists():
+        print(f"No database at {args.db}", file=sys.stderr)
+        return 1
+    try:
+        script = _read_script(args.script) if args.script else None
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    learners_dir = args.output / "learners"
+    if not args.resume and learners_dir.is_dir() and any(learners_dir.iterdir()):
+        print(f"{learners_dir} already has learners: pass --resume to continue them, "
+              f"or choose an empty OUTPUT", file=sys.stderr)
+        return 1
+    db_path = ing_migrations.ensure_migrated(args.db, args.output / "cache")   # once, before the workers start
+    start_ms = ing_progress.now_ms()
+    tasks = [(n, args.steps, args.seed, script, str(args.output), start_ms)
+             for n in range(args.first, args.first + args.learners)]
+    started = time.perf_counter()
+    totals = {"answers": 0, "known": 0, "unknown": 0, "due": 0}
+    summary = args.output / "summary.jsonl"
+    summary.parent.mkdir(parents=True, exist_ok=True)
+    with open(summary, "w", encoding="utf-8") as out, \
+            multiprocessing.Pool(args.jobs, initializer=_init_worker, initargs=(str(db_path),)) as pool:
+        for result in pool.imap_unordered(run_learner, tasks, chunksize=max(1, len(tasks) // (args.jobs * 8))):
+            out.write(json.dumps(result) + "\n")
+            for key in totals:
+                totals[key] += result[key]
+    elapsed = time.perf_counter() - started
+    print(f"{args.learners} learners x {args.steps} steps in {elapsed:.1f} s on {args.jobs} workers "
+          f"({totals['answers'] / elapsed:.0f} answers/s): known {totals['known']}, unknown {totals['unknown']}"
+          f"{' (with earlier runs)' if args.resume else ''}, due for review {totals['due']}")
+    print(f"per-learner results: {summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
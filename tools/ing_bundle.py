@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Compact binary dictionary bundle (words + examples) for the mobile app.
+
+Layout, all integers little-endian, every section 8-byte aligned:
+
+    header        HEADER struct (magic, version, counts, section offsets)
+    str_offsets   u32[string_count + 1]  byte offsets into str_data
+    str_data      UTF-8 bytes of the interned strings, back to back
+    words         WORD struct[word_count], sorted by id
+    examples      EXAMPLE struct[example_count], sorted by (word_id, id)
+    ex_index      u32[word_count + 1]   examples of word i are
+                                        examples[ex_index[i]:ex_index[i + 1]]
+
+Strings are interned: each distinct text is stored once and referenced by
+index, NO_STRING marks a NULL. Records are fixed width, so a reader can mmap
+the file and decode a single word or example without parsing the rest.
+"""
+import argparse
+import mmap
+import sqlite3
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+MAGIC = b"INGB"
+VERSION = 1
+NO_STRING = 0xFFFFFFFF
+
+# magic, version, flags, word_count, example_count, string_count,
+# offsets of str_offsets, str_data, words, examples, ex_index, file size
+HEADER = struct.Struct("<4sHHIII6Q")
+WORD = struct.Struct("<iiIII")       # id, seq, ingush, russian, transcription
+EXAMPLE = struct.Struct("<iiII")     # id, word_id, ing, rus
+U32 = struct.Struct("<I")
+
+
+class BundleError(ValueError):
+    pass
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _u32_bytes(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array("I", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class _Strings:
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self.offsets = array("I", [0])
+        self.data = bytearray()
+
+    def intern(self, text: str | None) -> int:
+        if text is None:
+            return NO_STRING
+        sid = self._ids.get(text)
+        if sid is None:
+            sid = self._ids[text] = len(self.offsets) - 1
+            self.data += text.encode("utf-8")
+            self.offsets.append(len(self.data))
+        return sid
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+def build_bundle(rows_words: Iterator[tuple], rows_examples: Iterator[tuple]) -> bytes:
+    """rows_words: (id, seq, ingush, russian, transcription) ordered by id;
+    rows_examples: (id, word_id, ing, rus) ordered by (word_id, id)."""
+    strings = _Strings()
+    words = bytearray()
+    word_ids = array("i")
+    for wid, seq, ingush, russian, transcription in rows_words:
+        word_ids.append(wid)
+        words += WORD.pack(wid, seq or 0, strings.intern(ingush), strings.intern(russian),
+                           strings.intern(transcription))
+
+    examples = bytearray()
+    ex_index = array("I", [0])
+    count = 0
+    pending = next(rows_examples, None)
+    for wid in word_ids:
+        # Skip examples of unknown words (orphans), then take this word's run.
+        while pending is not None and pending[1] < wid:
+            pending = next(rows_examples, None)
+        while pending is not None and pending[1] == wid:
+            eid, ewid, ing, rus = pending
+            examples += EXAMPLE.pack(eid, ewid, strings.intern(ing), strings.intern(rus))
+            count += 1
+            pending = next(rows_examples, None)
+        ex_index.append(count)
+
+    sections = [_u32_bytes(strings.offsets), bytes(strings.data), bytes(words), bytes(examples),
+                _u32_bytes(ex_index)]
+    offsets = []
+    pos = _align(HEADER.size)
+    for section in sections:
+        offsets.append(pos)
+        pos = _align(pos + len(section))
+    header = HEADER.pack(MAGIC, VERSION, 0, len(word_ids), count, len(strings), *offsets, pos)
+    out = bytearray(pos)
+    out[:HEADER.size] = header
+    for offset, section in zip(offsets, sections):
+        out[offset:offset + len(section)] = section
+    return bytes(out)
+
+
+def bundle_from_db(conn: sqlite3.Connection, chunk_size: int = 1000) -> bytes:
+    def rows(sql: str) -> Iterator[tuple]:
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                return
+            yield from chunk
+
+    return build_bundle(
+        rows("SELECT id, seq, ingush, russian, transcription FROM words ORDER BY id"),
+        rows("SELECT id, word_id, ing, rus FROM examples ORDER BY word_id, id"),
+    )
+
+
+class Bundle:
+    """Lazy reader; same protocol as ing_words sources (len, [i], examples, index_of)."""
+
+    def __init__(self, buffer, close: Callable[[], None] | None = None):
+        self._buf = memoryview(buffer)
+        self._close = close
+        if len(self._buf) < HEADER.size:
+            raise BundleError("file is shorter than the header")
+        (magic, version, _flags, self.word_count, self.example_count, self.string_count,
+         self._str_offsets, self._str_data, self._words, self._examples, self._ex_index,
+         self.size) = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise BundleError(f"bad magic {magic!r}")
+        if version != VERSION:
+            raise BundleError(f"unsupported bundle version {version}")
+        if self.size != len(self._buf):
+            raise BundleError(f"size mismatch: header {self.size}, file {len(self._buf)}")
+        self._ids: array | None = None
+
+    @classmethod
+    def open(cls, path: Path) -> "Bundle":
+        handle = open(path, "rb")
+        try:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            handle.close()
+        bundle = cls.__new__(cls)
+        try:
+            cls.__init__(bundle, mapped, close=mapped.close)
+        except Exception:
+            mapped.close()
+            raise
+        return bundle
+
+    def close(self) -> None:
+        self._buf.release()
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    def __enter__(self) -> "Bundle":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    def string(self, sid: int) -> str | None:
+        if sid == NO_STRING:
+            return None
+        base = self._str_offsets + 4 * sid
+        start, = U32.unpack_from(self._buf, base)
+        end, = U32.unpack_from(self._buf, base + 4)
+        return str(self._buf[self._str_data + start:self._str_data + end], "utf-8")
+
+    def __getitem__(self, i: int) -> dict[str, Any]:
+        if i < 0:
+            i += self.word_count
+        if not 0 <= i < self.word_count:
+            raise IndexError(i)
+        wid, seq, ingush, russian, transcription = WORD.unpack_from(self._buf, self._words + WORD.size * i)
+        return {"id": wid, "seq": seq, "ingush": self.string(ingush), "russian": self.string(russian),
+                "transcription": self.string(transcription) or ""}
+
+    def example_range(self, i: int) -> tuple[int, int]:
+        start, = U32.unpack_from(self._buf, self._ex_index + 4 * i)
+        end, = U32.unpack_from(self._buf, self._ex_index + 4 * (i + 1))
+        return start, end
+
+    def examples(self, i: int) -> list[dict[str, str]]:
+        if not 0 <= i < self.word_count:
+            raise IndexError(i)
+        start, end = self.example_range(i)
+        result = []
+        for k in range(start, end):
+            _eid, _wid, ing, rus = EXAMPLE.unpack_from(self._buf, self._examples + EXAMPLE.size * k)
+            result.append({"ing": self.string(ing), "rus": self.string(rus)})
+        return result
+
+    def index_of(self, word_id: int) -> int | None:
+        if self._ids is None:
+            raw = self._buf[self._words:self._words + WORD.size * self.word_count]
+            self._ids = array("i", (row[0] for row in WORD.iter_unpack(raw)))
+        i = bisect_left(self._ids, word_id)
+        return i if i < len(self._ids) and self._ids[i] == word_id else None
+
+    def contains(self, word_id: int) -> bool:
+        return self.index_of(word_id) is not None
+
+    def validate(self) -> None:
+        """Raise BundleError on any structural problem."""
+        sections = [
+            (self._str_offsets, 4 * (self.string_count + 1)),
+            (self._str_data, None),
+            (self._words, WORD.size * self.word_count),
+            (self._examples, EXAMPLE.size * self.example_count),
+            (self._ex_index, 4 * (self.word_count + 1)),
+        ]
+        previous_end = HEADER.size
+        for offset, length in sections:
+            if offset % 8 or offset < previous_end:
+                raise BundleError(f"misplaced section at {offset}")
+            if length is not None:
+                previous_end = offset + length
+                if previous_end > self.size:
+                    raise BundleError(f"section at {offset} runs past the end of file")
+        offsets = array("I")
+        offsets.frombytes(self._buf[self._str_offsets:self._str_offsets + 4 * (self.string_count + 1)])
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        if offsets[0] != 0 or any(a > b for a, b in zip(offsets, offsets[1:])):
+            raise BundleError("string offsets are not monotonic")
+        if self._str_data + offsets[-1] > self._words:
+            raise BundleError("string data overlaps the word records")
+        for sid in range(self.string_count):
+            self.string(sid)  # raises UnicodeDecodeError on bad UTF-8
+        last_id = None
+        for i in range(self.word_count):
+            wid, _seq, *sids = WORD.unpack_from(self._buf, self._words + WORD.size * i)
+            if last_id is not None and wid <= last_id:
+                raise BundleError(f"word ids not strictly increasing at {i}")
+            last_id = wid
+            self._check_sids(sids, f"word {wid}")
+            start, end = self.example_range(i)
+            if start > end or end > self.example_count:
+                raise BundleError(f"bad example range for word {wid}")
+            for k in range(start, end):
+                _eid, ewid, *esids = EXAMPLE.unpack_from(self._buf, self._examples + EXAMPLE.size * k)
+                if ewid != wid:
+                    raise BundleError(f"example {k} belongs to word {ewid}, indexed under {wid}")
+                self._check_sids(esids, f"example {k}")
+        if self.word_count and self.example_range(self.word_count - 1)[1] != self.example_count:
+            raise BundleError("example index does not cover every example")
+
+    def _check_sids(self, sids, where: str) -> None:
+        for sid in sids:
+            if sid != NO_STRING and sid >= self.string_count:
+                raise BundleError(f"{where}: string id {sid} out of range")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Validate and inspect an ing_bundle.bin file")
+    parser.add_argument("bundle", type=Path)
+    parser.add_argument("--show", type=int, nargs="*", default=[], help="print words at these indexes")
+    args = parser.parse_args()
+    try:
+        with Bundle.open(args.bundle) as bundle:
+            bundle.validate()
+            print(f"ok: v{VERSION}, {bundle.word_count} words, {bundle.example_count} examples, "
+                  f"{bundle.string_count} strings, {bundle.size} bytes")
+            for i in args.show:
+                print(bundle[i], bundle.examples(i))
+    except (BundleError, UnicodeDecodeError, struct.error) as e:
+        print(f"invalid bundle: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Move progress between devices with delta change logs (see ing_sync).
+
+    python tools/ing_sync.py export DATA_DIR changes.json --peer PEER
+    python tools/ing_sync.py import DATA_DIR changes.json
+    python tools/ing_sync.py status DATA_DIR
+
+DATA_DIR is the app's data folder (progress.db and stats.json). The app must
+be closed. With --peer, export writes only what PEER has not seen according
+to the last change log imported from it; without it, the whole history.
+Importing the same file twice, or files in any order, is harmless.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ing_sync  # noqa: E402
+
+PROGRESS_NAME = "progress.db"
+STATS_NAME = "stats.json"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export or apply progress change logs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="write the changes a peer is missing")
+    export.add_argument("data_dir", type=Path)
+    export.add_argument("output", type=Path)
+    export.add_argument("--peer", help="replica id of the receiving device")
+    apply = sub.add_parser("import", help="apply a change log from another device")
+    apply.add_argument("data_dir", type=Path)
+    apply.add_argument("input", type=Path)
+    status = sub.add_parser("status", help="print this replica's id and clock")
+    status.add_argument("data_dir", type=Path)
+    args = parser.parse_args()
+
+    db_path, stats_path = args.data_dir / PROGRESS_NAME, args.data_dir / STATS_NAME
+    stats = stats_path if stats_path.exists() else None
+    if args.command == "export":
+        changes = ing_sync.export_file(db_path, args.output, stats, args.peer)
+        reviews = sum(len(rows) for rows in changes["reviews"].values())
+        print(f"{reviews} reviews, {len(changes['settings'])} settings from replica {changes['replica']} "
+              f"-> {args.output} ({args.output.stat().st_size} bytes)")
+    elif args.command == "import":
+        try:
+            result = ing_sync.import_file(db_path, args.input, stats)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Cannot apply {args.input}: {e}", file=sys.stderr)
+            return 1
+        print(f"applied {result['reviews']} new reviews, {result['settings']} settings, "
+              f"rebuilt {result['cards']} cards")
+    else:
+        conn = ing_sync.connect(db_path)
+        try:
+            print(json.dumps({"replica": ing_sync.replica_id(conn), "clock": ing_sync.clock(conn)}, indent=2))
+        finally:
+            conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())